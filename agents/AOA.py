@@ -1,9 +1,9 @@
 """ Admits patients and orients them to the right service or time slot. """
 
-from mesa import Agent
-import random
+from .safe_ops import SafeOps
+from .state import StatefulAgent
 
-class AdmissionOrientationAgent(Agent):
+class AdmissionOrientationAgent(StatefulAgent):
     def __init__(self, unique_id, model):
         super().__init__(unique_id, model)
         self.agent_type = "AdmissionOrientationAgent"
@@ -21,8 +21,12 @@ class AdmissionOrientationAgent(Agent):
 
     def step(self):
         # Find the waiting patients who have not yet been referred.
-        patients = [a for a in self.model.schedule.agents
-                    if 'patient' in type(a).__name__ and getattr(a, 'etat', '') == 'En waiting']
+        index = getattr(self.model, 'agent_index', None)
+        if index is not None:
+            patients = index.patients_in('En waiting')
+        else:
+            patients = [a for a in self.model.schedule.agents
+                        if 'patient' in type(a).__name__ and getattr(a, 'etat', '') == 'En waiting']
 
         for patient in patients:
             self.orienter_patient(patient)
@@ -36,9 +40,9 @@ class AdmissionOrientationAgent(Agent):
         # Selection of the available service (load < 0.8)
         service_disponible = [s for s, c in self.services.items() if c < 0.8]
         if not service_disponible:
-            service = random.choice(list(self.services.keys()))
+            service = self.random.choice(list(self.services.keys()))
         else:
-            service = random.choice(service_disponible)
+            service = self.random.choice(service_disponible)
 
         # Patient update
         patient.service_attribue = service
@@ -49,8 +53,10 @@ class AdmissionOrientationAgent(Agent):
             patient.temps_attente = 0
 
         # Service load update
-        self.services[service] += random.uniform(0.05, 0.15)
+        self.services[service] += self.random.uniform(0.05, 0.15)
         self.services[service] = min(self.services[service], 1.0)
 
-        print(f"AdmissionOrientationAgent → patient {patient.patient_id} orienté vers {service} (Charge {self.services[service]:.2f})")
+        SafeOps.emit(self, "patient_oriented",
+                     "AdmissionOrientationAgent → patient {patient_id} orienté vers {service} (Charge {charge:.2f})",
+                     patient_id=patient.patient_id, service=service, charge=self.services[service])
 
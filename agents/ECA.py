@@ -1,9 +1,11 @@
 """ Handles communication with external partners and institutions. """
 
-from mesa import Agent
-import random
+from .safe_ops import SafeOps
+from .state import StatefulAgent
+
+class ExternalCommunicationAgent(StatefulAgent):
+    wake_every = 6  # exchanges with partners every 6 ticks
 
-class ExternalCommunicationAgent(Agent):
     def __init__(self, unique_id, model):
         super().__init__(unique_id, model)
         self.agent_type = "ExternalCommunicationAgent"
@@ -19,20 +21,20 @@ class ExternalCommunicationAgent(Agent):
             self.envoyer_requete_externe()
 
         # Status Update
-        self.charge = min(1.0, self.charge + random.uniform(0.01, 0.05))
+        self.charge = min(1.0, self.charge + self.random.uniform(0.01, 0.05))
         self.etat = "Actif" if self.charge < 0.85 else "Occupé"
         self.has_event_this_step = True
 
     def envoyer_requete_externe(self):
-        partenaire = random.choice(self.partenaires)
-        type_requete = random.choice([
+        partenaire = self.random.choice(self.partenaires)
+        type_requete = self.random.choice([
             "Validation de prise en charge",
             "Transmission de rapport",
             "Demande de remboursement",
             "Signalement d’anomalie",
             "Mise à jour des droits"
         ])
-        delai = random.randint(1, 3)  # Simulated response time
+        delai = self.random.randint(1, 3)  # Simulated response time
 
         self.historique_requetes.append({
             "step": self.model.schedule.time,
@@ -41,5 +43,7 @@ class ExternalCommunicationAgent(Agent):
             "delai": delai
         })
 
-        print(f"ExternalCommunicationAgent → request to {partenaire} : '{type_requete}' (expected response by {delai} steps)")
+        SafeOps.emit(self, "external_request",
+                     "ExternalCommunicationAgent → request to {partenaire} : '{type_requete}' (expected response by {delai} steps)",
+                     partenaire=partenaire, type_requete=type_requete, delai=delai)
 
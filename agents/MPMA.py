@@ -3,59 +3,26 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 from typing import Any, Dict, Optional
-from mesa import Agent
-import random
+import numpy as np
 
-class _SafeOps:
-    @staticmethod
-    def pop_queue(q: Any):
-        try:
-            return q.pop(0) if q else None
-        except Exception:
-            return None
+from .safe_ops import SafeOps
+from .state import StatefulAgent
 
-    @staticmethod
-    def push_queue(q: Any, item: Any):
-        try:
-            q.append(item)
-        except Exception:
-            pass
 
-    @staticmethod
-    def dec_slot(model: Any, name: str, amount: int = 1) -> bool:
-        v = max(0, int(getattr(model, name, 0)))
-        if v >= amount:
-            setattr(model, name, v - amount)
-            return True
-        return False
-
-    @staticmethod
-    def inc_slot(model: Any, name: str, amount: int = 1):
-        v = max(0, int(getattr(model, name, 0)))
-        setattr(model, name, v + amount)
-
-    @staticmethod
-    def has(model: Any, name: str) -> bool:
-        return hasattr(model, name)
-
-    @staticmethod
-    def log(agent: Agent, msg: str):
-        logger = getattr(agent, "logger", None)
-        if callable(logger):
-            try:
-                logger(f"[{agent.unique_id}:{agent.__class__.__name__}] {msg}")
-            except Exception:
-                pass
-
-
-class MedicationProductManagementAgent(Agent):
+class MedicationProductManagementAgent(StatefulAgent):
     """Dispensing medications and maintaining product inventory.
 
     Expected (optional) model attributes:
       - pending_prescriptions: list of dicts
-      - med_inventory: dict {drug: stock}
+      - med_inventory: MedicationInventory (or a dict {drug: stock}, converted on first use)
       - events: list (optional) for shortage logs
+
+    All prescriptions pending at a step are dispensed as one batch, first come
+    first served within each drug; the refused ones are reported in a single
+    "shortage" event holding arrays (drug, need, have).
     """
+    wake_on = ("pending_prescriptions",)
+
     def __init__(self, unique_id, model, config: Optional[Dict[str, Any]] = None, logger=None):
         super().__init__(unique_id, model)
         self.config = config or {}
@@ -63,18 +30,25 @@ class MedicationProductManagementAgent(Agent):
 
     def step(self):
         m = self.model
-        if not (_SafeOps.has(m, "pending_prescriptions") and _SafeOps.has(m, "med_inventory")):
+        if not (SafeOps.has(m, "pending_prescriptions") and SafeOps.has(m, "med_inventory")):
             return
-        todo = list(getattr(m, "pending_prescriptions", []))
+        now = getattr(getattr(m, "schedule", None), "time", 0)
+        inv = SafeOps.inventory(m, "med_inventory")
+        inv.restock(now)
+        todo = getattr(m, "pending_prescriptions", [])
         m.pending_prescriptions = []
-        for rx in todo:
-            drug = rx.get("drug", "UNKNOWN")
-            qty = int(rx.get("qty", 1))
-            inv = m.med_inventory.get(drug, 0)
-            if inv >= qty:
-                m.med_inventory[drug] = inv - qty
-                _SafeOps.log(self, f"Dispensed {qty}x {drug}")
-            else:
-                if _SafeOps.has(m, "events"):
-                    m.events.append({"type":"shortage","drug":drug,"need":qty,"have":inv})
-                    _SafeOps.log(self, f"Shortage for {drug}: need {qty}, have {inv}")
+        if not todo:
+            return
+        batch = inv.dispense_prescriptions(todo)
+        served = batch["served"]
+        n_served = int(served.sum())
+        if n_served:
+            SafeOps.log(self, "Dispensed {units} units for {count} prescriptions",
+                        units=int(batch["qty"][served].sum()), count=n_served)
+        if n_served < len(served) and SafeOps.has(m, "events"):
+            short = ~served
+            drugs = np.asarray(inv.drugs, dtype=object)[batch["drug"][short]]
+            m.events.append({"type": "shortage", "step": now, "drug": drugs,
+                             "need": batch["qty"][short], "have": batch["have"][short]})
+            SafeOps.log(self, "Shortage for {count} prescriptions ({drugs})",
+                        count=len(drugs), drugs=", ".join(sorted(set(drugs))))
@@ -1,23 +1,45 @@
 """ Maintains electronic medical records and updates them safely. """
 
-from mesa import Agent
-import random
+from .records import RecordStore
+from .safe_ops import SafeOps
+from .state import StatefulAgent
 
-class MedicalRecordAgent(Agent):
+class MedicalRecordAgent(StatefulAgent):
+    """Records the care of patients in the model's shared `medical_records` store.
+
+    Each entry (step, patient_id, action, agent_id) serves both as the
+    patient's medical file (`records.dossier(patient_id)`) and as this agent's
+    audit trail (`journal_audit`).
+    """
     def __init__(self, unique_id, model):
         super().__init__(unique_id, model)
         self.agent_type = "MedicalRecordAgent"
         self.has_event_this_step = False
         self.charge = 0
         self.etat = "Actif"
-        self.journal_audit = []
+
+    @property
+    def records(self) -> RecordStore:
+        store = getattr(self.model, "medical_records", None)
+        if store is None:
+            store = self.model.medical_records = RecordStore()
+        return store
+
+    @property
+    def journal_audit(self):
+        """Internal audit journal: the entries written by this agent (built on demand)."""
+        return self.records.audit(self.unique_id)
 
     def step(self):
         # Find patients who have recently been taken care of or treated
-        patients_a_mettre_a_jour = [
-            a for a in self.model.schedule.agents
-            if 'patient' in type(a).__name__.lower() and getattr(a, 'etat', '') in ["Pris en charge", "Traité"]
-        ]
+        index = getattr(self.model, 'agent_index', None)
+        if index is not None:
+            patients_a_mettre_a_jour = index.patients_in("Pris en charge", "Traité")
+        else:
+            patients_a_mettre_a_jour = [
+                a for a in self.model.schedule.agents
+                if 'patient' in type(a).__name__.lower() and getattr(a, 'etat', '') in ["Pris en charge", "Traité"]
+            ]
 
         for patient in patients_a_mettre_a_jour:
             self.mettre_a_jour_dossier(patient)
@@ -28,28 +50,17 @@ class MedicalRecordAgent(Agent):
         self.has_event_this_step = True
 
     def mettre_a_jour_dossier(self, patient):
-        # Adding a simulated attribute 'medical_file'
-        if not hasattr(patient, "dossier_medical"):
-            patient.dossier_medical = []
-
-        entree = {
-            "step": self.model.schedule.time,
-            "donnee": random.choice([
-                "Consultation terminée",
-                "outcome(s) labo ajouté",
-                "Traitement prescrit",
-                "Observation clinique ajoutée"
-            ]),
-            "confidentiel": True
-        }
-
-        patient.dossier_medical.append(entree)
-
-        # Internal Audit Journal
-        self.journal_audit.append({
-            "patient_id": getattr(patient, 'patient_id', 'N/A'),
-            "action": entree["donnee"],
-            "step": self.model.schedule.time
-        })
-
-        print(f"MedicalRecordAgent → Patient file {getattr(patient, 'patient_id', 'N/A')} updated : {entree['donnee']}")
+        donnee = self.random.choice([
+            "Consultation terminée",
+            "outcome(s) labo ajouté",
+            "Traitement prescrit",
+            "Observation clinique ajoutée"
+        ])
+        patient_id = getattr(patient, 'patient_id', 'N/A')
+
+        # One entry for the medical file and the audit journal
+        self.records.append(self.model.schedule.time, patient_id, donnee, self.unique_id,
+                            getattr(patient, 'generation', 0))
+
+        SafeOps.emit(self, "record_updated", "MedicalRecordAgent → Patient file {patient_id} updated : {donnee}",
+                     patient_id=patient_id, donnee=donnee)
@@ -3,87 +3,75 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 from typing import Any, Dict, Optional
-from mesa import Agent
 import random
 
-class _SafeOps:
-    @staticmethod
-    def pop_queue(q: Any):
-        try:
-            return q.pop(0) if q else None
-        except Exception:
-            return None
+from .safe_ops import SafeOps
+from .state import StatefulAgent
 
-    @staticmethod
-    def push_queue(q: Any, item: Any):
-        try:
-            q.append(item)
-        except Exception:
-            pass
 
-    @staticmethod
-    def dec_slot(model: Any, name: str, amount: int = 1) -> bool:
-        v = max(0, int(getattr(model, name, 0)))
-        if v >= amount:
-            setattr(model, name, v - amount)
-            return True
-        return False
-
-    @staticmethod
-    def inc_slot(model: Any, name: str, amount: int = 1):
-        v = max(0, int(getattr(model, name, 0)))
-        setattr(model, name, v + amount)
-
-    @staticmethod
-    def has(model: Any, name: str) -> bool:
-        return hasattr(model, name)
-
-    @staticmethod
-    def log(agent: Agent, msg: str):
-        logger = getattr(agent, "logger", None)
-        if callable(logger):
-            try:
-                logger(f"[{agent.unique_id}:{agent.__class__.__name__}] {msg}")
-            except Exception:
-                pass
-
-
-class PrescriptionConsultationAgent(Agent):
+class PrescriptionConsultationAgent(StatefulAgent):
     """Consultations, diagnosis, and prescription issuing.
 
     Expected (optional) model attributes:
-      - consultation_queue: list of patients
-      - post_consultation_queue: list of patients
-      - doctors_available: int
+      - consultation_queue: list/FifoQueue of patients
+      - post_consultation_queue: list/FifoQueue of patients
+      - doctors_available: ResourcePool (or int capacity, converted on first use)
       - pending_prescriptions: list of dicts
+
+    Each tick, every free doctor starts a consultation with the next waiting
+    patient. A consultation keeps a doctor busy for 1-3 ticks; the patient
+    moves on to the post-consultation queue when it ends.
     """
+    wake_on = ("consultation_queue",)
+
     def __init__(self, unique_id, model, config: Optional[Dict[str, Any]] = None, logger=None):
         super().__init__(unique_id, model)
         self.config = config or {}
         self.logger = logger
-        self.rand = random.Random(self.config.get("seed", 0))
+        # An explicit config seed pins this agent's draws; otherwise `rand` is its model-derived stream
+        self._seeded_rand = random.Random(self.config["seed"]) if "seed" in self.config else None
+
+    @property
+    def rand(self):
+        # Read at draw time so that a model reseed reaches this agent too
+        return self._seeded_rand or self.random
 
     def step(self):
         m = self.model
-        if not _SafeOps.has(m, "consultation_queue"):
-            return
-        if getattr(m, "doctors_available", 0) <= 0:
-            return
-        patient = _SafeOps.pop_queue(m.consultation_queue)
-        if not patient:
+        doctors = SafeOps.pool(m, "doctors_available")
+        if doctors is None:
             return
-        if not _SafeOps.dec_slot(m, "doctors_available", 1):
-            _SafeOps.push_queue(m.consultation_queue, patient)
+        self._discharge(doctors.finished())
+        if not SafeOps.has(m, "consultation_queue"):
             return
-        _SafeOps.log(self, "Consulting patient")
-        service_ticks = 1 + (hash((self.unique_id, getattr(patient, 'pid', id(patient)))) % 3)
-        if _SafeOps.has(m, "pending_prescriptions"):
+        queue = SafeOps.queue(m, "consultation_queue")
+        # Every free doctor takes a waiting patient this tick
+        while queue and doctors.can_serve():
+            patient = SafeOps.pop_queue(queue)
+            if not patient:
+                break
+            self._consult(patient, doctors)
+        # Come back when the next consultation ends, even if the queue is empty by then
+        wake_at = getattr(getattr(m, "schedule", None), "wake_at", None)
+        next_free = doctors.next_free()
+        if next_free is not None and wake_at is not None:
+            wake_at(self, next_free)
+
+    def _consult(self, patient, doctors):
+        m = self.model
+        SafeOps.log(self, "Consulting patient")
+        service_ticks = 1 + self.rand.randrange(3)
+        doctors.acquire(service_ticks, holder=patient)
+        if SafeOps.has(m, "pending_prescriptions"):
             rx = {
-                "patient_id": getattr(patient, "pid", id(patient)),
+                "patient_id": getattr(patient, "pid", getattr(patient, "patient_id", None)),
                 "drug": "RX-A" if (service_ticks % 2 == 0) else "RX-B",
                 "qty": 1 + (service_ticks % 2),
             }
             m.pending_prescriptions.append(rx)
-        _SafeOps.inc_slot(m, "doctors_available", 1)
-        if _SafeOps.has(m, "post_consultation_queue"):
-            _SafeOps.push_queue(m.post_consultation_queue, patient)
+
+    def _discharge(self, patients):
+        if patients and SafeOps.has(self.model, "post_consultation_queue"):
+            post = SafeOps.queue(self.model, "post_consultation_queue")
+            for patient in patients:
+                SafeOps.push_queue(post, patient)
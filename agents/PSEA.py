@@ -2,24 +2,40 @@
 
 # -*- coding: utf-8 -*-
 from __future__ import annotations
-from typing import Any, Dict, Optional
-from mesa import Agent
+from typing import Any, Dict, List, Optional
+import numpy as np
 from skfuzzy import control as ctrl
 
 # Use the shared fuzzy system defined in the project
-from fuzzy_logic.fuzzy_system import build_system, VAR_LABELS
+from fuzzy_logic.fuzzy_system import get_system, get_compiled_system, VAR_LABELS, INPUT_LABELS, DEFAULT_INPUT
+from fuzzy_logic.surrogate import load_or_build_surrogate
 
-class PatientSatisfactionEvaluationAgent(Agent):
+from .safe_ops import SafeOps
+from .state import StatefulAgent
+
+class PatientSatisfactionEvaluationAgent(StatefulAgent):
     """Evaluates patient satisfaction using the fuzzy system defined in `fuzzy_logic/`.
 
     Expected model attributes (optional, flexible):
-      - psea_inputs: list of dicts with keys mapped to the fuzzy inputs
+      - psea_inputs: FifoQueue (or list, converted on first use) of dicts with keys mapped to the fuzzy inputs
            Keys can be exactly the VAR_LABELS values (e.g. 'Communication and Information')
            or short aliases: {'ci','ra','sc','ei','po','cb','pi','rr'}.
            Values can be in [0,10] or [0,1] (auto-rescaled to [0,10]).
            Optional 'patient_id' is propagated to outputs.
       - psea_outputs: list where results are appended as dicts
+
+    Config (optional):
+      - batch_size: payloads consumed per step (default 1); K > 1 drains up to K,
+        0 or None drains the whole queue, scored in one vectorized call
+      - surrogate: True to score with the interpolated lookup table
+        (`fuzzy_logic.surrogate`) instead of the exact fuzzy system
+      - surrogate_points: grid points per input for the table (default 5)
+      - surrogate_path: .npy file the table is memory-mapped from / saved to
+      - surrogate_max_error: largest tolerated table error on the 0-10 scale;
+        a coarser table is refused (without it, a coarse table only warns)
     """
+    wake_on = ("psea_inputs",)
+
     def __init__(self, unique_id, model, config: Optional[Dict[str, Any]] = None, logger=None):
         super().__init__(unique_id, model)
         self.config = dict(output_scale=10, grid='base')
@@ -27,9 +43,9 @@ class PatientSatisfactionEvaluationAgent(Agent):
             self.config.update(config)
         self.logger = logger
 
-        # Build fuzzy system once; reuse the simulator
-        self._system, self._vars_map, self._U = build_system(step=self.config.get('grid', 'base'))
-        self._sim = ctrl.ControlSystemSimulation(self._system)
+        self._attach_system()
+
+        self._columns = {label: j for j, label in enumerate(INPUT_LABELS)}
 
         # Input key normalization map (aliases -> canonical VAR_LABELS)
         self._keymap = {
@@ -43,13 +59,35 @@ class PatientSatisfactionEvaluationAgent(Agent):
             'rr': VAR_LABELS['rr'],
         }
 
-    def _log(self, msg: str):
-        log = getattr(self, "logger", None)
-        if callable(log):
-            try:
-                log(f"[{self.unique_id}:PSEA] {msg}")
-            except Exception:
-                pass
+    def _attach_system(self):
+        # Shared fuzzy system (built once per process); per-agent simulator
+        self._system, self._vars_map, self._U = get_system(step=self.config.get('grid', 'base'))
+        # cache=False: the shared system keeps no per-simulation state between payloads
+        self._sim = ctrl.ControlSystemSimulation(self._system, cache=False)
+        self._surrogate = None
+        if self.config.get('surrogate'):
+            self._surrogate = load_or_build_surrogate(
+                path=self.config.get('surrogate_path'),
+                points=int(self.config.get('surrogate_points', 5)),
+                step=self.config.get('grid', 'base'),
+                max_error=self.config.get('surrogate_max_error'),
+            )
+
+    def __getstate__(self):
+        # The fuzzy system is rebuilt from the process cache on unpickling (checkpoints)
+        state, slots = super().__getstate__()
+        state = {k: v for k, v in state.items() if k not in ('_system', '_vars_map', '_U', '_sim', '_surrogate')}
+        return state, slots
+
+    def __setstate__(self, state):
+        state, slots = state
+        self.__dict__.update(state)
+        for name, value in slots.items():
+            setattr(self, name, value)
+        self._attach_system()
+
+    def _log(self, msg: str, **fields):
+        SafeOps.log(self, msg, **fields)
 
     def _normalize_inputs(self, inp: Dict[str, Any]) -> Dict[str, float]:
         """Return a dict with canonical keys (VAR_LABELS values) and values on [0,10]."""
@@ -73,19 +111,52 @@ class PatientSatisfactionEvaluationAgent(Agent):
         if not hasattr(self.model, "psea_outputs"):
             setattr(self.model, "psea_outputs", [])
 
+    def _to_array(self, payloads: List[Dict[str, Any]]) -> np.ndarray:
+        """Normalize payloads into an (N, 8) array in INPUT_LABELS order; gaps stay at mid-scale."""
+        X = np.full((len(payloads), len(INPUT_LABELS)), DEFAULT_INPUT)
+        for i, payload in enumerate(payloads):
+            for key, val in self._normalize_inputs(payload).items():
+                j = self._columns.get(key)
+                if j is not None:
+                    X[i, j] = val
+        return X
+
+    def _score_batch(self, X: np.ndarray) -> np.ndarray:
+        if self._surrogate is not None:
+            return self._surrogate.evaluate(X)
+        return get_compiled_system(step=self.config.get('grid', 'base')).evaluate(X)
+
     def step(self):
-        # Consume at most one input per step (conservative)
-        inputs_queue = getattr(self.model, "psea_inputs", [])
+        inputs_queue = SafeOps.queue(self.model, "psea_inputs")
         if not inputs_queue:
             return
-        payload = inputs_queue.pop(0)
+        limit = self.config.get('batch_size', 1)
+        if limit == 1 and self._surrogate is None:
+            self._step_single(inputs_queue.popleft())
+            return
+
+        # Throughput mode: drain up to `limit` payloads and score them together
+        n = len(inputs_queue) if not limit else min(int(limit), len(inputs_queue))
+        payloads = [inputs_queue.popleft() for _ in range(n)]
+        scores = self._score_batch(self._to_array(payloads))
+        scale = int(self.config.get('output_scale', 10))
+        if scale == 1:
+            scores = scores / 10.0
+
+        self._ensure_outputs()
+        self.model.psea_outputs.extend(
+            {"patient_id": payload.get("patient_id", None), "score": float(score), "scale": scale}
+            for payload, score in zip(payloads, scores)
+        )
 
+    def _step_single(self, payload: Dict[str, Any]):
+        # Conservative mode: one payload per step through the skfuzzy simulator
         patient_id = payload.get("patient_id", None)
         inputs_0_10 = self._normalize_inputs(payload)
 
-        # Feed the fuzzy simulator
-        for key, val in inputs_0_10.items():
-            self._sim.input[key] = val
+        # Feed the fuzzy simulator; inputs this payload omits sit at mid-scale, as in batch mode
+        for label in INPUT_LABELS:
+            self._sim.input[label] = inputs_0_10.get(label, DEFAULT_INPUT)
         self._sim.compute()
 
         score_0_10 = self._sim.output[VAR_LABELS['os']]
@@ -100,4 +171,4 @@ class PatientSatisfactionEvaluationAgent(Agent):
             "patient_id": patient_id,
             "score": score,
             "scale": int(self.config.get('output_scale', 10))
-        })
\ No newline at end of file
+        })
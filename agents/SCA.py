@@ -3,61 +3,28 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 from typing import Any, Dict, Optional
-from mesa import Agent
 import random
 
-class _SafeOps:
-    @staticmethod
-    def pop_queue(q: Any):
-        try:
-            return q.pop(0) if q else None
-        except Exception:
-            return None
+from .queues import PriorityQueue
+from .safe_ops import SafeOps
+from .state import StatefulAgent
 
-    @staticmethod
-    def push_queue(q: Any, item: Any):
-        try:
-            q.append(item)
-        except Exception:
-            pass
 
-    @staticmethod
-    def dec_slot(model: Any, name: str, amount: int = 1) -> bool:
-        v = max(0, int(getattr(model, name, 0)))
-        if v >= amount:
-            setattr(model, name, v - amount)
-            return True
-        return False
-
-    @staticmethod
-    def inc_slot(model: Any, name: str, amount: int = 1):
-        v = max(0, int(getattr(model, name, 0)))
-        setattr(model, name, v + amount)
-
-    @staticmethod
-    def has(model: Any, name: str) -> bool:
-        return hasattr(model, name)
-
-    @staticmethod
-    def log(agent: Agent, msg: str):
-        """Log message safely if agent has a logger."""
-        logger = getattr(agent, "logger", None)
-        if callable(logger):
-            try:
-                logger(f"[{agent.unique_id}:{agent.__class__.__name__}] {msg}")
-            except Exception:
-                pass
-
-
-class ServiceCoordinationAgent(Agent):
+class ServiceCoordinationAgent(StatefulAgent):
     """Routes patients between services and arbitrates resource use.
 
     Expected (optional) model attributes:
-      - triage_queue: list of patients
-      - consultation_queue: list of patients
-      - inpatient_queue: list of patients
-      - beds_available: int
+      - triage_queue: list/queue of patients; a list becomes a PriorityQueue, so
+        emergencies are routed before urgent cases and consultations
+      - consultation_queue: list/FifoQueue of patients
+      - inpatient_queue: list/FifoQueue of patients
+      - beds_available: ResourcePool (or int capacity, converted on first use)
+
+    Config (optional):
+      - stay_ticks: ticks an emergency patient occupies a bed (default 5)
     """
+    wake_on = ("triage_queue",)
+
     def __init__(self, unique_id, model, config: Optional[Dict[str, Any]] = None, logger=None):
         super().__init__(unique_id, model)
         self.config = config or {}
@@ -65,15 +32,15 @@ class ServiceCoordinationAgent(Agent):
 
     def step(self):
         m = self.model
-        triage_q = getattr(m, "triage_queue", None)
+        triage_q = SafeOps.queue(m, "triage_queue", PriorityQueue)
         if not triage_q:
             return
-        patient = _SafeOps.pop_queue(triage_q)
+        patient = SafeOps.pop_queue(triage_q)
         if not patient:
             return
         acuity = getattr(patient, "acuity", "consultation")
-        if acuity == "emergency" and getattr(m, "beds_available", 0) > 0:
-            _SafeOps.dec_slot(m, "beds_available", 1)
-            _SafeOps.push_queue(getattr(m, "inpatient_queue", []), patient)
+        beds = SafeOps.pool(m, "beds_available")
+        if acuity == "emergency" and beds is not None and beds.acquire(self.config.get("stay_ticks", 5)):
+            SafeOps.push_queue(SafeOps.queue(m, "inpatient_queue"), patient)
         else:
-            _SafeOps.push_queue(getattr(m, "consultation_queue", []), patient)
+            SafeOps.push_queue(SafeOps.queue(m, "consultation_queue"), patient)
@@ -1,13 +1,15 @@
 """ Handles the patient-facing interface: collects inputs and passes them to the system. """
 
-from mesa import Agent
-import random
+from .safe_ops import SafeOps
+from .state import StatefulAgent
 
 # Import correction: make sure the path is correct
 from agents.Patient import patient
 
 
-class UserInterfaceAgent(Agent):
+class UserInterfaceAgent(StatefulAgent):
+    wake_every = "arrival_interval"  # registers patients every `model.arrival_interval` ticks
+
     def __init__(self, unique_id, model):
         super().__init__(unique_id, model)
         self.agent_type = "UserInterfaceAgent"
@@ -17,31 +19,46 @@ class UserInterfaceAgent(Agent):
 
     def step(self):
         # simulation of registering new patients at regular intervals
-        if self.model.schedule.time % 5 == 0:
+        if self.model.schedule.time % getattr(self.model, 'arrival_interval', 5) == 0:
             self.enregistrer_patient()
 
         # Possible update of its status
-        self.charge = min(1.0, self.charge + random.uniform(0, 0.1))
+        self.charge = min(1.0, self.charge + self.random.uniform(0, 0.1))
         self.etat = "Actif" if self.charge < 0.8 else "Surchargé"
         self.has_event_this_step = True
 
     def enregistrer_patient(self):
-        # Correction: use 'agents' in the plural
-        existing_patients = [a for a in self.model.schedule.agents if isinstance(a, patient)]
-        patient_id = len(existing_patients) + 1000
-        categorie = random.choice(['Urgence', 'Consultation', 'Suivi', 'Hospitalisation'])
+        # Next free id (discharged patients' ids are reused, with a new random stream)
+        ids = getattr(self.model, 'patient_ids', None)
+        index = getattr(self.model, 'agent_index', None)
+        if ids is not None:
+            patient_id, generation = ids.allocate()
+        elif index is not None:
+            patient_id, generation = index.count_type(patient.__name__) + 1000, 0
+        else:
+            existing = sum(1 for a in self.model.schedule.agents if isinstance(a, patient))
+            patient_id, generation = existing + 1000, 0
+        categorie = self.random.choice(['Urgence', 'Consultation', 'Suivi', 'Hospitalisation'])
 
         # Create the patient agent
         nouveau_patient = patient(patient_id, self.model)
+        if generation:
+            nouveau_patient.generation = generation
         nouveau_patient.categorie_patient = categorie
         nouveau_patient.patient_id = patient_id
         nouveau_patient.etat = "en_attente"
         nouveau_patient.has_event_this_step = True
 
-        # Add to the grid and the planner
-        self.model.schedule.add(nouveau_patient)
-        x, y = self.random.randrange(self.model.grid.width), self.random.randrange(self.model.grid.height)
-        self.model.grid.place_agent(nouveau_patient, (x, y))
+        # Add to the grid, the planner and the model index
+        add_agent = getattr(self.model, 'add_agent', None)
+        if add_agent is not None:
+            add_agent(nouveau_patient)
+        else:
+            self.model.schedule.add(nouveau_patient)
+            grid = getattr(self.model, 'grid', None)
+            if grid is not None:
+                grid.place_agent(nouveau_patient, (self.random.randrange(grid.width), self.random.randrange(grid.height)))
 
         # Recording of the event
-        print(f"UserInterfaceAgent → New patient created: ID={patient_id}, Category={categorie}")
+        SafeOps.emit(self, "patient_registered", "UserInterfaceAgent → New patient created: ID={patient_id}, Category={categorie}",
+                     patient_id=patient_id, categorie=categorie)
@@ -11,3 +11,4 @@ from .MIA import MedicalIntelligenceAgent
 from .ECA import ExternalCommunicationAgent
 from .PLA import PlanningAgent
 from .Patient import patient
+from .queues import FifoQueue, PriorityQueue, queue_stats
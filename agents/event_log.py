@@ -0,0 +1,85 @@
+""" Model-level logging policy for agent events: print, off, sampled or structured. """
+
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+import json
+import os
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+
+MODES = ("print", "off", "sampled", "structured")
+
+
+class EventLog:
+    """Destination of agent events, attached to the model as `event_log`.
+
+    Events arrive as a message template plus fields; the template is only
+    formatted when a line is actually printed, so 'off' and 'structured'
+    runs do no per-event string formatting.
+
+      - print: format and print every event (the historical behaviour)
+      - off: drop everything
+      - sampled: print one event out of `sample_every`
+      - structured: buffer events as records and append them to `path` as
+        JSON lines every `buffer_size` events (without a path, only the last
+        `buffer_size` records are kept in memory)
+
+    An EventLog is also a valid `logger` callable for the agents that take one.
+    """
+    def __init__(self, mode: str = "print", path: Optional[str] = None, sample_every: int = 100,
+                 buffer_size: int = 10_000, clock: Optional[Callable[[], Any]] = None):
+        if mode not in MODES:
+            raise ValueError(f"Unknown log mode {mode!r}, expected one of {MODES}")
+        self.mode = mode
+        self.enabled = mode != "off"
+        self.path = path
+        self.sample_every = max(1, int(sample_every))
+        self.buffer_size = buffer_size
+        self.clock = clock
+        self.buffer: Any = [] if path else deque(maxlen=max(1, int(buffer_size)))
+        self.seen = 0
+        self.written = 0
+        if path:
+            parent_dir = os.path.dirname(path)
+            if parent_dir:
+                os.makedirs(parent_dir, exist_ok=True)
+            open(path, "w", encoding="utf-8").close()
+
+    def emit(self, agent: Any, event: str, template: str, fields: Dict[str, Any]):
+        if not self.enabled:
+            return
+        self.seen += 1
+        if self.mode == "structured":
+            record = {
+                "step": self.clock() if self.clock else None,
+                "agent_id": getattr(agent, "unique_id", None),
+                "agent_class": type(agent).__name__ if agent is not None else None,
+                "event": event,
+            }
+            record.update(fields)
+            self.buffer.append(record)
+            if self.path and len(self.buffer) >= self.buffer_size:
+                self.flush()
+        elif self.mode == "print" or self.seen % self.sample_every == 0:
+            try:
+                line = template.format(agent_id=getattr(agent, "unique_id", None),
+                                       agent_class=type(agent).__name__, **fields)
+            except Exception:
+                line = template  # a bad template or missing field must not stop the step
+            print(line)
+
+    def __call__(self, message: str):
+        # `logger` hook signature: one preformatted message
+        self.emit(None, "message", "{message}", {"message": message})
+
+    def flush(self):
+        """Append buffered structured records to `path` in one write."""
+        if not (self.path and self.buffer):
+            return
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(r, ensure_ascii=False, default=str) + "\n" for r in self.buffer))
+        self.written += len(self.buffer)
+        self.buffer.clear()
+
+    def close(self):
+        self.flush()
@@ -0,0 +1,125 @@
+""" Array-backed medication inventory with batched, first-come first-served dispensing. """
+
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+import heapq
+import numpy as np
+
+
+class MedicationInventory:
+    """Stock per drug in an int64 array; drug names map to indices through `codes`.
+
+    Also reads and writes like the `{drug: stock}` dict it replaces
+    (`inv["RX-A"]`, `inv.get(...)`, `inv["RX-A"] = 10`, `items()`).
+    Restocks are timed deliveries kept in a heap and applied by `restock(now)`.
+    """
+    def __init__(self, stock: Optional[Mapping[str, int]] = None):
+        self.drugs: List[str] = []
+        self.codes: Dict[str, int] = {}
+        self.stock = np.zeros(0, dtype=np.int64)
+        self.dispensed = np.zeros(0, dtype=np.int64)   # units handed out per drug
+        self.shortages = np.zeros(0, dtype=np.int64)   # prescriptions refused per drug
+        self._restocks: List[Tuple[int, int, int, int, Optional[int]]] = []
+        self._seq = 0
+        for drug, qty in (stock or {}).items():
+            self[drug] = qty
+
+    def code(self, drug: str) -> int:
+        code = self.codes.get(drug)
+        if code is None:
+            code = self.codes[drug] = len(self.drugs)
+            self.drugs.append(drug)
+            if code >= len(self.stock):
+                extra = max(8, len(self.stock))
+                self.stock, self.dispensed, self.shortages = (
+                    np.concatenate([arr, np.zeros(extra, dtype=np.int64)])
+                    for arr in (self.stock, self.dispensed, self.shortages))
+        return code
+
+    # dict interface
+    def __getitem__(self, drug: str) -> int:
+        return int(self.stock[self.codes[drug]])
+
+    def __setitem__(self, drug: str, qty: int):
+        code = self.code(drug)  # may grow the arrays
+        self.stock[code] = qty
+
+    def __contains__(self, drug: str) -> bool:
+        return drug in self.codes
+
+    def __len__(self):
+        return len(self.drugs)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.drugs)
+
+    def get(self, drug: str, default: Any = None) -> Any:
+        code = self.codes.get(drug)
+        return default if code is None else int(self.stock[code])
+
+    def items(self) -> Iterable[Tuple[str, int]]:
+        return zip(self.drugs, self.stock[:len(self.drugs)].tolist())
+
+    def to_dict(self) -> Dict[str, int]:
+        return dict(self.items())
+
+    def schedule_restock(self, drug: str, qty: int, at: int, every: Optional[int] = None):
+        """Deliver `qty` units of `drug` at step `at`, then every `every` steps if given."""
+        self._seq += 1
+        heapq.heappush(self._restocks, (int(at), self._seq, self.code(drug), int(qty), every))
+
+    def restock(self, now: int) -> int:
+        """Apply the deliveries due by step `now`; returns the number applied."""
+        applied = 0
+        while self._restocks and self._restocks[0][0] <= now:
+            at, _, code, qty, every = heapq.heappop(self._restocks)
+            self.stock[code] += qty
+            applied += 1
+            if every:
+                self._seq += 1
+                heapq.heappush(self._restocks, (at + every, self._seq, code, qty, every))
+        return applied
+
+    def dispense(self, codes: np.ndarray, qty: np.ndarray) -> np.ndarray:
+        """Serve a batch of requests (drug codes, quantities) in arrival order; returns the served mask.
+
+        Within a drug, requests are served first come first served while the
+        cumulative demand fits the stock: once one cannot be served, later
+        ones for that drug are refused too, even if smaller.
+        """
+        codes = np.asarray(codes, dtype=np.int64)
+        qty = np.asarray(qty, dtype=np.int64)
+        n = len(codes)
+        if n == 0:
+            return np.zeros(0, dtype=bool)
+        order = np.argsort(codes, kind="stable")
+        by_drug = codes[order]
+        q = qty[order]
+        total = np.cumsum(q)
+        starts = np.flatnonzero(np.r_[True, by_drug[1:] != by_drug[:-1]])
+        before = np.repeat(total[starts] - q[starts], np.diff(np.r_[starts, n]))
+        served = np.empty(n, dtype=bool)
+        served[order] = total - before <= self.stock[by_drug]
+        size = len(self.stock)
+        used = np.bincount(codes[served], weights=qty[served], minlength=size).astype(np.int64)
+        self.stock -= used
+        self.dispensed += used
+        self.shortages += np.bincount(codes[~served], minlength=size)
+        return served
+
+    def dispense_prescriptions(self, prescriptions: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+        """Dispense a list of `{"drug", "qty"}` dicts as one batch.
+
+        Returns arrays over the prescriptions: `drug` codes, `qty`, `served`,
+        and `have` (stock left for the drug once the batch is processed).
+        """
+        names = [rx.get("drug", "UNKNOWN") for rx in prescriptions]
+        get = self.codes.get
+        codes = [get(name) for name in names]
+        if None in codes:  # new drugs, registered with no stock
+            codes = [self.code(name) for name in names]
+        codes = np.array(codes, dtype=np.int64)
+        qty = np.array([rx.get("qty", 1) for rx in prescriptions], dtype=np.int64)
+        served = self.dispense(codes, qty)
+        return {"drug": codes, "qty": qty, "served": served, "have": self.stock[codes]}
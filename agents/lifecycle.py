@@ -0,0 +1,104 @@
+""" Patient lifecycle: id allocation with recycling, and the archive of discharged patients. """
+
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+from collections import deque
+from typing import Dict, List, Tuple
+import numpy as np
+import pandas as pd
+
+# A patient reaching one of these states leaves the model at the end of the step
+TERMINAL_STATES = ("Traité", "Abandon")
+
+# Archive column -> dtype; code columns index the AgentState categories of the same name
+ARCHIVE_COLUMNS = {
+    "unique_id": np.int64,
+    "patient_id": np.int64,
+    "generation": np.int32,
+    "admitted_step": np.int64,
+    "discharged_step": np.int64,
+    "etat": np.int32,
+    "categorie_patient": np.int32,
+    "service_attribue": np.int32,
+    "satisfaction": np.float64,
+    "temps_attente": np.float64,
+}
+_CODES = ("etat", "categorie_patient", "service_attribue")
+
+
+class PatientIds:
+    """Allocates patient unique_ids, reusing those of discharged patients first.
+
+    A reused id comes with its `generation` (number of earlier holders), so
+    the per-agent random stream of the new patient differs from the old one.
+    """
+    def __init__(self, start: int):
+        self.next = int(start)
+        self._free = deque()
+        self._generation: Dict[int, int] = {}
+
+    def allocate(self) -> Tuple[int, int]:
+        """(unique_id, generation) for a new patient."""
+        if self._free:
+            uid = self._free.popleft()
+            return uid, self._generation[uid]
+        uid = self.next
+        self.next += 1
+        return uid, 0
+
+    def release(self, uid: int):
+        self._generation[uid] = self._generation.get(uid, 0) + 1
+        self._free.append(uid)
+
+
+class DischargeArchive:
+    """Final record of every discharged patient, in growable typed arrays.
+
+    `categories` is the `AgentState.categories` mapping the code columns
+    refer to (codes are never reassigned, so it can be shared).
+    """
+    def __init__(self, categories: Dict[str, List[str]], capacity: int = 1024):
+        self.categories = categories
+        self._data = {name: np.empty(capacity, dtype=dtype) for name, dtype in ARCHIVE_COLUMNS.items()}
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_data"] = {name: arr[:self._size].copy() for name, arr in self._data.items()}
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._reserve(1)
+
+    def _reserve(self, extra: int):
+        need = self._size + extra
+        capacity = len(self._data["unique_id"])
+        if need <= capacity:
+            return
+        capacity = max(need, 2 * capacity, 1024)
+        for name, arr in self._data.items():
+            grown = np.empty(capacity, dtype=arr.dtype)
+            grown[:self._size] = arr[:self._size]
+            self._data[name] = grown
+
+    def append_columns(self, columns: Dict[str, np.ndarray]):
+        n = len(columns["unique_id"])
+        self._reserve(n)
+        for name, arr in self._data.items():
+            arr[self._size:self._size + n] = columns[name]
+        self._size += n
+
+    def column(self, name: str) -> np.ndarray:
+        return self._data[name][:self._size]
+
+    def to_frame(self) -> pd.DataFrame:
+        """Archive as a DataFrame, codes decoded (-1 -> missing)."""
+        df = pd.DataFrame({name: self.column(name) for name in ARCHIVE_COLUMNS})
+        for name in _CODES:
+            labels = np.array(list(self.categories[name]) + [None], dtype=object)
+            df[name] = labels[df[name].to_numpy()]
+        return df
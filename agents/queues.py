@@ -0,0 +1,138 @@
+""" Shared model queues: deque-backed FIFO and heap-backed priority queues with counters. """
+
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+from collections import deque
+from itertools import count
+from typing import Any, Callable, Dict, Iterator, Optional
+import heapq
+
+# Lower value is served first; unknown acuities go after the known ones
+ACUITY_PRIORITY = {"emergency": 0, "urgent": 1, "consultation": 2}
+
+
+def acuity_priority(item: Any) -> int:
+    """Priority of a patient from its `acuity` attribute (default 'consultation')."""
+    return ACUITY_PRIORITY.get(getattr(item, "acuity", "consultation"), len(ACUITY_PRIORITY))
+
+
+class _QueueBase:
+    """Counters and wait-time accounting shared by the queue types.
+
+    `clock` is a callable returning the current time (the model step); wait
+    times are only accounted once a clock is bound.
+    """
+    def __init__(self, name: Optional[str] = None, clock: Optional[Callable[[], float]] = None):
+        self.name = name
+        self.clock = clock
+        self.pushed = 0
+        self.popped = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _now(self):
+        return self.clock() if self.clock is not None else None
+
+    def _account(self, t_in):
+        self.popped += 1
+        if t_in is not None and self.clock is not None:
+            wait = self.clock() - t_in
+            self.total_wait += wait
+            if wait > self.max_wait:
+                self.max_wait = wait
+
+    @property
+    def mean_wait(self) -> float:
+        return self.total_wait / self.popped if self.popped else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queue": self.name,
+            "length": len(self),
+            "pushed": self.pushed,
+            "popped": self.popped,
+            "mean_wait": self.mean_wait,
+            "max_wait": self.max_wait,
+        }
+
+    def __bool__(self):
+        return len(self) > 0
+
+
+class FifoQueue(_QueueBase):
+    """First-in first-out queue with O(1) `append`/`popleft`."""
+    def __init__(self, items=(), name: Optional[str] = None, clock: Optional[Callable[[], float]] = None):
+        super().__init__(name, clock)
+        self._items = deque()
+        for item in items:
+            self.append(item)
+
+    def append(self, item: Any):
+        self._items.append((self._now(), item))
+        self.pushed += 1
+
+    def popleft(self) -> Any:
+        t_in, item = self._items.popleft()
+        self._account(t_in)
+        return item
+
+    def peek(self) -> Any:
+        return self._items[0][1]
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[Any]:
+        return (item for _, item in self._items)
+
+
+class PriorityQueue(_QueueBase):
+    """Priority queue with O(log n) `append`/`popleft`, FIFO among equal priorities.
+
+    `key` maps an item to its priority (lower first); defaults to `acuity_priority`.
+    Iteration order is heap order, not service order.
+    """
+    def __init__(self, items=(), key: Callable[[Any], Any] = acuity_priority,
+                 name: Optional[str] = None, clock: Optional[Callable[[], float]] = None):
+        super().__init__(name, clock)
+        self.key = key
+        self._heap = []
+        self._seq = count()
+        for item in items:
+            self.append(item)
+
+    def append(self, item: Any):
+        heapq.heappush(self._heap, (self.key(item), next(self._seq), self._now(), item))
+        self.pushed += 1
+
+    def popleft(self) -> Any:
+        _, _, t_in, item = heapq.heappop(self._heap)
+        self._account(t_in)
+        return item
+
+    def peek(self) -> Any:
+        return self._heap[0][3]
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __iter__(self) -> Iterator[Any]:
+        return (entry[3] for entry in self._heap)
+
+
+class ModelClock:
+    """Clock reading the model's schedule time (0 before a schedule exists); picklable."""
+    def __init__(self, model: Any):
+        self.model = model
+
+    def __call__(self) -> float:
+        return getattr(getattr(self.model, "schedule", None), "time", 0)
+
+
+def model_clock(model: Any) -> Callable[[], float]:
+    return ModelClock(model)
+
+
+def queue_stats(model: Any) -> Dict[str, Dict[str, Any]]:
+    """Stats of every shared queue attached to `model`, keyed by attribute name."""
+    return {name: q.stats() for name, q in vars(model).items() if isinstance(q, _QueueBase)}
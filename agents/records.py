@@ -0,0 +1,304 @@
+""" Append-only columnar store for medical-record entries, indexed by patient and step. """
+
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+from typing import Any, Dict, List, Optional
+import os
+import uuid
+import numpy as np
+import pandas as pd
+
+# Column name -> dtype; `action` holds codes into `RecordStore.actions`
+COLUMNS = {
+    "step": np.int64,
+    "patient_id": np.int64,
+    "action": np.int32,
+    "agent_id": np.int64,
+    "generation": np.int32,
+}
+MISSING_ID = -1
+
+
+class _Chunk:
+    """Sealed block of records: columns plus a patient index, in memory or memory-mapped.
+
+    `order` lists the rows sorted by patient; `keys`/`starts` give, for each
+    patient present, where its rows begin in `order`.
+    """
+    def __init__(self, columns: Dict[str, np.ndarray]):
+        pid = columns["patient_id"]
+        order = np.argsort(pid, kind="stable").astype(np.int32)
+        keys, starts = np.unique(pid[order], return_index=True)
+        self.arrays = dict(columns, order=order, keys=keys, starts=starts)
+        self.size = len(pid)
+        self.step_min = int(columns["step"][0])
+        self.step_max = int(columns["step"][-1])
+        self.paths: Dict[str, str] = {}
+
+    def spill(self, directory: str, stem: str):
+        """Move the arrays to .npy files in `directory` and map them back read-only."""
+        for name, arr in self.arrays.items():
+            path = os.path.join(directory, f"{stem}.{name}.npy")
+            np.save(path, arr)
+            self.paths[name] = path
+        self._map()
+
+    def _map(self):
+        self.arrays = {name: np.load(path, mmap_mode="r") for name, path in self.paths.items()}
+
+    def delete_files(self):
+        for path in self.paths.values():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def rows_of(self, patient_id: int) -> np.ndarray:
+        keys = self.arrays["keys"]
+        i = int(np.searchsorted(keys, patient_id))
+        if i == len(keys) or keys[i] != patient_id:
+            return np.empty(0, dtype=np.int32)
+        end = self.arrays["starts"][i + 1] if i + 1 < len(keys) else self.size
+        return np.sort(self.arrays["order"][self.arrays["starts"][i]:end])
+
+    def __getstate__(self):
+        # Spilled arrays are referenced by path, not copied into checkpoints
+        state = self.__dict__.copy()
+        if self.paths:
+            state["arrays"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self.paths:
+            missing = [p for p in self.paths.values() if not os.path.exists(p)]
+            if missing:
+                raise FileNotFoundError(f"Spilled record files are gone: {missing[0]}")
+            self._map()
+
+
+class RecordStore:
+    """Medical-record and audit entries (step, patient_id, action, agent_id, generation) in typed arrays.
+
+    `generation` tells apart successive patients holding a recycled id
+    (see `agents.lifecycle.PatientIds`); it is 0 for a first holder.
+
+    Rows are appended in step order to an open block of `chunk_rows` rows;
+    full blocks are sealed with a per-patient index, so `query(patient_id=...)`
+    is a binary search per block and step ranges only visit the blocks that
+    overlap them. With `spill_dir`, sealed blocks are written to .npy files
+    and memory-mapped, keeping only the open block in RAM.
+
+    Retention: with `retain_steps`, entries older than the last
+    `retain_steps` steps are no longer returned; with `max_records`, only
+    about the newest `max_records` are kept. Expired blocks are dropped (and
+    their files deleted) when a block is sealed; `compact()` reclaims the rest.
+    Files referenced by the last checkpoint (`pin`) are kept until the next one.
+    """
+    def __init__(self, chunk_rows: int = 65_536, retain_steps: Optional[int] = None,
+                 max_records: Optional[int] = None, spill_dir: Optional[str] = None):
+        self.chunk_rows = int(chunk_rows)
+        self.retain_steps = retain_steps
+        self.max_records = max_records
+        self.spill_dir = spill_dir
+        self.owns_files = True  # False once detached: spilled files are then never deleted
+        self.actions: List[str] = []
+        self._codes: Dict[str, int] = {}
+        self._chunks: List[_Chunk] = []
+        self._open = {name: np.empty(self.chunk_rows, dtype=dtype) for name, dtype in COLUMNS.items()}
+        self._size = 0
+        self._sealed = 0   # blocks sealed so far (names the spill files)
+        self._token = uuid.uuid4().hex[:12]  # names the spill files of this store
+        self._pinned = set()       # spill files the last checkpoint references
+        self._unreferenced = []    # pinned files of dropped blocks, deleted by the next `pin`
+        self.total = 0     # records appended, including dropped ones
+        self.last_step = None
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+
+    def __len__(self):
+        """Records currently stored (expired ones not yet reclaimed included)."""
+        return self._size + sum(c.size for c in self._chunks)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_open"] = {name: arr[:self._size].copy() for name, arr in self._open.items()}
+        state["_pinned"] = set(self._files())  # the copy is restored from these files
+        state["_unreferenced"] = []
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._token = uuid.uuid4().hex[:12]  # a restored copy spills under its own names
+        for name, arr in self._open.items():
+            full = np.empty(self.chunk_rows, dtype=arr.dtype)
+            full[:len(arr)] = arr
+            self._open[name] = full
+
+    def code(self, action: str) -> int:
+        code = self._codes.get(action)
+        if code is None:
+            code = self._codes[action] = len(self.actions)
+            self.actions.append(action)
+        return code
+
+    def append(self, step: int, patient_id: Any, action: str, agent_id: Any = MISSING_ID, generation: int = 0):
+        if self.last_step is not None and step < self.last_step:
+            raise ValueError(f"Records must be appended in step order ({step} < {self.last_step})")
+        i = self._size
+        cols = self._open
+        cols["step"][i] = step
+        cols["patient_id"][i] = patient_id if isinstance(patient_id, (int, np.integer)) else MISSING_ID
+        cols["action"][i] = self.code(action)
+        cols["agent_id"][i] = agent_id if isinstance(agent_id, (int, np.integer)) else MISSING_ID
+        cols["generation"][i] = generation
+        self._size = i + 1
+        self.total += 1
+        self.last_step = step
+        if self._size == self.chunk_rows:
+            self._seal()
+
+    def _seal(self):
+        chunk = _Chunk({name: arr[:self._size].copy() for name, arr in self._open.items()})
+        if self.spill_dir:
+            chunk.spill(self.spill_dir, self._stem())
+        self._sealed += 1
+        self._chunks.append(chunk)
+        self._size = 0
+        self._drop_expired()
+
+    def _cutoff(self) -> Optional[int]:
+        if self.retain_steps is None or self.last_step is None:
+            return None
+        return self.last_step - self.retain_steps + 1
+
+    def _stem(self) -> str:
+        return f"records-{self._token}-{self._sealed}"
+
+    def _files(self) -> List[str]:
+        return [path for chunk in self._chunks for path in chunk.paths.values()]
+
+    def _drop(self, n: int):
+        for chunk in self._chunks[:n]:
+            if not self.owns_files:
+                continue
+            if self._pinned.intersection(chunk.paths.values()):
+                self._unreferenced.extend(chunk.paths.values())
+            else:
+                chunk.delete_files()
+        del self._chunks[:n]
+
+    def pin(self):
+        """Keep the current spill files until the next `pin` (called after a checkpoint is written).
+
+        Files of blocks dropped since the previous checkpoint are deleted now.
+        """
+        for path in self._unreferenced:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self._unreferenced = []
+        self._pinned = set(self._files())
+
+    def _drop_expired(self):
+        cutoff = self._cutoff()
+        n = 0
+        if cutoff is not None:
+            while n < len(self._chunks) and self._chunks[n].step_max < cutoff:
+                n += 1
+        if self.max_records is not None:
+            stored = len(self) - sum(c.size for c in self._chunks[:n])
+            while n < len(self._chunks) and stored - self._chunks[n].size >= self.max_records:
+                stored -= self._chunks[n].size
+                n += 1
+        self._drop(n)
+
+    def compact(self):
+        """Reclaim all expired entries now, including those in a partly expired block."""
+        self._drop_expired()
+        cutoff = self._cutoff()
+        if cutoff is None or not self._chunks or self._chunks[0].step_min >= cutoff:
+            return
+        first = self._chunks[0]
+        start = int(np.searchsorted(first.arrays["step"], cutoff))
+        kept = _Chunk({name: np.array(first.arrays[name][start:]) for name in COLUMNS})
+        if self.spill_dir:
+            kept.spill(self.spill_dir, self._stem())
+            self._sealed += 1
+        self._drop(1)
+        self._chunks.insert(0, kept)
+
+    def detach(self):
+        """Stop sharing files with the process that spilled them (forked scenarios)."""
+        self.owns_files = False
+        self.spill_dir = None
+
+    def _blocks(self):
+        for chunk in self._chunks:
+            yield chunk, chunk.arrays, chunk.size
+        if self._size:
+            yield None, self._open, self._size
+
+    def query(self, patient_id: Optional[int] = None, start: Optional[int] = None,
+              stop: Optional[int] = None, agent_id: Optional[int] = None,
+              generation: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Columns of the retained entries matching all given filters, in append order.
+
+        `start`/`stop` bound the step as in `range` (stop excluded); without
+        `generation`, entries of every holder of `patient_id` are returned.
+        """
+        cutoff = self._cutoff()
+        if cutoff is not None:
+            start = cutoff if start is None else max(start, cutoff)
+        parts = []
+        for chunk, arrays, size in self._blocks():
+            if chunk is not None and ((start is not None and chunk.step_max < start)
+                                      or (stop is not None and chunk.step_min >= stop)):
+                continue
+            steps = arrays["step"][:size]
+            lo = 0 if start is None else int(np.searchsorted(steps, start))
+            hi = size if stop is None else int(np.searchsorted(steps, stop))
+            if patient_id is not None:
+                if chunk is not None:
+                    rows = chunk.rows_of(patient_id)
+                else:
+                    rows = np.flatnonzero(arrays["patient_id"][:size] == patient_id)
+                rows = rows[(rows >= lo) & (rows < hi)]
+            else:
+                rows = np.arange(lo, hi)
+            if agent_id is not None and len(rows):
+                rows = rows[arrays["agent_id"][rows] == agent_id]
+            if generation is not None and len(rows):
+                rows = rows[arrays["generation"][rows] == generation]
+            if len(rows):
+                parts.append({name: np.asarray(arrays[name][rows]) for name in COLUMNS})
+        if not parts:
+            return {name: np.empty(0, dtype=dtype) for name, dtype in COLUMNS.items()}
+        return {name: np.concatenate([p[name] for p in parts]) for name in COLUMNS}
+
+    def to_frame(self, **filters) -> pd.DataFrame:
+        """`query` result as a DataFrame with action labels."""
+        cols = self.query(**filters)
+        df = pd.DataFrame(cols)
+        df["action"] = pd.Categorical.from_codes(cols["action"], categories=self.actions) if self.actions \
+            else df["action"].astype(object)
+        return df
+
+    def dossier(self, patient_id: int, generation: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Entries of one patient in the former `patient.dossier_medical` format.
+
+        A recycled `patient_id` is resolved to its latest holder unless `generation` is given.
+        """
+        cols = self.query(patient_id=patient_id)
+        if len(cols["generation"]):
+            keep = cols["generation"] == (cols["generation"].max() if generation is None else generation)
+            cols = {name: arr[keep] for name, arr in cols.items()}
+        return [{"step": int(s), "donnee": self.actions[a], "confidentiel": True}
+                for s, a in zip(cols["step"], cols["action"])]
+
+    def audit(self, agent_id: int) -> List[Dict[str, Any]]:
+        """Entries written by one agent in the former `journal_audit` format."""
+        cols = self.query(agent_id=agent_id)
+        return [{"patient_id": int(p) if p != MISSING_ID else "N/A", "action": self.actions[a], "step": int(s)}
+                for p, a, s in zip(cols["patient_id"], cols["action"], cols["step"])]
@@ -0,0 +1,140 @@
+""" Multi-server resource pools (doctors, beds, rooms) with timed service and utilization stats. """
+
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+from typing import Any, Callable, Dict, List, Optional
+import heapq
+
+
+class ResourcePool:
+    """`capacity` identical servers; each busy server is freed at its busy-until time.
+
+    `acquire(duration, holder)` takes a free server until `now + duration`
+    (kept in a heap); servers are released lazily as the clock passes their
+    time, and the holders of finished services are handed back by
+    `finished()`. `acquire(None)` holds a server until `release()`.
+    `clock` is a callable returning the current time (the model step), as for
+    the queues.
+
+    Stats integrate the number of busy servers over time, so `utilization()`
+    is exact whatever the service durations.
+    """
+    def __init__(self, capacity: int = 0, name: Optional[str] = None, clock: Optional[Callable[[], float]] = None):
+        self.name = name
+        self.clock = clock
+        self._busy: List[tuple] = []   # heap of (until, seq, holder, start)
+        self._done: List[Any] = []     # holders whose service ended, not yet collected
+        self._seq = 0
+        self.held = 0                  # servers held without end time
+        self.acquired = 0
+        self.completed = 0
+        self.blocked = 0               # requests that found no free server
+        self.service_time = 0.0        # total duration of completed timed services
+        self.peak_busy = 0
+        # Integrals over time of busy servers and of capacity
+        self._t = self._now()
+        self._busy_area = 0.0
+        self._capacity_area = 0.0
+        self._capacity = max(0, int(capacity))
+
+    def _now(self) -> float:
+        return self.clock() if self.clock is not None else 0
+
+    def _advance(self, t: float):
+        if t > self._t:
+            dt = t - self._t
+            self._busy_area += (len(self._busy) + self.held) * dt
+            self._capacity_area += self._capacity * dt
+            self._t = t
+
+    def _release(self, now: float):
+        busy = self._busy
+        while busy and busy[0][0] <= now:
+            self._advance(busy[0][0])
+            until, _, holder, start = heapq.heappop(busy)
+            self.completed += 1
+            self.service_time += until - start
+            if holder is not None:
+                self._done.append(holder)
+        self._advance(now)
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @capacity.setter
+    def capacity(self, value: int):
+        # Scenarios resize pools; busy servers above the new capacity finish their service
+        self._release(self._now())
+        self._capacity = max(0, int(value))
+
+    @property
+    def busy(self) -> int:
+        self._release(self._now())
+        return len(self._busy) + self.held
+
+    @property
+    def available(self) -> int:
+        return max(0, self._capacity - self.busy)
+
+    def can_serve(self) -> bool:
+        """True if a server is free now; a request that finds none is counted in `blocked`."""
+        if self.available:
+            return True
+        self.blocked += 1
+        return False
+
+    def acquire(self, duration: Optional[float] = None, holder: Any = None) -> bool:
+        """Take a free server for `duration` time units (None: until `release`)."""
+        if not self.available:
+            self.blocked += 1
+            return False
+        now = self._now()
+        if duration is None:
+            self.held += 1
+        else:
+            self._seq += 1
+            heapq.heappush(self._busy, (now + duration, self._seq, holder, now))
+        self.acquired += 1
+        busy = len(self._busy) + self.held
+        if busy > self.peak_busy:
+            self.peak_busy = busy
+        return True
+
+    def release(self, amount: int = 1):
+        """Give back `amount` servers taken with `acquire(None)`."""
+        self._advance(self._now())
+        self.held = max(0, self.held - amount)
+
+    def finished(self) -> List[Any]:
+        """Holders whose service has ended since the last call, in end-time order."""
+        self._release(self._now())
+        done, self._done = self._done, []
+        return done
+
+    def next_free(self) -> Optional[float]:
+        """Time at which the next timed service ends (None if none is running)."""
+        return self._busy[0][0] if self._busy else None
+
+    def utilization(self) -> float:
+        self._release(self._now())
+        return self._busy_area / self._capacity_area if self._capacity_area else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        busy = self.busy
+        return {
+            "pool": self.name,
+            "capacity": self._capacity,
+            "busy": busy,
+            "acquired": self.acquired,
+            "completed": self.completed,
+            "blocked": self.blocked,
+            "peak_busy": self.peak_busy,
+            "mean_service": self.service_time / self.completed if self.completed else 0.0,
+            "utilization": self.utilization(),
+        }
+
+
+def resource_stats(model: Any) -> Dict[str, Dict[str, Any]]:
+    """Stats of every resource pool attached to `model`, keyed by attribute name."""
+    return {name: pool.stats() for name, pool in vars(model).items() if isinstance(pool, ResourcePool)}
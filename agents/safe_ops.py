@@ -0,0 +1,144 @@
+""" Defensive helpers shared by the agents for optional model attributes and queues. """
+
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+from collections import deque
+from typing import Any
+from mesa import Agent
+
+from .event_log import EventLog
+from .inventory import MedicationInventory
+from .queues import FifoQueue, _QueueBase, model_clock
+from .resources import ResourcePool
+
+
+class SafeOps:
+    @staticmethod
+    def queue(model: Any, name: str, kind: type = FifoQueue):
+        """Return the model queue `name`, upgrading a plain list/deque to a `kind` queue.
+
+        `kind` is FifoQueue or PriorityQueue. Returns None when the model has no such attribute.
+        """
+        q = getattr(model, name, None)
+        if q is None:
+            return None
+        if isinstance(q, (list, deque)):
+            q = kind(q, name=name, clock=model_clock(model))
+            setattr(model, name, q)
+        elif isinstance(q, _QueueBase):
+            if q.name is None:
+                q.name = name
+            if q.clock is None:
+                q.clock = model_clock(model)
+        return q
+
+    @staticmethod
+    def inventory(model: Any, name: str = "med_inventory"):
+        """Return the model inventory `name`, upgrading a `{drug: stock}` dict to a MedicationInventory.
+
+        Returns None when the model has no such attribute.
+        """
+        inv = getattr(model, name, None)
+        if isinstance(inv, dict):
+            inv = MedicationInventory(inv)
+            setattr(model, name, inv)
+        return inv
+
+    @staticmethod
+    def pool(model: Any, name: str):
+        """Return the model resource pool `name`, upgrading an int capacity to a ResourcePool.
+
+        Returns None when the model has no such attribute.
+        """
+        p = getattr(model, name, None)
+        if p is None:
+            return None
+        if not isinstance(p, ResourcePool):
+            p = ResourcePool(max(0, int(p)), name=name, clock=model_clock(model))
+            setattr(model, name, p)
+        return p
+
+    @staticmethod
+    def pop_queue(q: Any):
+        try:
+            if not q:
+                return None
+            return q.pop(0) if isinstance(q, list) else q.popleft()
+        except Exception:
+            return None
+
+    @staticmethod
+    def push_queue(q: Any, item: Any):
+        try:
+            q.append(item)
+        except Exception:
+            pass
+
+    @staticmethod
+    def dec_slot(model: Any, name: str, amount: int = 1) -> bool:
+        v = getattr(model, name, 0)
+        if isinstance(v, ResourcePool):
+            if v.available < amount:
+                v.blocked += 1
+                return False
+            for _ in range(amount):
+                v.acquire(None)
+            return True
+        v = max(0, int(v))
+        if v >= amount:
+            setattr(model, name, v - amount)
+            return True
+        return False
+
+    @staticmethod
+    def inc_slot(model: Any, name: str, amount: int = 1):
+        v = getattr(model, name, 0)
+        if isinstance(v, ResourcePool):
+            v.release(amount)
+            return
+        v = max(0, int(v))
+        setattr(model, name, v + amount)
+
+    @staticmethod
+    def has(model: Any, name: str) -> bool:
+        return hasattr(model, name)
+
+    @staticmethod
+    def _sink(agent: Agent):
+        # The agent's own logger hook wins over the model-level policy
+        return getattr(agent, "logger", None) or getattr(agent.model, "event_log", None)
+
+    @staticmethod
+    def _write(sink: Any, agent: Agent, event: str, template: str, fields: dict):
+        if isinstance(sink, EventLog):
+            sink.emit(agent, event, template, fields)
+        elif callable(sink):
+            try:
+                sink(template.format(agent_id=agent.unique_id, agent_class=agent.__class__.__name__, **fields))
+            except Exception:
+                pass
+
+    @staticmethod
+    def log(agent: Agent, msg: str, **fields):
+        """Log message if agent has a logger callable, or to a structured/sampled model EventLog.
+
+        `msg` may contain `{field}` placeholders filled from `fields`; it is
+        only formatted when a line is actually written.
+        """
+        sink = getattr(agent, "logger", None)
+        if sink is None:
+            # Without a logger these lines were never printed; the EventLog only records them
+            # when it is structured or sampled
+            sink = getattr(agent.model, "event_log", None)
+            if not isinstance(sink, EventLog) or sink.mode not in ("structured", "sampled"):
+                return
+        SafeOps._write(sink, agent, "log", "[{agent_id}:{agent_class}] " + msg, fields)
+
+    @staticmethod
+    def emit(agent: Agent, event: str, template: str, **fields):
+        """Report a named agent event; printed directly when no logging policy exists."""
+        sink = SafeOps._sink(agent)
+        if sink is None:
+            print(template.format(**fields))
+        else:
+            SafeOps._write(sink, agent, event, template, fields)
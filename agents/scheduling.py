@@ -0,0 +1,120 @@
+""" Event-driven activation: only agents with work to do are stepped each tick. """
+
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Union
+import heapq
+
+from mesa.time import RandomActivation
+
+SCHEDULERS = ("random", "event")
+
+
+class EventActivation(RandomActivation):
+    """Random activation restricted to the agents woken for the current tick.
+
+    Agents declare when they have work through class attributes:
+      - wake_on: names of model attributes (queues, lists); the agent is
+        woken on every tick at which one of them is non-empty
+      - wake_every: period in ticks (or the name of a model attribute holding
+        it); the agent is woken at the ticks that are multiples of it
+    Agents declaring neither are stepped every tick, as with RandomActivation.
+    `wake_at(agent, time)` adds one-off timed wake-ups (e.g. end of a service).
+
+    Conditions are checked once at the start of a tick, so work created
+    during a tick wakes its consumers on the next one. Watched attributes are
+    polled once per tick, not once per agent, and timers sit in a heap:
+    idle agents cost nothing. Woken agents run in random order.
+    """
+    def __init__(self, model: Any):
+        super().__init__(model)
+        self._spec: Dict[Any, tuple] = {}                    # agent -> watched attribute names
+        self._always: Dict[Any, None] = {}                   # agents stepped every tick
+        self._watchers: Dict[str, Dict[Any, None]] = defaultdict(dict)
+        self._timers: List[tuple] = []                       # heap of (time, seq, agent, periodic)
+        self._periodic: Dict[Any, int] = {}                  # agent -> seq of its live periodic timer
+        self._seq = 0
+        self.activations = 0  # agent steps run so far
+        self.last_woken = 0   # agents stepped at the last tick
+
+    def _period(self, agent: Any) -> Optional[int]:
+        every = getattr(agent, "wake_every", None)
+        if isinstance(every, str):
+            every = getattr(self.model, every, None)
+        return int(every) if every else None
+
+    def _push(self, time: float, agent: Any, periodic: bool = False) -> int:
+        self._seq += 1
+        heapq.heappush(self._timers, (time, self._seq, agent, periodic))
+        return self._seq
+
+    def _arm(self, agent: Any, after: float):
+        # Next multiple of the (current) period strictly after `after`
+        period = self._period(agent)
+        if period:
+            self._periodic[agent] = self._push((after // period + 1) * period, agent, periodic=True)
+
+    def add(self, agent: Any):
+        super().add(agent)
+        names = tuple(getattr(agent, "wake_on", ()) or ())
+        self._spec[agent] = names
+        for name in names:
+            self._watchers[name][agent] = None
+        if self._period(agent):
+            self._arm(agent, self.time - 1)
+        elif not names:
+            self._always[agent] = None
+
+    def remove(self, agent: Any):
+        super().remove(agent)
+        for name in self._spec.pop(agent, ()):
+            self._watchers[name].pop(agent, None)
+        self._always.pop(agent, None)
+        self._periodic.pop(agent, None)  # its heap entries are dropped when they come up
+
+    def wake_at(self, agent: Any, time: float):
+        """Step `agent` at tick `time` (at the next tick if `time` has passed)."""
+        self._push(time, agent)
+
+    def woken(self) -> List[Any]:
+        """Agents to step at the current tick, in activation (random) order."""
+        now = self.time
+        woken = dict(self._always)
+        model = self.model
+        for name, agents in self._watchers.items():
+            if agents and getattr(model, name, None):
+                woken.update(agents)
+        timers = self._timers
+        while timers and timers[0][0] <= now:
+            _, seq, agent, periodic = heapq.heappop(timers)
+            if agent not in self._spec:
+                continue
+            if periodic:
+                if self._periodic.get(agent) != seq:
+                    continue
+                self._arm(agent, now)
+            woken[agent] = None
+        agents = list(woken)
+        model.random.shuffle(agents)
+        return agents
+
+    def activate(self, method: Union[str, Callable[[Any], Any]] = "step"):
+        """Run `method` (an agent method name, or a callable taking the agent) on
+        the woken agents, then advance the clock."""
+        agents = self.woken()
+        spec = self._spec
+        for agent in agents:
+            if agent not in spec:  # removed earlier in this tick
+                continue
+            if callable(method):
+                method(agent)
+            else:
+                getattr(agent, method)()
+        self.activations += len(agents)
+        self.last_woken = len(agents)
+        self.steps += 1
+        self.time += 1
+
+    def step(self):
+        self.activate("step")
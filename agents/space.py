@@ -0,0 +1,88 @@
+""" Array-backed grid positions: cells are only built when something asks for their contents. """
+
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+
+from .state import POS_MASK, POS_SHIFT, AgentState
+
+# Values of CliniqueModel(space=...): mesa MultiGrid, ArrayGrid, or no positions at all
+SPACES = ("multigrid", "array", None)
+
+
+class ArrayGrid:
+    """Drop-in for the parts of mesa's MultiGrid the model and `CanvasGrid` use.
+
+    Positions are the agents' `pos` field in `AgentState` (one int64 per
+    agent), so placing an agent is one array write and there are no per-cell
+    lists to maintain. `get_cell_list_contents` builds a cell -> agents map
+    from the arrays on first use after a change (e.g. once per render).
+    """
+    def __init__(self, state: AgentState, width: int, height: int, torus: bool = True):
+        self.state = state
+        self.width = width
+        self.height = height
+        self.torus = torus
+        self._version = 0
+        self._cells: Optional[Dict[Tuple[int, int], List[Any]]] = None
+        self._cells_version = -1
+
+    def _cell(self, pos) -> Tuple[int, int]:
+        x, y = pos
+        if self.torus:
+            return x % self.width, y % self.height
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise ValueError(f"Position {pos} is outside the {self.width}x{self.height} grid")
+        return x, y
+
+    def place_agent(self, agent: Any, pos):
+        agent.pos = self._cell(pos)
+        self._version += 1
+
+    def move_agent(self, agent: Any, pos):
+        self.place_agent(agent, pos)
+
+    def remove_agent(self, agent: Any):
+        agent.pos = None
+        self._version += 1
+
+    def positions(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(slots, x, y) of the placed agents."""
+        packed = self.state.arrays["pos"][:self.state.size]
+        slots = np.flatnonzero((packed >= 0) & self.state.active[:self.state.size])
+        packed = packed[slots]
+        return slots, packed >> POS_SHIFT, packed & POS_MASK
+
+    def counts(self) -> np.ndarray:
+        """Agents per cell as a (width, height) array."""
+        _, x, y = self.positions()
+        return np.bincount(x * self.height + y, minlength=self.width * self.height).reshape(self.width, self.height)
+
+    def cells(self) -> Dict[Tuple[int, int], List[Any]]:
+        """Occupied cells and their agents, rebuilt only after positions changed."""
+        if self._cells_version != self._version:
+            slots, x, y = self.positions()
+            agents = self.state.agents
+            cells = defaultdict(list)
+            for slot, cx, cy in zip(slots.tolist(), x.tolist(), y.tolist()):
+                cells[(cx, cy)].append(agents[slot])
+            self._cells = dict(cells)
+            self._cells_version = self._version
+        return self._cells
+
+    def get_cell_list_contents(self, cell_list: Iterable[Tuple[int, int]]) -> List[Any]:
+        cells = self.cells()
+        if isinstance(cell_list, tuple) and len(cell_list) == 2 and isinstance(cell_list[0], int):
+            cell_list = [cell_list]
+        return [agent for cell in cell_list for agent in cells.get(tuple(cell), ())]
+
+    def is_cell_empty(self, pos) -> bool:
+        return not self.cells().get(tuple(pos))
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_cells"] = None  # rebuilt on demand
+        state["_cells_version"] = -1
+        return state
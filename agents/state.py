@@ -0,0 +1,557 @@
+""" Model-owned struct-of-arrays storage for agent state, indexed by agent slot. """
+
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+from typing import Any, Dict, List, Optional
+import numpy as np
+from mesa import Agent
+
+# Attribute name -> storage kind. Unset values use a per-kind sentinel so
+# that hasattr()/getattr(..., default) keep their meaning for agents.
+FIELDS = {
+    "temps_attente": "float",
+    "satisfaction": "float",
+    "charge": "float",
+    "patient_id": "int",
+    "agent_id": "int",
+    "admitted_step": "int",
+    "etat": "code",
+    "agent_type": "code",
+    "categorie_patient": "code",
+    "service_attribue": "code",
+    "has_event_this_step": "flag",
+    "pos": "pos",
+}
+UNSET_INT = np.iinfo(np.int64).min
+_FILL = {"float": np.nan, "int": UNSET_INT, "code": -1, "flag": False, "pos": -1}
+_DTYPE = {"float": np.float64, "int": np.int64, "code": np.int32, "flag": bool, "pos": np.int64}
+
+# Grid cells (x, y) are packed in one int64: x in the high 32 bits, y in the low ones
+POS_SHIFT = 32
+POS_MASK = (1 << POS_SHIFT) - 1
+
+
+def pack_pos(pos) -> int:
+    return -1 if pos is None else (int(pos[0]) << POS_SHIFT) | int(pos[1])
+
+_MISSING = object()
+
+# Float fields with per-agent-type running aggregates
+TRACKED = ("satisfaction", "charge")
+
+PATIENT_STATES = ("Abandon", "En waiting", "Pris en charge", "Traité")
+STAFF_STATES = ("Actif", "Occupé")
+
+
+class RunningStats:
+    """Running sum/count/min/max of one float field per agent-type code.
+
+    Updated on every write, so current means cost O(number of types).
+    Sums are kept by deltas; `AgentState.rebuild_stats` recomputes them exactly.
+    Min/max are those of the current values: when a write moves or removes
+    a type's extreme, the type is flagged `stale` and `AgentState.running`
+    recomputes its min/max from the arrays before reporting them.
+    """
+    def __init__(self, capacity: int = 16):
+        self.sum = np.zeros(capacity)
+        self.count = np.zeros(capacity, dtype=np.int64)
+        self.min = np.full(capacity, np.inf)
+        self.max = np.full(capacity, -np.inf)
+        self.stale = np.zeros(capacity, dtype=bool)
+
+    def _fit(self, size: int):
+        n = len(self.sum)
+        if size <= n:
+            return
+        while n < size:
+            n *= 2
+        extra = n - len(self.sum)
+        self.sum = np.concatenate([self.sum, np.zeros(extra)])
+        self.count = np.concatenate([self.count, np.zeros(extra, dtype=np.int64)])
+        self.min = np.concatenate([self.min, np.full(extra, np.inf)])
+        self.max = np.concatenate([self.max, np.full(extra, -np.inf)])
+        self.stale = np.concatenate([self.stale, np.zeros(extra, dtype=bool)])
+
+    def update(self, key: int, old: float, new: float):
+        self._fit(key + 1)
+        if old == old:
+            self.sum[key] -= old
+            self.count[key] -= 1
+            if new != old and (old <= self.min[key] or old >= self.max[key]):
+                self.stale[key] = True
+        if new == new:
+            self.sum[key] += new
+            self.count[key] += 1
+            if new < self.min[key]:
+                self.min[key] = new
+            if new > self.max[key]:
+                self.max[key] = new
+
+    def update_many(self, keys: np.ndarray, old: np.ndarray, new: np.ndarray):
+        if len(keys):
+            self._fit(int(keys.max()) + 1)
+        was, now = ~np.isnan(old), ~np.isnan(new)
+        moved = was & (new != old) & ((old <= self.min[keys]) | (old >= self.max[keys]))
+        self.stale[keys[moved]] = True
+        np.add.at(self.sum, keys[was], -old[was])
+        np.add.at(self.count, keys[was], -1)
+        np.add.at(self.sum, keys[now], new[now])
+        np.add.at(self.count, keys[now], 1)
+        np.minimum.at(self.min, keys[now], new[now])
+        np.maximum.at(self.max, keys[now], new[now])
+
+    def summary(self, keys) -> Dict[str, float]:
+        """Mean, count, min and max over the given type codes together."""
+        keys = [k for k in keys if k < len(self.sum)]
+        count = int(self.count[keys].sum()) if keys else 0
+        return {
+            "mean": float(self.sum[keys].sum() / count) if count else float("nan"),
+            "count": count,
+            "min": float(self.min[keys].min()) if count else float("nan"),
+            "max": float(self.max[keys].max()) if count else float("nan"),
+        }
+
+
+class AgentState:
+    """Struct-of-arrays store: one slot per registered agent.
+
+    Scalar fields of `FIELDS` are typed arrays (`arrays[name]`); categorical
+    fields hold integer codes into `categories[name]`. Agents read and write their slot through
+    the `StateField` descriptors of `StatefulAgent`, and aggregates such as
+    `mean('satisfaction')` are single array reductions. `stats` keeps
+    running aggregates of the `TRACKED` fields per agent type.
+    """
+    def __init__(self, capacity: int = 256):
+        self.size = 0
+        self.kinds = FIELDS
+        self.arrays: Dict[str, np.ndarray] = {
+            name: np.full(capacity, _FILL[kind], dtype=_DTYPE[kind])
+            for name, kind in FIELDS.items()
+        }
+        self.unique_id = np.zeros(capacity, dtype=np.int64)
+        self.class_code = np.full(capacity, -1, dtype=np.int32)  # agent_type fallback: class name
+        self.type_key = np.full(capacity, -1, dtype=np.int32)    # agent_type, else class name
+        self.is_patient = np.zeros(capacity, dtype=bool)
+        self.active = np.zeros(capacity, dtype=bool)
+        self.agents: List[Optional[Agent]] = [None] * capacity
+        self.categories: Dict[str, List[str]] = {name: [] for name, kind in FIELDS.items() if kind == "code"}
+        self._codes: Dict[str, Dict[str, int]] = {name: {} for name in self.categories}
+        self._free: List[int] = []
+        self.stats: Dict[str, RunningStats] = {name: RunningStats() for name in TRACKED}
+        for name in STAFF_STATES + PATIENT_STATES:
+            self.code("etat", name)
+
+    @property
+    def etat(self) -> np.ndarray:
+        return self.arrays["etat"]
+
+    @property
+    def has_event(self) -> np.ndarray:
+        return self.arrays["has_event_this_step"]
+
+    def code(self, field: str, value: Any) -> int:
+        codes = self._codes[field]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(codes)
+            self.categories[field].append(value)
+        return code
+
+    def codes(self, field: str, values) -> np.ndarray:
+        return np.array([self.code(field, v) for v in values], dtype=np.int32)
+
+    def _grow(self):
+        self._extend(len(self.active))
+
+    def _extend(self, n: int):
+        for name, arr in self.arrays.items():
+            self.arrays[name] = np.concatenate([arr, np.full(n, _FILL[FIELDS[name]], dtype=arr.dtype)])
+        self.unique_id = np.concatenate([self.unique_id, np.zeros(n, dtype=np.int64)])
+        self.class_code = np.concatenate([self.class_code, np.full(n, -1, dtype=np.int32)])
+        self.type_key = np.concatenate([self.type_key, np.full(n, -1, dtype=np.int32)])
+        self.is_patient = np.concatenate([self.is_patient, np.zeros(n, dtype=bool)])
+        self.active = np.concatenate([self.active, np.zeros(n, dtype=bool)])
+        self.agents.extend([None] * n)
+
+    def __getstate__(self):
+        # Only the used slots are pickled (checkpoints); capacity is restored on load
+        state = self.__dict__.copy()
+        n = self.size
+        for name in ("unique_id", "class_code", "type_key", "is_patient", "active"):
+            state[name] = state[name][:n].copy()
+        state["arrays"] = {name: arr[:n].copy() for name, arr in self.arrays.items()}
+        state["agents"] = self.agents[:n]
+        state["capacity"] = len(self.active)
+        return state
+
+    def __setstate__(self, state):
+        capacity = state.pop("capacity")
+        self.__dict__.update(state)
+        self._extend(capacity - self.size)
+
+    def read(self, name: str, slot: int, default: Any = None) -> Any:
+        """Python value of field `name` at `slot`, or `default` when unset."""
+        kind = FIELDS[name]
+        value = self.arrays[name][slot]
+        if kind == "float":
+            return default if value != value else float(value)
+        if kind == "int":
+            return default if value == UNSET_INT else int(value)
+        if kind == "code":
+            return default if value < 0 else self.categories[name][value]
+        if kind == "pos":
+            return default if value < 0 else (int(value >> POS_SHIFT), int(value & POS_MASK))
+        return bool(value)
+
+    def write(self, name: str, slot: int, value: Any):
+        kind = FIELDS[name]
+        if kind == "code":
+            code = self.arrays[name][slot] = self.code(name, value)
+            if name == "agent_type":
+                self._retype(slot, code)
+        elif kind == "pos":
+            self.arrays[name][slot] = pack_pos(value)
+        elif name in self.stats:
+            arr = self.arrays[name]
+            old = arr[slot]
+            arr[slot] = value
+            self.stats[name].update(self.type_key[slot], old, arr[slot])
+        else:
+            self.arrays[name][slot] = value
+
+    def clear(self, name: str, slot: int):
+        if name in self.stats:
+            self.stats[name].update(self.type_key[slot], self.arrays[name][slot], np.nan)
+        self.arrays[name][slot] = _FILL[FIELDS[name]]
+        if name == "agent_type":
+            self._retype(slot, self.class_code[slot])
+
+    def _retype(self, slot: int, key: int):
+        # Move the slot's tracked values to the aggregates of its new type
+        old_key = self.type_key[slot]
+        if old_key == key:
+            return
+        for name, stats in self.stats.items():
+            value = self.arrays[name][slot]
+            stats.update(old_key, value, np.nan)
+            stats.update(key, np.nan, value)
+        self.type_key[slot] = key
+
+    def add(self, agent: "StatefulAgent", is_patient: bool = False) -> int:
+        """Give `agent` a slot and move the values it already set into the arrays."""
+        if self._free:
+            slot = self._free.pop()
+        else:
+            if self.size == len(self.active):
+                self._grow()
+            slot = self.size
+            self.size += 1
+        # Fresh and freed slots hold the unset values; only pending ones are written
+        self.class_code[slot] = self.type_key[slot] = self.code("agent_type", type(agent).__name__)
+        for name, value in (agent._state_pending or {}).items():
+            self.write(name, slot, value)
+        self.unique_id[slot] = agent.unique_id
+        self.is_patient[slot] = is_patient
+        self.active[slot] = True
+        self.agents[slot] = agent
+        agent._state_pending = None
+        agent._state_slot = slot
+        agent._state = self
+        return slot
+
+    def remove(self, agent: "StatefulAgent", keep: bool = True):
+        """Free the slot of `agent`; its values go back to the agent object (dropped if not `keep`)."""
+        slot = agent._state_slot
+        if slot is None:
+            return
+        pending = {} if keep else None
+        for name in FIELDS:
+            if keep:
+                value = self.read(name, slot, _MISSING)
+                if value is not _MISSING:
+                    pending[name] = value
+            self.clear(name, slot)
+        self.type_key[slot] = -1
+        agent._state = None
+        agent._state_slot = None
+        agent._state_pending = pending
+        self.active[slot] = False
+        self.agents[slot] = None
+        self._free.append(slot)
+
+    def _select(self, patients: Optional[bool]) -> np.ndarray:
+        mask = self.active[:self.size].copy()
+        if patients is not None:
+            mask &= self.is_patient[:self.size] == patients
+        return mask
+
+    def mean(self, name: str, patients: Optional[bool] = None) -> float:
+        """Mean of a float field over active agents that have it (NaN if none).
+
+        `patients=True`/`False` restricts to patients/staff.
+        """
+        values = self.arrays[name][:self.size][self._select(patients)]
+        values = values[~np.isnan(values)]
+        return float(values.mean()) if len(values) else float("nan")
+
+    def mean_by_type(self, name: str) -> Dict[str, float]:
+        """Mean of a float field per agent type, over active agents that have it."""
+        n = self.size
+        values = self.arrays[name][:n]
+        types = self.agent_types()
+        keep = self.active[:n] & ~np.isnan(values)
+        sums = np.bincount(types[keep], weights=values[keep], minlength=len(self.categories["agent_type"]))
+        counts = np.bincount(types[keep], minlength=len(self.categories["agent_type"]))
+        return {t: float(s / c) for t, s, c in zip(self.categories["agent_type"], sums, counts) if c}
+
+    def counts(self, name: str, patients: Optional[bool] = None) -> Dict[str, int]:
+        """Active agents per value of a categorical field."""
+        codes = self.arrays[name][:self.size][self._select(patients)]
+        counts = np.bincount(codes[codes >= 0], minlength=len(self.categories[name]))
+        return {v: int(c) for v, c in zip(self.categories[name], counts) if c}
+
+    def agent_types(self) -> np.ndarray:
+        """`agent_type` codes per slot, falling back to the class name when unset."""
+        return self.type_key[:self.size]
+
+    def running(self, name: str, *agent_types: str) -> Dict[str, float]:
+        """Running mean/count and current min/max of a tracked field, over all types or the given ones."""
+        codes = self._codes["agent_type"]
+        keys = [codes[t] for t in agent_types if t in codes] if agent_types else list(codes.values())
+        self._refresh_extremes(name)
+        return self.stats[name].summary(keys)
+
+    def _refresh_extremes(self, name: str):
+        # One pass over the active slots, only after a write moved some type's min or max
+        stats = self.stats[name]
+        if not stats.stale.any():
+            return
+        n = self.size
+        keys = self.type_key[:n]
+        if n:
+            stats._fit(int(keys.max()) + 1)
+        values = self.arrays[name][:n]
+        keep = self.active[:n] & ~np.isnan(values) & stats.stale[keys]
+        stats.min[stats.stale] = np.inf
+        stats.max[stats.stale] = -np.inf
+        np.minimum.at(stats.min, keys[keep], values[keep])
+        np.maximum.at(stats.max, keys[keep], values[keep])
+        stats.stale[:] = False
+
+    def running_by_type(self, name: str) -> Dict[str, float]:
+        """Running mean of a tracked field per agent type (types without values omitted)."""
+        stats = self.stats[name]
+        return {t: float(stats.sum[k] / stats.count[k]) for t, k in self._codes["agent_type"].items()
+                if k < len(stats.count) and stats.count[k]}
+
+    def rebuild_stats(self):
+        """Recompute the running sums, counts and extremes exactly from the arrays."""
+        n = self.size
+        keys = self.type_key[:n]
+        keep_active = self.active[:n]
+        for name in self.stats:
+            stats = self.stats[name] = RunningStats()
+            values = self.arrays[name][:n]
+            keep = keep_active & ~np.isnan(values)
+            stats.update_many(keys[keep], np.full(int(keep.sum()), np.nan), values[keep])
+
+
+class StateField:
+    """Descriptor mapping an agent attribute onto its slot in the model's `AgentState`.
+
+    Before registration (and after removal) the value is kept on the agent.
+    """
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        state = obj._state
+        if state is None:
+            pending = obj._state_pending
+            if pending is None or self.name not in pending:
+                raise AttributeError(self.name)
+            return pending[self.name]
+        return self.read(state, obj._state_slot)
+
+    def read(self, state: AgentState, slot: int):
+        value = state.read(self.name, slot, _MISSING)
+        if value is _MISSING:
+            raise AttributeError(self.name)
+        return value
+
+    def __set__(self, obj, value):
+        state = obj._state
+        if state is None:
+            if obj._state_pending is None:
+                obj._state_pending = {}
+            obj._state_pending[self.name] = value
+        else:
+            state.write(self.name, obj._state_slot, value)
+
+    def __delete__(self, obj):
+        if obj._state is None:
+            if obj._state_pending:
+                obj._state_pending.pop(self.name, None)
+        else:
+            obj._state.clear(self.name, obj._state_slot)
+
+
+class FloatField(StateField):
+    def read(self, state, slot):
+        value = state.arrays[self.name][slot]
+        if value != value:
+            raise AttributeError(self.name)
+        return float(value)
+
+
+class IntField(StateField):
+    def read(self, state, slot):
+        value = state.arrays[self.name][slot]
+        if value == UNSET_INT:
+            raise AttributeError(self.name)
+        return int(value)
+
+
+class CodeField(StateField):
+    def read(self, state, slot):
+        code = state.arrays[self.name][slot]
+        if code < 0:
+            raise AttributeError(self.name)
+        return state.categories[self.name][code]
+
+
+class FlagField(StateField):
+    def read(self, state, slot):
+        return bool(state.arrays[self.name][slot])
+
+
+class PosField(StateField):
+    """Grid cell of the agent as an (x, y) tuple; None when it is not placed."""
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        state = obj._state
+        if state is None:
+            pending = obj._state_pending
+            return None if pending is None else pending.get(self.name)
+        value = state.arrays[self.name][obj._state_slot]
+        return None if value < 0 else (int(value >> POS_SHIFT), int(value & POS_MASK))
+
+    def __set__(self, obj, value):
+        state = obj._state
+        if state is None:
+            super().__set__(obj, value)
+        else:
+            state.arrays[self.name][obj._state_slot] = pack_pos(value)
+
+
+class EtatField(CodeField):
+    """`etat` also keeps the model's patients-by-state index in sync."""
+    def __set__(self, obj, value):
+        old = getattr(obj, "etat", None)
+        super().__set__(obj, value)
+        index = getattr(obj.model, "agent_index", None)
+        if index is not None and old != value:
+            index.move(obj, old, value)
+
+
+class StatefulAgent(Agent):
+    """Agent whose scalar state lives in `model.state` once registered.
+
+    mesa's Agent has no `__slots__`, so instances keep a `__dict__` for
+    `unique_id` and `model`; everything in `FIELDS`, including the grid
+    position `pos`, is stored in the model arrays instead. This makes
+    aggregates array reductions but does not make agents smaller: a
+    registered patient still costs about 800 B (tracemalloc, 20k patients),
+    mostly mesa's per-agent registry entries and the instance `__dict__`.
+    """
+    __slots__ = ("_state", "_state_slot", "_state_pending", "_random")
+
+    temps_attente = FloatField()
+    satisfaction = FloatField()
+    charge = FloatField()
+    patient_id = IntField()
+    agent_id = IntField()
+    etat = EtatField()
+    agent_type = CodeField()
+    categorie_patient = CodeField()
+    service_attribue = CodeField()
+    has_event_this_step = FlagField()
+    pos = PosField()
+    admitted_step = IntField()
+
+    # Holders of a recycled unique_id before this agent (see agents/lifecycle.py)
+    generation = 0
+
+    # Wake-up conditions used by the event-driven scheduler (agents/scheduling.py)
+    wake_on = ()
+    wake_every = None
+
+    def __init__(self, unique_id, model):
+        self._state = None
+        self._state_slot = None
+        self._state_pending = None
+        self._random = None
+        super().__init__(unique_id, model)
+
+    @property
+    def random(self):
+        """This agent's own random stream, derived from the model seed, unique_id and generation."""
+        rand = self._random
+        if rand is None:
+            streams = getattr(self.model, "streams", None)
+            if streams is None:
+                return self.model.random
+            rand = self._random = streams.for_agent(self.unique_id, self.generation)
+        return rand
+
+
+def simulate_events(state: AgentState, rng: np.random.Generator, event_prob: float,
+                    state_change_prob: float, index: Any = None):
+    """Vectorized random events for every active slot, with one batch of draws.
+
+    Same update rules as the per-agent loop: event flag, clamped deltas of
+    `temps_attente` (all agents), `satisfaction` (patients) and `charge`
+    (staff), then an `etat` change with probability `state_change_prob`.
+    Unset (NaN) values stay unset.
+    """
+    slots = np.flatnonzero(state.active[:state.size])
+    draws = rng.random((6, len(slots)))
+    hit = draws[0] < event_prob
+    ev = slots[hit]
+    if not len(ev):
+        return ev
+    draws = draws[1:, hit]
+    patient = state.is_patient[ev]
+    state.has_event[ev] = True
+
+    wait = state.arrays["temps_attente"]
+    wait[ev] = np.maximum(0, wait[ev] + (draws[0] * 1.5 - 0.5))
+    sat, load = state.arrays["satisfaction"], state.arrays["charge"]
+    pe, se = ev[patient], ev[~patient]
+    old_sat, old_load = sat[pe], load[se]
+    sat[pe] = np.clip(old_sat + (draws[1][patient] * 0.2 - 0.1), 0, 1)
+    load[se] = np.clip(old_load + (draws[2][~patient] * 0.4 - 0.2), 0, 1)
+    state.stats["satisfaction"].update_many(state.type_key[pe], old_sat, sat[pe])
+    state.stats["charge"].update_many(state.type_key[se], old_load, load[se])
+
+    change = draws[3] < state_change_prob
+    pc = ev[change & patient]
+    sc = ev[change & ~patient]
+    etat = state.etat
+    old = etat[pc].copy()
+    patient_codes = state.codes("etat", PATIENT_STATES)
+    picks = np.minimum((draws[4][change & patient] * len(PATIENT_STATES)).astype(np.intp),
+                       len(PATIENT_STATES) - 1)
+    etat[pc] = patient_codes[picks]
+    actif, occupe = state.codes("etat", STAFF_STATES)
+    etat[sc] = np.where(etat[sc] == actif, occupe, actif)
+
+    if index is not None:
+        cats = state.categories["etat"]
+        for slot, before, after in zip(pc.tolist(), old.tolist(), etat[pc].tolist()):
+            if before != after:
+                index.move(state.agents[slot], cats[before] if before >= 0 else None, cats[after])
+    return ev
@@ -0,0 +1,83 @@
+""" Seeded random streams: one per model component and one per agent, all derived from the model seed. """
+
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+from typing import Any, Optional, Sequence
+import numpy as np
+
+# spawn_key roots of the independent streams derived from the model seed
+STREAM_EVENTS = 0
+STREAM_SCHEDULE = 1
+STREAM_AGENTS = 2
+
+_MASK = (1 << 64) - 1
+
+
+class AgentRandom:
+    """Small per-agent generator (SplitMix64) with the `random.Random` methods agents use.
+
+    One 64-bit integer of state, so 100k patients can each own a stream;
+    `random.Random` keeps ~2.5 KB of Mersenne Twister state per instance.
+    """
+    __slots__ = ("_state",)
+
+    def __init__(self, seed: int):
+        self._state = seed & _MASK
+
+    def _next(self) -> int:
+        s = self._state = (self._state + 0x9E3779B97F4A7C15) & _MASK
+        z = ((s ^ (s >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+        z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK
+        return z ^ (z >> 31)
+
+    def random(self) -> float:
+        return (self._next() >> 11) * (1.0 / (1 << 53))
+
+    def uniform(self, a: float, b: float) -> float:
+        return a + (b - a) * self.random()
+
+    def randrange(self, n: int) -> int:
+        return (self._next() * n) >> 64
+
+    def randint(self, a: int, b: int) -> int:
+        return a + self.randrange(b - a + 1)
+
+    def choice(self, seq: Sequence[Any]) -> Any:
+        if not seq:
+            raise IndexError("Cannot choose from an empty sequence")
+        return seq[self.randrange(len(seq))]
+
+    def getstate(self) -> int:
+        return self._state
+
+    def setstate(self, state: int):
+        self._state = state
+
+
+class ModelStreams:
+    """Independent streams derived from one seed with `numpy.random.SeedSequence`.
+
+    `events` (NumPy Generator) drives the vectorized random events,
+    `schedule_seed` seeds mesa's `model.random` (activation order, grid
+    placement) and `for_agent(uid)` gives agent `uid` its own stream. Agent
+    streams are keyed by unique_id rather than creation order, so an agent
+    draws the same numbers whatever else changes in a scenario (common
+    random numbers). With seed=None, fresh entropy is drawn and kept in
+    `entropy` so the run can be repeated.
+    """
+    def __init__(self, seed: Optional[int] = None):
+        self.root = np.random.SeedSequence(seed)
+        self.entropy = self.root.entropy
+        events, schedule = (np.random.SeedSequence(self.entropy, spawn_key=(k,))
+                            for k in (STREAM_EVENTS, STREAM_SCHEDULE))
+        self.events = np.random.default_rng(events)
+        self.schedule_seed = int(schedule.generate_state(1, np.uint64)[0])
+
+    def agent_seed(self, unique_id: int, generation: int = 0) -> int:
+        key = (STREAM_AGENTS, int(unique_id)) + ((int(generation),) if generation else ())
+        ss = np.random.SeedSequence(self.entropy, spawn_key=key)
+        return int(ss.generate_state(1, np.uint64)[0])
+
+    def for_agent(self, unique_id: int, generation: int = 0) -> AgentRandom:
+        """Stream of agent `unique_id`; `generation` > 0 for later holders of a recycled id."""
+        return AgentRandom(self.agent_seed(unique_id, generation))
@@ -0,0 +1,46 @@
+import json
+from types import SimpleNamespace
+from agents.event_log import EventLog
+from agents.safe_ops import SafeOps
+
+def _agent(log, uid=7):
+    return SimpleNamespace(unique_id=uid, model=SimpleNamespace(event_log=log))
+
+def test_off_mode_is_silent(capsys):
+    log = EventLog("off")
+    SafeOps.emit(_agent(log), "patient_state", "patient {uid} is {etat}", uid=7, etat="Actif")
+    assert capsys.readouterr().out == "" and log.seen == 0
+
+def test_sampled_mode_prints_every_nth(capsys):
+    log = EventLog("sampled", sample_every=3)
+    for i in range(7):
+        SafeOps.emit(_agent(log), "tick", "tick {i}", i=i)
+    assert capsys.readouterr().out.split("\n")[:-1] == ["tick 2", "tick 5"]
+
+def test_structured_mode_writes_jsonl(tmp_path, capsys):
+    path = tmp_path / "events.jsonl"
+    log = EventLog("structured", path=str(path), buffer_size=2, clock=lambda: 4)
+    SafeOps.emit(_agent(log), "patient_state", "patient {uid} is {etat}", uid=7, etat="Actif")
+    SafeOps.log(_agent(log, uid=8), "Dispensed {qty}x {drug}", qty=2, drug="x")
+    SafeOps.emit(_agent(log), "patient_state", "patient {uid} is {etat}", uid=7, etat="Sorti")
+    assert log.written == 2 and len(log.buffer) == 1
+    log.close()
+    rows = [json.loads(line) for line in path.read_text().splitlines()]
+    assert rows[0] == {"step": 4, "agent_id": 7, "agent_class": "SimpleNamespace",
+                       "event": "patient_state", "uid": 7, "etat": "Actif"}
+    assert rows[1]["event"] == "log" and rows[1]["qty"] == 2
+    assert capsys.readouterr().out == ""
+
+def test_agents_without_policy_keep_printing(capsys):
+    SafeOps.emit(SimpleNamespace(unique_id=1, model=SimpleNamespace()), "e", "hello {who}", who="x")
+    assert capsys.readouterr().out == "hello x\n"
+
+def test_print_mode_skips_plain_logs_and_survives_bad_templates(capsys):
+    log = EventLog("print")
+    SafeOps.log(_agent(log), "Consulting patient")
+    SafeOps.emit(_agent(log), "e", "hello {missing}")
+    assert capsys.readouterr().out == "hello {missing}\n"
+    memory = EventLog("structured", buffer_size=3)
+    for i in range(5):
+        SafeOps.emit(_agent(memory), "tick", "tick {i}", i=i)
+    assert [r["i"] for r in memory.buffer] == [2, 3, 4]
@@ -0,0 +1,36 @@
+import numpy as np
+from agents.inventory import MedicationInventory
+from agents.safe_ops import SafeOps
+from model import CliniqueModel
+from agents import MedicationProductManagementAgent
+
+def test_dispense_is_first_come_first_served_per_drug():
+    inv = MedicationInventory({"A": 5, "B": 1})
+    a, b, c = inv.code("A"), inv.code("B"), inv.code("C")
+    served = inv.dispense([a, b, a, a, b, c, a], [2, 1, 2, 2, 1, 1, 1])
+    # A: 2+2 fit in 5, the third (2) does not, nor the smaller one after it
+    assert served.tolist() == [True, True, True, False, False, False, False]
+    assert inv.to_dict() == {"A": 1, "B": 0, "C": 0}
+    assert inv.dispensed[:3].tolist() == [4, 1, 0] and inv.shortages[:3].tolist() == [2, 1, 1]
+
+def test_dict_interface_and_restocks():
+    model = type("M", (), {})()
+    model.med_inventory = {"RX-A": 3}
+    inv = SafeOps.inventory(model)
+    assert model.med_inventory is inv and inv["RX-A"] == 3 and inv.get("RX-Z", 0) == 0
+    inv.schedule_restock("RX-A", 10, at=4, every=5)
+    inv.schedule_restock("RX-Z", 2, at=6)
+    assert inv.restock(3) == 0 and inv.restock(9) == 3
+    assert inv.to_dict() == {"RX-A": 23, "RX-Z": 2}
+
+def test_agent_reports_shortages_in_one_event():
+    model = CliniqueModel(num_agents=13, seed=0, log_mode='off')
+    model.med_inventory = {"RX-A": 2}
+    model.events = []
+    model.pending_prescriptions = [{"drug": "RX-A", "qty": 1}] * 3 + [{"drug": "RX-B", "qty": 2}]
+    agent = model.agent_index.of_type(MedicationProductManagementAgent.__name__)[0]
+    agent.step()
+    assert model.pending_prescriptions == [] and model.med_inventory["RX-A"] == 0
+    (event,) = model.events
+    assert event["drug"].tolist() == ["RX-A", "RX-B"]
+    assert np.array_equal(event["need"], [1, 2]) and np.array_equal(event["have"], [0, 0])
@@ -0,0 +1,47 @@
+import numpy as np
+from agents import PatientSatisfactionEvaluationAgent
+from agents.queues import FifoQueue
+from model import CliniqueModel
+
+PAYLOADS = [
+    {"patient_id": 1, "ci": 0.9, "ra": 0.8, "sc": 7, "ei": 6, "po": 8, "cb": 9, "pi": 7, "rr": 8},
+    {"patient_id": 2, "ci": 2, "ra": 3, "sc": 1, "ei": 2, "po": 3, "cb": 2, "pi": 1, "rr": 2},
+    {"patient_id": 3, "ci": 8, "ra": 2},  # partial: the rest sits at mid-scale
+    {"patient_id": 4, "sc": 9},
+    {"patient_id": 5, "ci": 5, "ra": 5, "sc": 5, "ei": 5, "po": 5, "cb": 5, "pi": 5, "rr": 5},
+]
+
+def _agent(**config):
+    model = CliniqueModel(num_agents=13, seed=0, log_mode='off')
+    agent = model.agent_index.of_type(PatientSatisfactionEvaluationAgent.__name__)[0]
+    agent.config.update(config)
+    model.psea_inputs = FifoQueue([dict(p) for p in PAYLOADS])
+    model.psea_outputs = []
+    return model, agent
+
+def test_batch_sizes_drain_the_queue():
+    model, agent = _agent(batch_size=2)
+    agent.step()
+    assert len(model.psea_inputs) == 3 and [o["patient_id"] for o in model.psea_outputs] == [1, 2]
+    for batch_size in (0, None):
+        model, agent = _agent(batch_size=batch_size)
+        agent.step()
+        assert not model.psea_inputs and [o["patient_id"] for o in model.psea_outputs] == [1, 2, 3, 4, 5]
+
+def test_batched_and_single_scores_agree_in_any_order():
+    model, agent = _agent(batch_size=0)
+    agent.step()
+    batched = {o["patient_id"]: o["score"] for o in model.psea_outputs}
+    model, agent = _agent()
+    model.psea_inputs = FifoQueue([dict(p) for p in reversed(PAYLOADS)])
+    for _ in PAYLOADS:
+        agent.step()
+    single = {o["patient_id"]: o["score"] for o in model.psea_outputs}
+    assert np.allclose([single[k] for k in batched], list(batched.values()), atol=1e-9)
+
+def test_unit_output_scale():
+    tens, unit = _agent(batch_size=0), _agent(batch_size=0, output_scale=1)
+    for model, agent in (tens, unit):
+        agent.step()
+    assert all(o["scale"] == 1 and 0 <= o["score"] <= 1 for o in unit[0].psea_outputs)
+    assert np.allclose([o["score"] * 10 for o in unit[0].psea_outputs], [o["score"] for o in tens[0].psea_outputs])
@@ -0,0 +1,42 @@
+from types import SimpleNamespace
+from agents import ServiceCoordinationAgent
+from agents.queues import FifoQueue, PriorityQueue, queue_stats
+from agents.safe_ops import SafeOps
+from model import CliniqueModel
+
+def test_fifo_order_and_wait_accounting():
+    clock = SimpleNamespace(t=0)
+    q = FifoQueue(name="q", clock=lambda: clock.t)
+    for item in "abc":
+        q.append(item)
+    clock.t = 3
+    assert [q.popleft() for _ in range(3)] == ["a", "b", "c"]
+    stats = q.stats()
+    assert stats["pushed"] == stats["popped"] == 3
+    assert stats["mean_wait"] == stats["max_wait"] == 3
+    assert not q
+
+def test_priority_by_acuity_is_stable():
+    p = [SimpleNamespace(acuity=a, n=i) for i, a in enumerate(["consultation", "emergency", "consultation", "emergency"])]
+    q = PriorityQueue(p)
+    assert [q.popleft().n for _ in range(4)] == [1, 3, 0, 2]
+
+def test_safeops_upgrades_list_queues_in_place():
+    model = SimpleNamespace(schedule=SimpleNamespace(time=5), triage_queue=[1, 2])
+    q = SafeOps.queue(model, "triage_queue")
+    assert isinstance(model.triage_queue, FifoQueue) and q is model.triage_queue
+    assert SafeOps.pop_queue(q) == 1
+    assert SafeOps.queue(model, "missing") is None
+    assert queue_stats(model)["triage_queue"]["popped"] == 1
+
+def test_triage_serves_higher_acuity_first():
+    model = CliniqueModel(num_agents=13, seed=0, log_mode='off')
+    model.beds_available = 5
+    model.inpatient_queue, model.consultation_queue = [], []
+    arrivals = ["consultation", "urgent", "emergency", "consultation", "emergency"]
+    model.triage_queue = [SimpleNamespace(acuity=a, n=i) for i, a in enumerate(arrivals)]
+    agent = model.agent_index.of_type(ServiceCoordinationAgent.__name__)[0]
+    for _ in range(3):
+        agent.step()
+    assert [p.n for p in model.inpatient_queue] == [2, 4]
+    assert [p.n for p in model.consultation_queue] == [1] and len(model.triage_queue) == 2
@@ -0,0 +1,51 @@
+from types import SimpleNamespace
+from agents import PrescriptionConsultationAgent
+from agents.queues import FifoQueue
+from agents.resources import ResourcePool, resource_stats
+from agents.safe_ops import SafeOps
+from model import CliniqueModel
+
+def test_pool_busy_until_and_utilization():
+    clock = SimpleNamespace(t=0)
+    pool = ResourcePool(2, name="beds", clock=lambda: clock.t)
+    assert pool.acquire(4, holder="a") and pool.acquire(2, holder="b")
+    assert not pool.acquire(1) and pool.blocked == 1
+    clock.t = 2
+    assert pool.available == 1 and pool.finished() == ["b"]
+    clock.t = 8
+    assert pool.finished() == ["a"] and pool.busy == 0
+    # 4 + 2 busy server-ticks over 2 servers x 8 ticks
+    assert pool.utilization() == 6 / 16 and pool.stats()["mean_service"] == 3
+
+def test_held_servers_and_int_upgrade():
+    model = SimpleNamespace(schedule=SimpleNamespace(time=0), rooms_available=1)
+    assert SafeOps.dec_slot(model, "rooms_available")  # plain int still works
+    model.rooms_available = 2
+    pool = SafeOps.pool(model, "rooms_available")
+    assert model.rooms_available is pool and pool.capacity == 2
+    assert SafeOps.dec_slot(model, "rooms_available", 2) and not SafeOps.dec_slot(model, "rooms_available")
+    SafeOps.inc_slot(model, "rooms_available")
+    assert pool.available == 1 and resource_stats(model)["rooms_available"]["peak_busy"] == 2
+
+def test_consultations_keep_doctors_busy():
+    model = CliniqueModel(num_agents=13, seed=0, log_mode='off')
+    model.doctors_available = 1
+    model.consultation_queue = FifoQueue(["p1", "p2"])
+    model.post_consultation_queue = FifoQueue()
+    agent = model.agent_index.of_type(PrescriptionConsultationAgent.__name__)[0]
+    agent.step()
+    doctors = model.doctors_available
+    assert doctors.busy == 1 and len(model.consultation_queue) == 1
+    agent.step()  # doctor still busy: p2 waits
+    assert len(model.consultation_queue) == 1 and doctors.blocked == 2  # p2 found no doctor in both ticks
+    model.schedule.time = doctors.next_free()
+    agent.step()
+    assert list(model.post_consultation_queue) == ["p1"] and not model.consultation_queue
+
+def test_free_doctors_all_start_consultations_in_one_tick():
+    model = CliniqueModel(num_agents=13, seed=0, log_mode='off')
+    model.doctors_available = 3
+    model.consultation_queue = FifoQueue(["p1", "p2", "p3", "p4", "p5"])
+    agent = model.agent_index.of_type(PrescriptionConsultationAgent.__name__)[0]
+    agent.step()
+    assert model.doctors_available.busy == 3 and list(model.consultation_queue) == ["p4", "p5"]
@@ -0,0 +1,128 @@
+# batch_run.py
+"""Headless parameter sweeps of CliniqueModel across a process pool.
+
+Example:
+    python batch_run.py --num-agents 12 120 --steps 100 --replications 5 \\
+        --event-prob 0.3 0.5 --processes 4 --output outputs/data/batch.csv
+"""
+
+import argparse
+import contextlib
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from model import CliniqueModel
+
+SWEEP_PARAMS = ("num_agents", "width", "height", "steps", "event_prob", "state_change_prob")
+
+
+def parameter_grid(grid, replications=1, base_seed=0, seeds=None):
+    """Expand {param: [values]} into one run spec per combination and replication.
+
+    Replication r gets seed `seeds[r]` if given, else `base_seed + r`, so each
+    parameter point sees the same seeds (common random numbers).
+    """
+    names = [name for name in SWEEP_PARAMS if name in grid]
+    seeds = list(seeds) if seeds else [base_seed + r for r in range(replications)]
+    runs = []
+    for values in itertools.product(*(grid[name] for name in names)):
+        for replication, seed in enumerate(seeds):
+            runs.append(dict(zip(names, values), replication=replication, seed=seed))
+    for run_id, spec in enumerate(runs):
+        spec["run_id"] = run_id
+    return runs
+
+
+def run_one(spec, quiet=True):
+    """Run one model to completion and return its row of the results table."""
+    steps = spec.get("steps", 50)
+    with contextlib.ExitStack() as stack:
+        if quiet:
+            # Agent events are switched off at the source; this only hides the remaining prints
+            stack.enter_context(contextlib.redirect_stdout(stack.enter_context(open(os.devnull, "w"))))
+        built = time.perf_counter()
+        model = CliniqueModel(
+            width=spec.get("width", 10),
+            height=spec.get("height", 10),
+            num_agents=spec.get("num_agents", 12),
+            event_prob=spec.get("event_prob", 0.3),
+            state_change_prob=spec.get("state_change_prob", 0.2),
+            seed=spec["seed"],
+            log_mode=spec.get("log_mode", "off" if quiet else "print"),
+            agent_report_every=spec.get("agent_report_every", 0),  # agent records are not used here
+            scheduler=spec.get("scheduler", "random"),
+            space=spec.get("space", "multigrid"),
+            discharge=spec.get("discharge", False),
+        )
+        # Throughput covers the steps only; building the model is reported apart
+        start = time.perf_counter()
+        build = start - built
+        for _ in range(steps):
+            model.step()
+        wall = time.perf_counter() - start
+    return dict(
+        spec,
+        steps=steps,
+        build_time_s=build,
+        wall_time_s=wall,
+        steps_per_s=steps / wall if wall > 0 else float("inf"),
+        events=model.custom_datacollector.total,
+        agents_final=len(model.schedule.agents),
+        discharged=len(model.discharged),
+        satisfaction_mean=model.state.mean("satisfaction"),
+    )
+
+
+def run_batch(runs, processes=None, quiet=True):
+    """Run every spec, in a process pool unless processes == 1; returns a DataFrame."""
+    if processes == 1:
+        rows = [run_one(spec, quiet) for spec in runs]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            rows = list(pool.map(run_one, runs, itertools.repeat(quiet)))
+    return pd.DataFrame(rows).sort_values("run_id").reset_index(drop=True)
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Headless CliniqueModel parameter sweep")
+    parser.add_argument("--num-agents", type=int, nargs="+", default=[12])
+    parser.add_argument("--width", type=int, nargs="+", default=[10])
+    parser.add_argument("--height", type=int, nargs="+", default=[10])
+    parser.add_argument("--steps", type=int, nargs="+", default=[50])
+    parser.add_argument("--event-prob", type=float, nargs="+", default=[0.3])
+    parser.add_argument("--state-change-prob", type=float, nargs="+", default=[0.2])
+    parser.add_argument("--replications", type=int, default=1)
+    parser.add_argument("--base-seed", type=int, default=0)
+    parser.add_argument("--seeds", type=int, nargs="+", help="explicit seeds, one per replication")
+    parser.add_argument("--processes", type=int, default=None, help="worker processes (1 = in-process)")
+    parser.add_argument("--output", default=os.path.join("outputs", "data", "batch_results.csv"))
+    parser.add_argument("--verbose", action="store_true", help="keep the agents' console output")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = _parse_args(argv)
+    grid = {name: getattr(args, name) for name in SWEEP_PARAMS}
+    runs = parameter_grid(grid, replications=args.replications, base_seed=args.base_seed, seeds=args.seeds)
+    print(f"Running {len(runs)} simulations...")
+    start = time.perf_counter()
+    df = run_batch(runs, processes=args.processes, quiet=not args.verbose)
+    total = time.perf_counter() - start
+
+    parent_dir = os.path.dirname(args.output)
+    if parent_dir:
+        os.makedirs(parent_dir, exist_ok=True)
+    if args.output.endswith(".parquet"):
+        df.to_parquet(args.output, index=False)
+    else:
+        df.to_csv(args.output, index=False, encoding="utf-8")
+    print(f"✓ {len(df)} runs in {total:.1f}s, results saved in {args.output}")
+    return df
+
+
+if __name__ == "__main__":
+    main()
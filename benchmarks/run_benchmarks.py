@@ -0,0 +1,194 @@
+# benchmarks/run_benchmarks.py
+"""Benchmark suite for model step throughput and fuzzy evaluation latency.
+
+    python -m benchmarks.run_benchmarks --output outputs/bench/latest.json
+    python -m benchmarks.run_benchmarks --compare outputs/bench/baseline.json --threshold 0.2
+
+Every benchmark reports `seconds` per unit of work (lower is better). With
+--compare, entries slower than the baseline by more than --threshold
+(fraction) are flagged and the exit status is 1.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+
+MODEL_SIZES = {12: 50, 120: 20, 1200: 5, 12000: 2}   # agents -> timed steps
+QUICK_SIZES = {12: 20, 120: 5}
+
+
+@contextlib.contextmanager
+def _quiet():
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def _timed(fn, repeats):
+    """Best (minimum) wall time of `fn()` over `repeats` calls; least sensitive to noise."""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def bench_model_step(sizes):
+    from model import CliniqueModel
+    out = {}
+    for n, steps in sizes.items():
+        random.seed(0)
+        with _quiet():
+            model = CliniqueModel(num_agents=n, seed=0, log_mode='off')
+            model.step()  # warm-up (builds the shared fuzzy system)
+            seconds = _timed(model.step, steps)
+        out[f"model_step[{n}]"] = {"seconds": seconds, "steps_per_s": 1.0 / seconds, "agents": n}
+    return out
+
+
+def _random_inputs(n):
+    return np.random.default_rng(0).uniform(0, 10, size=(n, 8))
+
+
+def bench_fuzzy(batch_n):
+    from fuzzy_logic.fuzzy_system import INPUT_LABELS, evaluate, evaluate_batch, get_compiled_system
+    X = _random_inputs(batch_n)
+    get_compiled_system()
+    row = dict(zip(INPUT_LABELS, X[0]))
+    single = _timed(lambda: evaluate(row), 20)
+    batch = _timed(lambda: evaluate_batch(X), 10)
+    return {
+        "fuzzy_evaluate_single": {"seconds": single},
+        f"fuzzy_evaluate_batch[{batch_n}]": {"seconds": batch, "rows_per_s": batch_n / batch},
+    }
+
+
+def bench_psea(batch_n):
+    from model import CliniqueModel
+    from agents import PatientSatisfactionEvaluationAgent
+    keys = ['ci', 'ra', 'sc', 'ei', 'po', 'cb', 'pi', 'rr']
+    payloads = [dict(zip(keys, row), patient_id=i) for i, row in enumerate(_random_inputs(batch_n))]
+    with _quiet():
+        model = CliniqueModel(num_agents=1, seed=0, log_mode='off')
+    single = PatientSatisfactionEvaluationAgent(10_001, model)
+    batched = PatientSatisfactionEvaluationAgent(10_002, model, config={'batch_size': 0})
+
+    def run_single():
+        model.psea_inputs = list(payloads[:20])
+        for _ in range(20):
+            single.step()
+
+    def run_batch():
+        model.psea_inputs = list(payloads)
+        batched.step()
+
+    batch = _timed(run_batch, 5)
+    return {
+        "psea_step_single": {"seconds": _timed(run_single, 5) / 20},
+        f"psea_step_batch[{batch_n}]": {"seconds": batch, "rows_per_s": batch_n / batch},
+    }
+
+
+def bench_recorder(n_agents, steps):
+    from model import CliniqueModel, CustomDataCollector
+    with _quiet():
+        model = CliniqueModel(num_agents=n_agents, seed=0, log_mode='off')
+    recorder = CustomDataCollector()
+
+    def collect():
+        for agent in model.schedule.agents:
+            agent.has_event_this_step = True
+        recorder.collect(model)
+
+    collect_s = _timed(collect, steps)
+    with tempfile.TemporaryDirectory() as tmp, _quiet():
+        save_s = _timed(lambda: recorder.save(os.path.join(tmp, "bench.csv")), 3)
+    return {
+        f"recorder_collect[{n_agents}]": {"seconds": collect_s, "rows_per_s": n_agents / collect_s},
+        f"recorder_save[{len(recorder)}]": {"seconds": save_s},
+    }
+
+
+def bench_surface():
+    from fuzzy_logic.fuzzy_system import VAR_LABELS, get_system
+    from fuzzy_logic.utils.visualization import save_surface
+    system, _, _ = get_system()
+    with tempfile.TemporaryDirectory() as tmp:
+        seconds = _timed(lambda: save_surface(system, VAR_LABELS['ci'], VAR_LABELS['sc'], tmp), 3)
+    return {"save_surface": {"seconds": seconds}}
+
+
+def run_all(quick=False):
+    results = {}
+    results.update(bench_model_step(QUICK_SIZES if quick else MODEL_SIZES))
+    results.update(bench_fuzzy(1_000 if quick else 10_000))
+    results.update(bench_psea(1_000 if quick else 10_000))
+    results.update(bench_recorder(120 if quick else 1_200, 10))
+    results.update(bench_surface())
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "quick": quick,
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold=0.2):
+    """Return rows (name, baseline_s, current_s, ratio, regressed) for shared benchmarks."""
+    rows = []
+    for name, entry in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if not base:
+            continue
+        ratio = entry["seconds"] / base["seconds"] if base["seconds"] > 0 else float("inf")
+        rows.append((name, base["seconds"], entry["seconds"], ratio, ratio > 1.0 + threshold))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="CliniqueModel / fuzzy_logic benchmarks")
+    parser.add_argument("--output", default=os.path.join("outputs", "bench", "latest.json"))
+    parser.add_argument("--compare", help="baseline JSON written by a previous run")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown fraction")
+    parser.add_argument("--quick", action="store_true", help="small sizes only")
+    args = parser.parse_args(argv)
+
+    report = run_all(quick=args.quick)
+    parent_dir = os.path.dirname(args.output)
+    if parent_dir:
+        os.makedirs(parent_dir, exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    for name, entry in report["results"].items():
+        print(f"{name:<36} {entry['seconds'] * 1e3:12.3f} ms")
+    print(f"✓ Results saved in {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows = compare(report, baseline, args.threshold)
+        regressions = [r for r in rows if r[4]]
+        print(f"\nComparison with {args.compare} (threshold +{args.threshold:.0%}):")
+        for name, base_s, cur_s, ratio, regressed in rows:
+            flag = "REGRESSION" if regressed else "ok"
+            print(f"{name:<36} {base_s * 1e3:10.3f} -> {cur_s * 1e3:10.3f} ms  x{ratio:5.2f}  {flag}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
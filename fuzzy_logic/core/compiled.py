@@ -0,0 +1,131 @@
+import numpy as np
+from skfuzzy.control.term import Term, TermAggregate
+
+
+class CompiledSystem:
+    """NumPy form of a skfuzzy `ControlSystem` for batch (N-row) inference.
+
+    Membership functions and rules are read once from the skfuzzy objects,
+    then every call to `evaluate` runs fuzzification, rule firing (min/max),
+    accumulation and centroid defuzzification for all rows with array
+    operations. The output is piecewise linear on the universe plus the
+    points where each term crosses its cut level, exactly as skfuzzy
+    upsamples it, so results agree with `ControlSystemSimulation` to
+    floating-point rounding (< 1e-9 on the 0..10 universes used here).
+    """
+
+    def __init__(self, system, U, input_labels, output_label):
+        self.universe = np.asarray(U, dtype=float)
+        self.input_labels = tuple(input_labels)
+        self.output_label = output_label
+
+        antecedents = {a.label: a for a in system.antecedents}
+        consequent = {c.label: c for c in system.consequents}[output_label]
+
+        # One row per antecedent term; term_cols gives the input column it reads
+        self._term_index = {}
+        mfs, cols = [], []
+        for col, label in enumerate(self.input_labels):
+            for name, term in antecedents[label].terms.items():
+                self._term_index[(label, name)] = len(mfs)
+                mfs.append(np.asarray(term.mf, dtype=float))
+                cols.append(col)
+        self.term_mfs = np.vstack(mfs)
+        self.term_cols = np.asarray(cols)
+
+        self.output_terms = list(consequent.terms)
+        self.output_mfs = np.vstack([np.asarray(consequent.terms[t].mf, dtype=float)
+                                     for t in self.output_terms])
+        self._accumulate = consequent.accumulation_method
+
+        out_index = {name: i for i, name in enumerate(self.output_terms)}
+        self.rules = []
+        for rule in system.rules:
+            expr = self._compile_expr(rule.antecedent, rule.and_func, rule.or_func)
+            targets = [(out_index[c.term.label], float(c.weight)) for c in rule.consequent
+                       if c.term.parent.label == output_label]
+            self.rules.append((expr, targets))
+
+    def _compile_expr(self, node, and_func, or_func):
+        if isinstance(node, Term):
+            return ('term', self._term_index[(node.parent.label, node.label)])
+        if isinstance(node, TermAggregate):
+            if node.kind == 'not':
+                return ('not', self._compile_expr(node.term1, and_func, or_func))
+            func = and_func if node.kind == 'and' else or_func
+            return (func,
+                    self._compile_expr(node.term1, and_func, or_func),
+                    self._compile_expr(node.term2, and_func, or_func))
+        raise TypeError(f"Unsupported rule antecedent: {node!r}")
+
+    def _fire(self, expr, memberships):
+        if expr[0] == 'term':
+            return memberships[expr[1]]
+        if expr[0] == 'not':
+            return 1.0 - self._fire(expr[1], memberships)
+        func, left, right = expr
+        return func(self._fire(left, memberships), self._fire(right, memberships))
+
+    def fuzzify(self, X):
+        """Membership degree of every antecedent term, shape (n_terms, N)."""
+        U = self.universe
+        return np.vstack([np.interp(X[:, col], U, mf)
+                          for col, mf in zip(self.term_cols, self.term_mfs)])
+
+    def cuts(self, X):
+        """Accumulated activation of each output term, shape (n_out_terms, N)."""
+        memberships = self.fuzzify(X)
+        cuts = np.zeros((len(self.output_terms), X.shape[0]))
+        for expr, targets in self.rules:
+            firing = self._fire(expr, memberships)
+            for idx, weight in targets:
+                cuts[idx] = self._accumulate(firing * weight, cuts[idx])
+        return cuts
+
+    def defuzzify(self, cuts):
+        """Centroid of the clipped-and-aggregated output set for each row."""
+        U = self.universe
+        mfs = self.output_mfs
+        x0, dx = U[:-1], np.diff(U)
+        m0, dm = mfs[:, :-1], np.diff(mfs, axis=1)
+
+        # Fraction along each universe segment where term t crosses its own cut
+        a = m0[:, None, :] - cuts[:, :, None]
+        b = a + dm[:, None, :]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            frac = np.where(a * b < 0, a / (a - b), 0.0)
+        frac = np.sort(np.concatenate([np.zeros_like(frac[:1]), frac]), axis=0)
+        frac = np.moveaxis(frac, 0, -1)                     # (N, S, T+1)
+
+        # Aggregated output membership at those points (linear inside a segment)
+        vals = m0[:, None, :, None] + frac[None] * dm[:, None, :, None]
+        y = np.minimum(vals, cuts[:, :, None, None]).max(axis=0)
+        x = x0[None, :, None] + frac * dx[None, :, None]
+
+        n = cuts.shape[1]
+        x = np.concatenate([x.reshape(n, -1), np.full((n, 1), U[-1])], axis=1)
+        y_end = np.minimum(mfs[:, -1][:, None], cuts).max(axis=0)
+        y = np.concatenate([y.reshape(n, -1), y_end[:, None]], axis=1)
+
+        # Exact integrals of a piecewise-linear function, segment by segment
+        w = np.diff(x, axis=1)
+        xa, xb, ya, yb = x[:, :-1], x[:, 1:], y[:, :-1], y[:, 1:]
+        area = (w * (ya + yb) / 2).sum(axis=1)
+        moment = (w * (xa * (2 * ya + yb) + xb * (ya + 2 * yb)) / 6).sum(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(area > 0, moment / area, np.nan)
+
+    def evaluate(self, X, chunk_size=4096):
+        """Crisp output for each row of `X` (shape N x len(input_labels)).
+
+        Rows whose aggregated output set is empty yield NaN (skfuzzy raises).
+        Work is done in chunks of `chunk_size` rows to bound peak memory.
+        """
+        X = np.asarray(X, dtype=float)
+        if X.ndim != 2 or X.shape[1] != len(self.input_labels):
+            raise ValueError(f"Expected an array of shape (N, {len(self.input_labels)}), got {X.shape}")
+        out = np.empty(X.shape[0])
+        for start in range(0, X.shape[0], chunk_size):
+            chunk = X[start:start + chunk_size]
+            out[start:start + chunk_size] = self.defuzzify(self.cuts(chunk))
+        return out
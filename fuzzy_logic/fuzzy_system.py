@@ -1,4 +1,8 @@
 import os
+import hashlib
+import marshal
+import threading
+import numpy as np
 from skfuzzy import control as ctrl
 from .core.membership_functions import (
     universe, comm_info_terms, reception_access_terms, staff_comp_terms,
@@ -6,6 +10,7 @@ from .core.membership_functions import (
     patient_involvement_terms, return_reco_terms, overall_satisfaction_terms,
 )
 from .core.rule_base import build_rules
+from .core.compiled import CompiledSystem
 
 OUTPUT_DIR = "output/figures/fuzzy_logic"
 os.makedirs(OUTPUT_DIR, exist_ok=True)
@@ -22,6 +27,26 @@ VAR_LABELS = {
     'os': 'Overall satisfaction',
 }
 
+# Column order of the arrays accepted by `evaluate_batch`
+INPUT_LABELS = tuple(VAR_LABELS[k] for k in ('ci', 'ra', 'sc', 'ei', 'po', 'cb', 'pi', 'rr'))
+
+# Neutral mid-scale value used for inputs left unspecified
+DEFAULT_INPUT = 5.0
+
+# Term builders in the order used by `build_system` (8 inputs, then the output)
+_TERM_FUNCS = (
+    comm_info_terms, reception_access_terms, staff_comp_terms, env_infra_terms,
+    perceived_outcome_terms, cost_billing_terms, patient_involvement_terms,
+    return_reco_terms, overall_satisfaction_terms,
+)
+
+# Process-wide cache of built systems, see `get_system`
+_system_cache = {}
+_cache_stats = {'hits': 0, 'misses': 0}
+_cache_lock = threading.Lock()
+_key_cache = {}  # step -> `system_key(step)`, hashed once per process
+_clear_hooks = []  # caches built from the systems (e.g. surrogate tables), emptied with them
+
 def _assign_terms(var, terms_dict):
     for name, mf in terms_dict.items():
         var[name] = mf
@@ -65,11 +90,79 @@ def build_system(step='base'):
     system = ctrl.ControlSystem(rules)
     return system, vars_map, U
 
-def evaluate(inputs: dict, step='base'):
+def system_key(step='base'):
+    """Cache key: (step, digest of membership-function arrays, digest of the rule set)."""
+    U = universe(step=step)
+    mf_hash = hashlib.sha1(np.asarray(U, dtype=float).tobytes())
+    for terms_fn in _TERM_FUNCS:
+        for name, mf in terms_fn(U).items():
+            mf_hash.update(name.encode())
+            mf_hash.update(np.asarray(mf, dtype=float).tobytes())
+    rules_hash = hashlib.sha1(marshal.dumps(build_rules.__code__))
+    return step, mf_hash.hexdigest(), rules_hash.hexdigest()
+
+def _cache_entry(step):
+    key = _key_cache.get(step)
+    if key is None:
+        key = _key_cache[step] = system_key(step=step)
+    with _cache_lock:
+        entry = _system_cache.get(key)
+        if entry is not None:
+            _cache_stats['hits'] += 1
+            return entry
+        _cache_stats['misses'] += 1
+        entry = _system_cache[key] = {'system': build_system(step=step)}
+        return entry
+
+def get_system(step='base'):
+    """Cached `build_system(step)`; the returned objects are shared, do not mutate them."""
+    return _cache_entry(step)['system']
+
+def get_compiled_system(step='base'):
+    """Cached `compile_system(step)`, stored alongside the skfuzzy system."""
+    entry = _cache_entry(step)
+    with _cache_lock:
+        if 'compiled' not in entry:
+            system, vars_map, U = entry['system']
+            entry['compiled'] = CompiledSystem(system, U, INPUT_LABELS, VAR_LABELS['os'])
+        return entry['compiled']
+
+def clear_system_cache():
+    """Drop every cached system, key and derived table and reset the hit/miss counters."""
+    with _cache_lock:
+        _system_cache.clear()
+        _key_cache.clear()
+        _cache_stats.update(hits=0, misses=0)
+    for hook in _clear_hooks:
+        hook()
+
+def system_cache_info():
+    """Return {'hits', 'misses', 'size'} for the system cache."""
+    with _cache_lock:
+        return dict(_cache_stats, size=len(_system_cache))
+
+def compile_system(step='base'):
+    """Build the system once and return it as a `CompiledSystem` for batch use."""
     system, vars_map, U = build_system(step=step)
-    sim = ctrl.ControlSystemSimulation(system)
-    # Map human labels to control variables
-    for label, value in inputs.items():
-        sim.input[label] = value
+    return CompiledSystem(system, U, INPUT_LABELS, VAR_LABELS['os'])
+
+def evaluate(inputs: dict, step='base'):
+    system, vars_map, U = get_system(step=step)
+    # The system is shared: cache=False clears the per-simulation state it keeps after each run
+    sim = ctrl.ControlSystemSimulation(system, cache=False)
+    # Map human labels to control variables; unspecified inputs sit at mid-scale
+    for label in INPUT_LABELS:
+        sim.input[label] = inputs.get(label, DEFAULT_INPUT)
     sim.compute()
-    return sim.output
\ No newline at end of file
+    return sim.output
+
+def evaluate_batch(X, step='base', compiled=None):
+    """Vectorized `evaluate` for an (N, 8) array with columns in INPUT_LABELS order.
+
+    Returns a length-N array of 'Overall satisfaction' scores matching the
+    skfuzzy path to within 1e-9. Pass `compiled` to use a specific system
+    instead of the cached one for `step`.
+    """
+    if compiled is None:
+        compiled = get_compiled_system(step=step)
+    return compiled.evaluate(X)
\ No newline at end of file
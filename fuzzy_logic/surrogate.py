@@ -0,0 +1,152 @@
+import os
+import json
+import itertools
+import warnings
+import numpy as np
+
+from .fuzzy_system import INPUT_LABELS, _clear_hooks, get_compiled_system, system_key
+
+# Largest measured error (0-10 output scale) accepted without a warning when no
+# explicit `max_error` is given; the default 5-point table is well above it (~1.7)
+DEFAULT_TOLERANCE = 0.5
+
+# Corner offsets of an 8-dimensional cell (256 x 8, 0/1)
+_CORNERS = np.array(list(itertools.product((0, 1), repeat=len(INPUT_LABELS))), dtype=np.intp)
+
+
+class SatisfactionSurrogate:
+    """Lookup-table approximation of 'Overall satisfaction' over [0,10]^8.
+
+    The exact fuzzy output is tabulated on a regular grid of `points` values
+    per input and queried by multilinear interpolation. `max_error` is the
+    largest absolute deviation from the exact system measured on random
+    check points when the table was built.
+    """
+
+    def __init__(self, table, max_error=None, mean_error=None, key=None):
+        self.table = table
+        self.points = table.shape[0]
+        self.h = 10.0 / (self.points - 1)
+        self.max_error = max_error
+        self.mean_error = mean_error
+        self.key = key
+        self._strides = np.array([self.points ** (table.ndim - 1 - d) for d in range(table.ndim)],
+                                 dtype=np.intp)
+        self._corner_offsets = _CORNERS @ self._strides
+
+    def evaluate(self, X, chunk_size=4096):
+        """Interpolated score for each row of `X` (shape N x 8, values on [0,10])."""
+        X = np.asarray(X, dtype=float)
+        if X.ndim != 2 or X.shape[1] != len(INPUT_LABELS):
+            raise ValueError(f"Expected an array of shape (N, {len(INPUT_LABELS)}), got {X.shape}")
+        flat = self.table.reshape(-1)
+        out = np.empty(X.shape[0])
+        for start in range(0, X.shape[0], chunk_size):
+            pos = np.clip(X[start:start + chunk_size], 0.0, 10.0) / self.h
+            i0 = np.minimum(pos.astype(np.intp), self.points - 2)
+            t = pos - i0
+            # Weight of each corner = product over axes of t or (1 - t)
+            w = np.where(_CORNERS[None].astype(bool), t[:, None, :], 1.0 - t[:, None, :]).prod(axis=2)
+            base = i0 @ self._strides
+            vals = flat[base[:, None] + self._corner_offsets[None, :]]
+            out[start:start + chunk_size] = (w * vals).sum(axis=1)
+        return out
+
+    def save(self, path):
+        """Write the table to `path` (.npy) and its metadata next to it (.json)."""
+        parent_dir = os.path.dirname(path)
+        if parent_dir:
+            os.makedirs(parent_dir, exist_ok=True)
+        np.save(path, np.asarray(self.table))
+        with open(_meta_path(path), 'w', encoding='utf-8') as f:
+            json.dump({'key': list(self.key) if self.key else None,
+                       'max_error': self.max_error,
+                       'mean_error': self.mean_error}, f, indent=2)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """Load a saved table, memory-mapped read-only by default."""
+        table = np.load(path, mmap_mode='r' if mmap else None)
+        meta = {}
+        if os.path.exists(_meta_path(path)):
+            with open(_meta_path(path), encoding='utf-8') as f:
+                meta = json.load(f)
+        key = tuple(meta['key']) if meta.get('key') else None
+        return cls(table, max_error=meta.get('max_error'), mean_error=meta.get('mean_error'), key=key)
+
+
+def _meta_path(path):
+    return os.path.splitext(path)[0] + '.json'
+
+
+def build_surrogate(points=5, step='base', n_check=2000, seed=0):
+    """Tabulate the exact system on `points`^8 grid nodes and measure the error.
+
+    points=5 takes 390,625 evaluations (a few seconds with the batch engine);
+    the error check compares against `n_check` random inputs.
+    """
+    if points < 2:
+        raise ValueError("points must be >= 2")
+    compiled = get_compiled_system(step=step)
+    axis = np.linspace(0, 10, points)
+    ndim = len(INPUT_LABELS)
+    table = np.empty((points,) * ndim)
+    # One slab per value of the first input keeps the grid array small
+    rest = np.stack(np.meshgrid(*([axis] * (ndim - 1)), indexing='ij'), axis=-1).reshape(-1, ndim - 1)
+    for i, v in enumerate(axis):
+        X = np.column_stack([np.full(len(rest), v), rest])
+        table[i] = compiled.evaluate(X).reshape((points,) * (ndim - 1))
+
+    surrogate = SatisfactionSurrogate(table, key=system_key(step=step))
+    if n_check:
+        X = np.random.default_rng(seed).uniform(0, 10, size=(n_check, ndim))
+        err = np.abs(surrogate.evaluate(X) - compiled.evaluate(X))
+        surrogate.max_error = float(err.max())
+        surrogate.mean_error = float(err.mean())
+    return surrogate
+
+
+def check_error(surrogate, max_error=None):
+    """Refuse a table whose measured error exceeds `max_error`.
+
+    Without `max_error`, warn when it exceeds `DEFAULT_TOLERANCE` instead.
+    """
+    if surrogate.max_error is None:
+        return surrogate
+    if max_error is not None:
+        if surrogate.max_error > max_error:
+            raise ValueError(f"Surrogate with {surrogate.points} points per input deviates by up to "
+                             f"{surrogate.max_error:.3f} (> max_error={max_error}); use more points")
+    elif surrogate.max_error > DEFAULT_TOLERANCE:
+        warnings.warn(f"Surrogate with {surrogate.points} points per input deviates from the fuzzy "
+                      f"system by up to {surrogate.max_error:.3f} on the 0-10 scale "
+                      f"(mean {surrogate.mean_error:.3f}); pass max_error to enforce a bound",
+                      stacklevel=3)
+    return surrogate
+
+
+_loaded = {}
+_clear_hooks.append(_loaded.clear)
+
+def load_or_build_surrogate(path=None, points=5, step='base', max_error=None):
+    """Return a surrogate for `step`, shared within the process.
+
+    With a `path`, a saved table is memory-mapped if it matches the current
+    system and grid size; otherwise it is rebuilt and saved there. The
+    table's measured error is checked against `max_error` (see `check_error`).
+    """
+    cache_key = (path, points, step)
+    if cache_key in _loaded:
+        return check_error(_loaded[cache_key], max_error)
+    surrogate = None
+    if path and os.path.exists(path):
+        surrogate = SatisfactionSurrogate.load(path)
+        if surrogate.points != points or surrogate.key != system_key(step=step):
+            surrogate = None
+    if surrogate is None:
+        surrogate = build_surrogate(points=points, step=step)
+        if path:
+            surrogate.save(path)
+            surrogate = SatisfactionSurrogate.load(path)
+    _loaded[cache_key] = surrogate
+    return check_error(surrogate, max_error)
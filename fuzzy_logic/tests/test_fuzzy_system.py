@@ -1,4 +1,10 @@
-from fuzzy_logic.fuzzy_system import evaluate, VAR_LABELS
+import os
+import numpy as np
+import pytest
+from fuzzy_logic.fuzzy_system import (
+    evaluate, evaluate_batch, compile_system, get_system, clear_system_cache,
+    system_cache_info, VAR_LABELS, INPUT_LABELS,
+)
 
 def test_basic_monotonicity():
     low = evaluate({VAR_LABELS['ci']: 1, VAR_LABELS['sc']: 1})
@@ -7,4 +13,62 @@ def test_basic_monotonicity():
 
 def test_output_key_exists():
     out = evaluate({VAR_LABELS['ci']: 5, VAR_LABELS['sc']: 5})
-    assert VAR_LABELS['os'] in out
\ No newline at end of file
+    assert VAR_LABELS['os'] in out
+
+@pytest.mark.parametrize("step", ['base', 'fine'])
+def test_batch_matches_skfuzzy(step):
+    rng = np.random.default_rng(0)
+    X = rng.uniform(0, 10, size=(25, 8))
+    X[:5] = np.round(X[:5])  # include points on the universe grid
+    batch = evaluate_batch(X, step=step)
+    for row, score in zip(X, batch):
+        ref = evaluate(dict(zip(INPUT_LABELS, row)), step=step)[VAR_LABELS['os']]
+        assert score == pytest.approx(ref, abs=1e-9)
+
+def test_batch_rejects_wrong_shape():
+    with pytest.raises(ValueError):
+        compile_system().evaluate(np.zeros((3, 7)))
+
+def test_system_cache_builds_once():
+    clear_system_cache()
+    for v in (2, 4, 6):
+        evaluate({VAR_LABELS['ci']: v})
+    info = system_cache_info()
+    assert info == {'hits': 2, 'misses': 1, 'size': 1}
+    assert get_system() is get_system()
+    clear_system_cache()
+    assert system_cache_info()['size'] == 0
+
+def test_surface_grid_matches_evaluate():
+    from fuzzy_logic.utils.visualization import surface_grid
+    system, _, _ = get_system()
+    X, Y, Z = surface_grid(system, VAR_LABELS['ci'], VAR_LABELS['sc'], n=5)
+    ref = evaluate({VAR_LABELS['ci']: X[1, 3], VAR_LABELS['sc']: Y[1, 3]})[VAR_LABELS['os']]
+    assert Z.shape == (5, 5)
+    assert Z[1, 3] == pytest.approx(ref, abs=1e-9)
+
+def test_surface_jobs_reuse_the_cached_compiled_system(tmp_path, monkeypatch):
+    from fuzzy_logic.utils import visualization
+    visualization.get_compiled_system()
+    monkeypatch.setattr(visualization, "CompiledSystem", None)  # any new compilation would fail
+    for pair in [(VAR_LABELS['ci'], VAR_LABELS['sc']), (VAR_LABELS['ra'], VAR_LABELS['po'])]:
+        result = visualization._surface_job((*pair, str(tmp_path), 'base'))
+        assert os.path.exists(result["file"])
+
+def _retained_states(system):
+    props = []
+    for var in list(system.antecedents) + list(system.consequents):
+        props += [getattr(var, 'input', None) or var.output]
+        props += [p for term in var.terms.values() for p in (term.membership_value, term.cuts)]
+    for rule in system.rules:
+        props += [rule.aggregate_firing] + [c.activation for c in rule.consequent]
+    return sum(len(p._sim_data) for p in props)
+
+def test_repeated_evaluations_retain_no_state():
+    system, _, _ = get_system()
+    rng = np.random.default_rng(1)
+    evaluate({VAR_LABELS['ci']: 3.0})
+    before = _retained_states(system)
+    for v in rng.uniform(0, 10, size=200):
+        evaluate({VAR_LABELS['ci']: v, VAR_LABELS['sc']: 10 - v})
+    assert _retained_states(system) == before
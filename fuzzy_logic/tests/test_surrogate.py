@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+from fuzzy_logic import surrogate as surrogate_module
+from fuzzy_logic.fuzzy_system import clear_system_cache, evaluate_batch
+from fuzzy_logic.surrogate import SatisfactionSurrogate, build_surrogate, load_or_build_surrogate
+
+def test_surrogate_exact_on_grid_nodes():
+    s = build_surrogate(points=3, n_check=200)
+    nodes = np.random.default_rng(0).choice([0.0, 5.0, 10.0], size=(20, 8))
+    assert np.allclose(s.evaluate(nodes), evaluate_batch(nodes))
+    assert s.max_error is not None and s.max_error >= s.mean_error >= 0
+
+def test_surrogate_roundtrip_is_memory_mapped(tmp_path):
+    path = str(tmp_path / "os_table.npy")
+    s = load_or_build_surrogate(path=path, points=3)
+    loaded = SatisfactionSurrogate.load(path)
+    assert isinstance(loaded.table, np.memmap)
+    assert loaded.key == s.key and loaded.max_error == s.max_error
+    X = np.random.default_rng(1).uniform(0, 10, size=(50, 8))
+    assert np.allclose(loaded.evaluate(X), s.evaluate(X))
+
+def test_coarse_tables_warn_or_are_refused():
+    with pytest.warns(UserWarning, match="deviates"):
+        coarse = load_or_build_surrogate(points=3)
+    with pytest.raises(ValueError, match="max_error"):
+        load_or_build_surrogate(points=3, max_error=0.1)
+    assert load_or_build_surrogate(points=3, max_error=coarse.max_error) is coarse
+    clear_system_cache()
+    assert not surrogate_module._loaded
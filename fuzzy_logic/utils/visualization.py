@@ -1,7 +1,12 @@
 import os
+import json
+import time
+import itertools
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import matplotlib.pyplot as plt
-from skfuzzy import control as ctrl
+from ..core.compiled import CompiledSystem
+from ..fuzzy_system import INPUT_LABELS, DEFAULT_INPUT, get_system, get_compiled_system
 
 def save_membership_plots(U, var_map, outdir):
     os.makedirs(outdir, exist_ok=True)
@@ -17,19 +22,28 @@ def save_membership_plots(U, var_map, outdir):
         fig.savefig(os.path.join(outdir, fname), dpi=150)
         plt.close(fig)
 
-def save_surface(system, x_var_label, y_var_label, outdir, out_name='Overall satisfaction'):
-    os.makedirs(outdir, exist_ok=True)
-    xs = np.linspace(0, 10, 61)
-    ys = np.linspace(0, 10, 61)
+def surface_grid(system, x_var_label, y_var_label, out_name='Overall satisfaction', n=61, compiled=None):
+    """Evaluate the output over an n x n meshgrid of two inputs in one batch.
+
+    The other inputs are held at DEFAULT_INPUT. Pass `compiled` (e.g.
+    `get_compiled_system(step)`) to reuse a compiled system instead of
+    compiling `system` for this call. Returns (X, Y, Z).
+    """
+    if compiled is None:
+        U = next(iter(system.consequents)).universe
+        compiled = CompiledSystem(system, U, INPUT_LABELS, out_name)
+    xs = np.linspace(0, 10, n)
+    ys = np.linspace(0, 10, n)
     X, Y = np.meshgrid(xs, ys)
-    Z = np.zeros_like(X)
-    for i in range(X.shape[0]):
-        for j in range(X.shape[1]):
-            sim = ctrl.ControlSystemSimulation(system)
-            sim.input[x_var_label] = X[i, j]
-            sim.input[y_var_label] = Y[i, j]
-            sim.compute()
-            Z[i, j] = sim.output[out_name]
+    inputs = np.full((X.size, len(INPUT_LABELS)), DEFAULT_INPUT)
+    inputs[:, INPUT_LABELS.index(x_var_label)] = X.ravel()
+    inputs[:, INPUT_LABELS.index(y_var_label)] = Y.ravel()
+    Z = compiled.evaluate(inputs).reshape(X.shape)
+    return X, Y, Z
+
+def save_surface(system, x_var_label, y_var_label, outdir, out_name='Overall satisfaction', compiled=None):
+    os.makedirs(outdir, exist_ok=True)
+    X, Y, Z = surface_grid(system, x_var_label, y_var_label, out_name=out_name, compiled=compiled)
     fig = plt.figure(figsize=(8, 6))
     ax = fig.add_subplot(111, projection='3d')
     surf = ax.plot_surface(X, Y, Z, cmap='viridis', edgecolor='none')
@@ -37,5 +51,40 @@ def save_surface(system, x_var_label, y_var_label, outdir, out_name='Overall sat
     fig.colorbar(surf, ax=ax, shrink=0.7, aspect=12, pad=0.1)
     fig.tight_layout()
     fname = f"surface_{x_var_label.lower().replace(' ', '_')}_{y_var_label.lower().replace(' ', '_')}.png"
-    fig.savefig(os.path.join(outdir, fname), dpi=150)
-    plt.close(fig)
\ No newline at end of file
+    path = os.path.join(outdir, fname)
+    fig.savefig(path, dpi=150)
+    plt.close(fig)
+    return path
+
+def _surface_job(args):
+    x_label, y_label, outdir, step = args
+    system, _, _ = get_system(step=step)
+    start = time.perf_counter()
+    # Compiled once per process and step, shared by every pair this worker draws
+    path = save_surface(system, x_label, y_label, outdir, compiled=get_compiled_system(step=step))
+    return {"x": x_label, "y": y_label, "file": path, "seconds": time.perf_counter() - start}
+
+def save_all_surfaces(outdir, step='base', processes=None, summary_name='surface_timings.json'):
+    """Save the surface of every input pair (28 figures) using a process pool.
+
+    Writes a JSON timing summary (per pair and total wall time) to
+    `outdir/summary_name` and returns it. processes=1 runs in-process.
+    """
+    os.makedirs(outdir, exist_ok=True)
+    jobs = [(x, y, outdir, step) for x, y in itertools.combinations(INPUT_LABELS, 2)]
+    start = time.perf_counter()
+    if processes == 1:
+        results = [_surface_job(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            results = list(pool.map(_surface_job, jobs))
+    summary = {
+        "step": step,
+        "processes": processes or os.cpu_count(),
+        "surfaces": results,
+        "sum_seconds": sum(r["seconds"] for r in results),
+        "wall_seconds": time.perf_counter() - start,
+    }
+    with open(os.path.join(outdir, summary_name), 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2)
+    return summary
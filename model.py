@@ -14,70 +14,171 @@ from agents import (
     UserInterfaceAgent,
     patient
 )
+from agents.event_log import EventLog
+from agents.lifecycle import TERMINAL_STATES, DischargeArchive, PatientIds
+from agents.queues import model_clock
+from agents.records import RecordStore
+from agents.scheduling import SCHEDULERS, EventActivation
+from agents.space import SPACES, ArrayGrid
+from agents.state import UNSET_INT, AgentState, simulate_events
+from agents.streams import ModelStreams
 
 import os
+import sys
 from mesa import Model
 from mesa.time import RandomActivation
 from mesa.space import MultiGrid
 from mesa.datacollection import DataCollector
-import pandas as pd
+import numpy as np
 from datetime import datetime
-import random
+from collections import defaultdict
+
+from recorder import EventRecorder, ChunkWriter
+from profiler import StepProfiler
+from checkpoint import save_checkpoint, load_checkpoint
+
+# Model reporters read the running aggregates of `model.state`: O(number of agent types) per step
 
-# Function to calculate average satisfaction
 def satisfaction_mean(model):
-    return model.total_satisfaction / model.num_steps if model.num_steps else 0
+    """Current mean satisfaction of patients (0 when no patient has one)."""
+    mean = model.state.running('satisfaction', patient.__name__)['mean']
+    return mean if mean == mean else 0
 
-class CustomDataCollector:
-    def __init__(self):
-        self.records = []
-        self.simulation_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+def satisfaction_min(model):
+    return model.state.running('satisfaction', patient.__name__)['min']
+
+def satisfaction_max(model):
+    return model.state.running('satisfaction', patient.__name__)['max']
+
+def charge_by_type(model):
+    return model.state.running_by_type('charge')
+
+def patients_by_state(model):
+    return {s: len(v) for s, v in model.agent_index.patients_by_state.items() if v}
+
+# Agent reporters (module-level so the model can be checkpointed)
+def agent_type_of(agent):
+    return getattr(agent, 'agent_type', 'Inconnu')
+
+def satisfaction_of(agent):
+    return getattr(agent, 'satisfaction', None)
+
+def charge_of(agent):
+    return getattr(agent, 'charge', None)
+
+
+class SampledDataCollector(DataCollector):
+    """DataCollector recording agent-level reporters only every `agent_every` collections.
+
+    Model reporters are still collected every time; `agent_every=0` disables
+    agent records entirely.
+    """
+    def __init__(self, model_reporters=None, agent_reporters=None, agent_every=1):
+        super().__init__(model_reporters=model_reporters, agent_reporters=agent_reporters)
+        self.agent_every = int(agent_every or 0)
+        self.collections = 0
 
     def collect(self, model):
-        current_step = model.schedule.time
-        for agent in model.schedule.agents:
-            if hasattr(agent, 'has_event_this_step') and agent.has_event_this_step:
-                record = {
-                    "step": current_step,
-                    "patient_id": getattr(agent, 'patient_id', getattr(agent, 'unique_id', 'N/A')),
-                    "etat": getattr(agent, 'etat', 'Actif'),
-                    "temps_attente": getattr(agent, 'temps_attente', 'N/A'),
-                    "satisfaction": getattr(agent, 'satisfaction', 'N/A'),
-                    "agent_id": getattr(agent, 'agent_id', getattr(agent, 'unique_id', 'N/A')),
-                    "agent_type": getattr(agent, 'agent_type', type(agent).__name__),
-                    "charge": getattr(agent, 'charge', 'N/A'),
-                }
-                self.records.append(record)
-                agent.has_event_this_step = False
-
-    def save(self, path):
+        sample = self.agent_every > 0 and self.collections % self.agent_every == 0
+        self.collections += 1
+        if sample:
+            return super().collect(model)
+        agent_reporters, self.agent_reporters = self.agent_reporters, {}
         try:
-            parent_dir = os.path.dirname(path)
-            if parent_dir and not os.path.exists(parent_dir):
-                os.makedirs(parent_dir, exist_ok=True)
-
-            if self.records:
-                df = pd.DataFrame(self.records)
-                df.sort_values(by=['step', 'agent_type', 'agent_id'], inplace=True)
-                df.to_csv(path, index=False, encoding='utf-8', sep=',')
-                print(f"✓ Fichier sauvegardé: {path} ({len(self.records)} enregistrements)")
-                return True
-            else:
-                print("✗ Aucun enregistrement à sauvegarder")
-                return False
-        except Exception as e:
-            print(f"✗ Erreur sauvegarde: {e}")
-            return False
+            super().collect(model)
+        finally:
+            self.agent_reporters = agent_reporters
+
+# Former name of the event recorder, kept for existing imports
+CustomDataCollector = EventRecorder
+
+class AgentIndex:
+    """Agents by class name and patients by `etat`, kept in sync by the model.
+
+    Patients report their own `etat` changes through `move`, so lookups such
+    as "patients in 'En waiting'" cost O(result) instead of a schedule scan.
+    Patients entering one of `terminal_states` are also collected in
+    `terminal` (with that state) until the model discharges them.
+    """
+    def __init__(self, terminal_states=()):
+        self.by_type = defaultdict(dict)
+        self.patients_by_state = defaultdict(dict)
+        self._patients = {}
+        self.terminal_states = tuple(terminal_states)
+        self.terminal = {}
+
+    def add(self, agent):
+        self.by_type[type(agent).__name__][agent] = None
+        if isinstance(agent, patient):
+            self._patients[agent] = None
+            self.patients_by_state[agent.etat][agent] = None
+            if agent.etat in self.terminal_states:
+                self.terminal[agent] = agent.etat
+
+    def remove(self, agent):
+        self.by_type[type(agent).__name__].pop(agent, None)
+        if agent in self._patients:
+            del self._patients[agent]
+            self.patients_by_state[agent.etat].pop(agent, None)
+            self.terminal.pop(agent, None)
+
+    def move(self, agent, old, new):
+        if agent in self._patients:
+            self.patients_by_state[old].pop(agent, None)
+            self.patients_by_state[new][agent] = None
+            if new in self.terminal_states and agent not in self.terminal:
+                self.terminal[agent] = new
+
+    def pop_terminal(self):
+        """Patients that reached a terminal state since the last call, with that state."""
+        terminal, self.terminal = self.terminal, {}
+        return terminal
+
+    def of_type(self, name):
+        return list(self.by_type.get(name, ()))
+
+    def count_type(self, name):
+        return len(self.by_type.get(name, ()))
+
+    def patients_in(self, *states):
+        return [a for s in states for a in self.patients_by_state.get(s, ())]
 
 class CliniqueModel(Model):
-    def __init__(self, width=10, height=10, num_agents=12):
+    def __init__(self, width=10, height=10, num_agents=12, event_prob=0.3, state_change_prob=0.2, seed=None,
+                 log_mode='print', log_path=None, log_sample_every=100, vectorized_events=True,
+                 agent_report_every=1, arrival_interval=5, scheduler='random', space='multigrid',
+                 discharge=False):
         super().__init__()
+        if scheduler not in SCHEDULERS:
+            raise ValueError(f"Unknown scheduler {scheduler!r}; expected one of {SCHEDULERS}")
+        if space not in SPACES:
+            raise ValueError(f"Unknown space {space!r}; expected one of {SPACES}")
+        self.reseed(seed)
+        self.vectorized_events = vectorized_events
+        self.state = AgentState(capacity=max(256, 2 * num_agents))
+        # Set first: agents may report events while they are created
+        self.event_log = EventLog(log_mode, path=log_path, sample_every=log_sample_every,
+                                  clock=model_clock(self))
         self.num_agents = num_agents
-        self.grid = MultiGrid(width, height, True)
-        self.schedule = RandomActivation(self)
+        self.event_prob = event_prob
+        self.state_change_prob = state_change_prob
+        self.arrival_interval = arrival_interval  # steps between patient registrations by each UI agent
+        # Agents never read positions: 'array' keeps them in `state` for rendering, None skips them
+        if space == 'multigrid':
+            self.grid = MultiGrid(width, height, True)
+        elif space == 'array':
+            self.grid = ArrayGrid(self.state, width, height, True)
+        else:
+            self.grid = None
+        # 'event' steps only agents with pending work or a due timer (agents/scheduling.py)
+        self.schedule = EventActivation(self) if scheduler == 'event' else RandomActivation(self)
         self.total_satisfaction = 0.0
         self.num_steps = 0
         self.simulation_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # With `discharge`, patients reaching a terminal state leave at the end of the step
+        self.discharge = discharge
+        self.agent_index = AgentIndex(TERMINAL_STATES if discharge else ())
+        self.medical_records = RecordStore()  # written by MedicalRecordAgent
 
         self.agent_classes = [
             patient,
@@ -110,58 +211,225 @@ class CliniqueModel(Model):
                 agent.patient_id = getattr(agent, 'patient_id', agent.unique_id)
             agent.agent_id = getattr(agent, 'agent_id', agent.unique_id)
 
-            self.schedule.add(agent)
-            x, y = self.random.randrange(self.grid.width), self.random.randrange(self.grid.height)
-            self.grid.place_agent(agent, (x, y))
+            self.add_agent(agent)
+
+        # Registered patients get ids above every staff id; ids of discharged patients are reused
+        self.patient_ids = PatientIds(max(1000, num_agents) + self.agent_index.count_type(patient.__name__))
+        self.discharged = DischargeArchive(self.state.categories)
 
-        self.datacollector = DataCollector(
-            model_reporters={"satisfaction_moyenne": satisfaction_mean},
+        self.datacollector = SampledDataCollector(
+            model_reporters={
+                "satisfaction_moyenne": satisfaction_mean,
+                "satisfaction_min": satisfaction_min,
+                "satisfaction_max": satisfaction_max,
+                "charge_par_type": charge_by_type,
+                "patients_par_etat": patients_by_state,
+            },
+            agent_every=agent_report_every,
             agent_reporters={
-                "Type": lambda a: getattr(a, 'agent_type', 'Inconnu'),
-                "satisfaction": lambda a: getattr(a, 'satisfaction', None),
-                "Charge": lambda a: getattr(a, 'charge', None)
+                "Type": agent_type_of,
+                "satisfaction": satisfaction_of,
+                "Charge": charge_of,
             }
         )
-        self.custom_datacollector = CustomDataCollector()
+        self.custom_datacollector = EventRecorder()
+        self.result_writer = None
+        self.chunk_size = None
+        self.profiler = None
+        self.checkpoint_path = None
+        self.checkpoint_every = None
+
+    def reseed(self, seed=None):
+        """Derive every random stream from `seed`: events, schedule/grid and one per agent.
+
+        Agents draw from `agent.random` (their own stream), so results depend
+        only on the seed, not on process count or what else runs in the process.
+        """
+        self.streams = ModelStreams(seed)
+        self.rng = self.streams.events
+        self.random.seed(self.streams.schedule_seed)
+        if getattr(self, 'schedule', None) is not None:
+            for agent in self.schedule.agents:
+                agent._random = None  # re-derived from the new streams on next use
+
+    def add_agent(self, agent):
+        """Schedule `agent`, place it at a random cell (unless grid-less) and index it."""
+        self.schedule.add(agent)
+        is_patient = isinstance(agent, patient)
+        self.state.add(agent, is_patient=is_patient)
+        if is_patient:
+            agent.admitted_step = self.schedule.time
+        if self.grid is not None:
+            x, y = self.random.randrange(self.grid.width), self.random.randrange(self.grid.height)
+            self.grid.place_agent(agent, (x, y))
+        self.agent_index.add(agent)
+
+    def remove_agent(self, agent, keep_state=True):
+        """Inverse of `add_agent`; with keep_state=False the agent's values are dropped."""
+        self.agent_index.remove(agent)
+        if self.grid is not None:
+            self.grid.remove_agent(agent)
+        self.state.remove(agent, keep=keep_state)
+        self.schedule.remove(agent)
+
+    def stream_results(self, path, chunk_size=50_000):
+        """Flush recorded events to `path` (.csv, .parquet or .arrow) every `chunk_size` rows.
+
+        Keeps the recorder's memory bounded for long runs; `save_results`
+        then writes the remainder and closes the file.
+        """
+        self.result_writer = ChunkWriter(path)
+        self.chunk_size = chunk_size
+
+    def configure_records(self, retain_steps=None, max_records=None, spill_dir=None, chunk_rows=65_536):
+        """Replace the medical-record store with one that bounds or spills its entries.
+
+        `retain_steps`/`max_records` cap what is kept; `spill_dir` moves full
+        blocks of `chunk_rows` entries to memory-mapped files. See `RecordStore`.
+        """
+        self.medical_records = RecordStore(chunk_rows=chunk_rows, retain_steps=retain_steps,
+                                           max_records=max_records, spill_dir=spill_dir)
+        return self.medical_records
+
+    def enable_profiling(self, trace=False, trace_agents=False):
+        """Time each step phase and each agent class from now on; returns the StepProfiler."""
+        self.profiler = StepProfiler(trace=trace, trace_agents=trace_agents)
+        return self.profiler
+
+    def enable_checkpoints(self, path, every=1000):
+        """Save a checkpoint to `path` every `every` steps (overwriting the previous one).
+
+        Resume with `CliniqueModel.resume(path)`.
+        """
+        self.checkpoint_path = path
+        self.checkpoint_every = every
+
+    def checkpoint(self, path=None):
+        """Save the current state now; returns the checkpoint path."""
+        return save_checkpoint(self, path or self.checkpoint_path)
+
+    @staticmethod
+    def resume(path):
+        """Model restored from a checkpoint, ready to continue stepping."""
+        return load_checkpoint(path)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['profiler'] = None  # timings belong to the process that measured them
+        return state
+
+    def disable_profiling(self):
+        profiler, self.profiler = self.profiler, None
+        return profiler
+
+    def _phase(self, name, fn, *args):
+        if self.profiler is None:
+            return fn(*args)
+        return self.profiler.run(name, fn, *args)
 
     def step(self):
         self.num_steps += 1
-        self._simulate_random_events()
-        self.custom_datacollector.collect(self)
-        self.schedule.step()
-        self.datacollector.collect(self)
+        self._phase('_simulate_random_events', self._simulate_random_events)
+        self._phase('custom_datacollector.collect', self.custom_datacollector.collect, self)
+        if self.result_writer is not None and len(self.custom_datacollector) >= self.chunk_size:
+            self._phase('result_writer.flush', self.custom_datacollector.flush, self.result_writer)
+        self._phase('schedule.step', self._step_agents)
+        if self.discharge:
+            self._phase('discharge', self._discharge_patients)
+        self._phase('datacollector.collect', self.datacollector.collect, self)
+        if self.checkpoint_every and self.num_steps % self.checkpoint_every == 0:
+            self._phase('checkpoint', self.checkpoint)
+
+    def _discharge_patients(self):
+        """Archive and remove the patients that reached a terminal state during this step.
+
+        Their state slots and unique_ids are recycled, so the per-step cost
+        follows the number of patients in care, not of patients ever admitted.
+        """
+        leaving = self.agent_index.pop_terminal()
+        if not leaving:
+            return
+        state = self.state
+        agents = list(leaving)
+        slots = np.fromiter((a._state_slot for a in agents), dtype=np.int64, count=len(agents))
+        arrays = state.arrays
+        patient_ids = arrays['patient_id'][slots]
+        self.discharged.append_columns({
+            'unique_id': state.unique_id[slots],
+            'patient_id': np.where(patient_ids == UNSET_INT, state.unique_id[slots], patient_ids),
+            'generation': [a.generation for a in agents],
+            'admitted_step': arrays['admitted_step'][slots],
+            'discharged_step': np.full(len(agents), self.num_steps - 1),
+            'etat': state.codes('etat', leaving.values()),
+            'categorie_patient': arrays['categorie_patient'][slots],
+            'service_attribue': arrays['service_attribue'][slots],
+            'satisfaction': arrays['satisfaction'][slots],
+            'temps_attente': arrays['temps_attente'][slots],
+        })
+        for agent in agents:
+            self.remove_agent(agent, keep_state=False)
+            agent.remove()  # drop mesa's registry reference
+            self.patient_ids.release(agent.unique_id)
+
+    def _step_agents(self):
+        if self.profiler is None:
+            self.schedule.step()
+        elif isinstance(self.schedule, EventActivation):
+            self.schedule.activate(self.profiler.agent_step)
+        else:
+            # Same as RandomActivation.step, with every agent step timed by class
+            self.schedule.do_each(self.profiler.agent_step, shuffle=True)
+            self.schedule.steps += 1
+            self.schedule.time += 1
 
     def _simulate_random_events(self):
+        if self.vectorized_events:
+            simulate_events(self.state, self.rng, self.event_prob, self.state_change_prob, self.agent_index)
+        else:
+            self._simulate_random_events_loop()
+
+    def _simulate_random_events_loop(self):
+        # Per-agent reference implementation, each agent drawing from its own stream
         for agent in self.schedule.agents:
-            if random.random() < 0.3:
+            rand = agent.random
+            if rand.random() < self.event_prob:
                 agent.has_event_this_step = True
                 if hasattr(agent, 'temps_attente'):
-                    agent.temps_attente = max(0, agent.temps_attente + random.uniform(-0.5, 1.0))
+                    agent.temps_attente = max(0, agent.temps_attente + rand.uniform(-0.5, 1.0))
                 if hasattr(agent, 'satisfaction') and 'patient' in type(agent).__name__.lower():
-                    agent.satisfaction = max(0, min(1, agent.satisfaction + random.uniform(-0.1, 0.1)))
+                    agent.satisfaction = max(0, min(1, agent.satisfaction + rand.uniform(-0.1, 0.1)))
                 if hasattr(agent, 'charge') and 'patient' not in type(agent).__name__.lower():
-                    agent.charge = max(0, min(1, agent.charge + random.uniform(-0.2, 0.2)))
-                if random.random() < 0.2:
+                    agent.charge = max(0, min(1, agent.charge + rand.uniform(-0.2, 0.2)))
+                if rand.random() < self.state_change_prob:
                     if 'patient' in type(agent).__name__.lower():
-                        agent.etat = random.choice(['Abandon', 'En waiting', 'Pris en charge', 'Traité'])
+                        agent.etat = rand.choice(['Abandon', 'En waiting', 'Pris en charge', 'Traité'])
                     else:
                         agent.etat = 'Actif' if agent.etat != 'Actif' else 'Occupé'
 
     def save_results(self):
-        out_dir = os.path.join('outputs', 'data')
-        os.makedirs(out_dir, exist_ok=True)
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = os.path.join(out_dir, f'resultats_simulation_{timestamp}.csv')
-        success = self.custom_datacollector.save(filename)
+        self.event_log.close()
+        recorder = self.custom_datacollector
+        if self.result_writer is not None:
+            recorder.flush(self.result_writer)
+            self.result_writer.close()
+            filename = self.result_writer.path
+            success = self.result_writer.rows > 0
+            print(f"✓ Fichier sauvegardé: {filename} ({self.result_writer.rows} enregistrements)")
+        else:
+            out_dir = os.path.join('outputs', 'data')
+            os.makedirs(out_dir, exist_ok=True)
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            filename = os.path.join(out_dir, f'resultats_simulation_{timestamp}.csv')
+            success = recorder.save(filename)
         if success:
-            df = pd.DataFrame(self.custom_datacollector.records)
+            summary = recorder.summary()
             print(f" outcome(s) saved in {filename}")
-            print(f" {len(df)} collected events")
-            if not df.empty:
-                print(f" Steps: from {df['step'].min()} to {df['step'].max()}")
-                print(f"Types of agent: {df['agent_type'].value_counts().to_dict()}")
+            print(f" {summary['events']} collected events")
+            if summary['events']:
+                print(f" Steps: from {summary['step_min']} to {summary['step_max']}")
+                print(f"Types of agent: {summary['agent_types']}")
                 print(f"\n Overview of the first lines:")
-                print(df[['step', 'patient_id', 'etat', 'agent_type']].head(10).to_string())
+                print(summary['head'][['step', 'patient_id', 'etat', 'agent_type']].to_string())
             return filename
         else:
             print(" Backup failed")
@@ -174,8 +442,9 @@ if __name__ == "__main__":
     for i in range(50):
         model.step()
         if (i+1) % 10 == 0:
-            print(f"step {i+1}/50 finished - Events: {len(model.custom_datacollector.records)}")
+            print(f"step {i+1}/50 finished - Events: {model.custom_datacollector.total}")
     print("\n=== SAFEGUARDING OF outcome(s) ===")
     model.save_results()
     print("\n=== simulation COMPLETED ===")
-    input("Press Enter to close...")
+    if sys.stdin.isatty():
+        input("Press Enter to close...")
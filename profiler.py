@@ -0,0 +1,86 @@
+# profiler.py
+"""Opt-in wall-time instrumentation of `CliniqueModel.step` phases and agent classes."""
+
+import json
+import os
+import time
+from collections import defaultdict
+
+import pandas as pd
+
+
+class StepProfiler:
+    """Accumulates wall time and call counts per model phase and per agent class.
+
+    With `trace=True`, phase spans are also kept as Chrome trace events
+    (chrome://tracing, Perfetto, speedscope); `trace_agents=True` adds one
+    span per agent step, which is only practical for small models.
+    """
+    def __init__(self, trace=False, trace_agents=False):
+        self.phases = defaultdict(lambda: [0.0, 0])
+        self.agents = defaultdict(lambda: [0.0, 0])
+        self.trace = trace or trace_agents
+        self.trace_agents = trace_agents
+        self.events = []
+        self._t0 = time.perf_counter()
+
+    def _span(self, name, category, start, end):
+        self.events.append({
+            "name": name, "cat": category, "ph": "X", "pid": os.getpid(), "tid": 0,
+            "ts": (start - self._t0) * 1e6, "dur": (end - start) * 1e6,
+        })
+
+    def run(self, phase, fn, *args):
+        """Call `fn(*args)` and charge its wall time to `phase`."""
+        start = time.perf_counter()
+        result = fn(*args)
+        end = time.perf_counter()
+        entry = self.phases[phase]
+        entry[0] += end - start
+        entry[1] += 1
+        if self.trace:
+            self._span(phase, "phase", start, end)
+        return result
+
+    def agent_step(self, agent):
+        """Step one agent, charging the time to its class (used as a scheduler callback)."""
+        start = time.perf_counter()
+        agent.step()
+        end = time.perf_counter()
+        name = type(agent).__name__
+        entry = self.agents[name]
+        entry[0] += end - start
+        entry[1] += 1
+        if self.trace_agents:
+            self._span(name, "agent", start, end)
+
+    def table(self):
+        """One row per phase and per agent class, slowest first within each kind."""
+        rows = []
+        for kind, stats in (("phase", self.phases), ("agent", self.agents)):
+            total = sum(s for s, _ in stats.values()) or 1.0
+            for name, (seconds, calls) in stats.items():
+                rows.append({
+                    "kind": kind, "name": name, "calls": calls, "total_s": seconds,
+                    "mean_ms": seconds / calls * 1e3 if calls else 0.0, "share": seconds / total,
+                })
+        df = pd.DataFrame(rows, columns=["kind", "name", "calls", "total_s", "mean_ms", "share"])
+        return df.sort_values(["kind", "total_s"], ascending=[False, False]).reset_index(drop=True)
+
+    def save_table(self, path):
+        _ensure_parent(path)
+        self.table().to_csv(path, index=False, encoding='utf-8')
+        return path
+
+    def save_chrome_trace(self, path):
+        """Write collected spans as Chrome trace JSON (requires trace=True)."""
+        _ensure_parent(path)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, f)
+        return path
+
+
+def _ensure_parent(path):
+    parent_dir = os.path.dirname(path)
+    if parent_dir:
+        os.makedirs(parent_dir, exist_ok=True)
@@ -0,0 +1,292 @@
+# recorder.py
+"""Columnar event recorder used by `CliniqueModel` (replaces the list-of-dicts collector)."""
+
+import os
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+# Column name -> dtype of the backing array; etat/agent_type hold category codes
+COLUMNS = {
+    "step": np.int64,
+    "patient_id": np.int64,
+    "etat": np.int32,
+    "temps_attente": np.float64,
+    "satisfaction": np.float64,
+    "agent_id": np.int64,
+    "agent_type": np.int32,
+    "charge": np.float64,
+}
+CATEGORICAL = ("etat", "agent_type")
+
+
+def _as_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+class EventRecorder:
+    """Records one row per agent event into pre-sized, growable typed arrays.
+
+    `etat` and `agent_type` are stored as integer codes into `categories`.
+    Missing numeric attributes are NaN and written as 'N/A' in CSV, like the
+    previous collector did.
+    """
+    def __init__(self, capacity=4096):
+        self.simulation_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self._data = {name: np.empty(capacity, dtype=dtype) for name, dtype in COLUMNS.items()}
+        self._size = 0
+        self.categories = {name: [] for name in CATEGORICAL}
+        self._codes = {name: {} for name in CATEGORICAL}
+
+        # Running summary over everything recorded, including flushed chunks
+        self.total = 0
+        self.step_min = None
+        self.step_max = None
+        self._type_counts = np.zeros(0, dtype=np.int64)
+        self._head = None
+
+    def __len__(self):
+        """Rows currently held in memory (not yet flushed)."""
+        return self._size
+
+    def __getstate__(self):
+        # Only the filled part of the arrays is pickled (checkpoints)
+        state = self.__dict__.copy()
+        state['_data'] = {name: arr[:self._size].copy() for name, arr in self._data.items()}
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if not self._size:
+            # _reserve grows by doubling, so keep a non-zero capacity
+            self._data = {name: np.empty(16, dtype=arr.dtype) for name, arr in self._data.items()}
+
+    def _code(self, column, value):
+        codes = self._codes[column]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(codes)
+            self.categories[column].append(value)
+        return code
+
+    def _reserve(self, extra):
+        needed = self._size + extra
+        capacity = len(self._data["step"])
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name, arr in self._data.items():
+            grown = np.empty(capacity, dtype=arr.dtype)
+            grown[:self._size] = arr[:self._size]
+            self._data[name] = grown
+
+    def append_columns(self, columns):
+        """Append equal-length sequences keyed by column name (categoricals as codes)."""
+        n = len(columns["step"])
+        if not n:
+            return
+        self._reserve(n)
+        end = self._size + n
+        for name, values in columns.items():
+            self._data[name][self._size:end] = values
+        self._update_summary(self._data["step"][self._size:end], self._data["agent_type"][self._size:end])
+        self._size = end
+
+    def _update_summary(self, steps, types):
+        self.total += len(steps)
+        lo, hi = int(steps.min()), int(steps.max())
+        self.step_min = lo if self.step_min is None else min(self.step_min, lo)
+        self.step_max = hi if self.step_max is None else max(self.step_max, hi)
+        counts = np.bincount(types, minlength=len(self.categories["agent_type"]))
+        counts[:len(self._type_counts)] += self._type_counts
+        self._type_counts = counts
+
+    def summary(self, head=10):
+        """Totals, step range, events per agent type and the first rows, without a rebuild."""
+        first = self._head if self._head is not None else self.to_frame(sort=True).head(head)
+        return {
+            "events": self.total,
+            "step_min": self.step_min,
+            "step_max": self.step_max,
+            "agent_types": {name: int(n) for name, n in
+                            sorted(zip(self.categories["agent_type"], self._type_counts),
+                                   key=lambda item: -item[1]) if n},
+            "head": first.head(head),
+        }
+
+    def flush(self, writer):
+        """Write the in-memory rows (sorted) to `writer` and drop them from memory."""
+        if not self._size:
+            return 0
+        df = self.to_frame(sort=True)
+        if self._head is None:
+            self._head = df.head(10).copy()
+        writer.write(df)
+        n, self._size = self._size, 0
+        return n
+
+    def collect(self, model):
+        if getattr(model, 'state', None) is not None:
+            return self._collect_state(model, model.state)
+        current_step = model.schedule.time
+        steps, pids, etats, waits, sats, aids, types, charges = [], [], [], [], [], [], [], []
+        code = self._code
+        for agent in model.schedule.agents:
+            if getattr(agent, 'has_event_this_step', False):
+                uid = agent.unique_id
+                steps.append(current_step)
+                pids.append(getattr(agent, 'patient_id', uid))
+                etats.append(code("etat", getattr(agent, 'etat', 'Actif')))
+                waits.append(_as_float(getattr(agent, 'temps_attente', None)))
+                sats.append(_as_float(getattr(agent, 'satisfaction', None)))
+                aids.append(getattr(agent, 'agent_id', uid))
+                types.append(code("agent_type", getattr(agent, 'agent_type', type(agent).__name__)))
+                charges.append(_as_float(getattr(agent, 'charge', None)))
+                agent.has_event_this_step = False
+        self.append_columns({
+            "step": steps, "patient_id": pids, "etat": etats, "temps_attente": waits,
+            "satisfaction": sats, "agent_id": aids, "agent_type": types, "charge": charges,
+        })
+
+    def _collect_state(self, model, state):
+        # Same rows as `collect`, read from the model's AgentState arrays (rows in slot order)
+        n = state.size
+        slots = np.flatnonzero(state.has_event[:n] & state.active[:n])
+        if not len(slots):
+            return
+        code = self._code
+
+        def recode(column, default=()):
+            # state codes -> recorder codes; a trailing default entry serves code -1
+            names = list(state.categories[column]) + list(default)
+            return np.array([code(column, name) for name in names], dtype=np.int32)
+
+        uid = state.unique_id[slots]
+        pids = state.arrays["patient_id"][slots]
+        aids = state.arrays["agent_id"][slots]
+        unset = np.iinfo(np.int64).min  # AgentState marker for an unset id
+        self.append_columns({
+            "step": np.full(len(slots), model.schedule.time, dtype=np.int64),
+            "patient_id": np.where(pids == unset, uid, pids),
+            "etat": recode("etat", ['Actif'])[state.etat[slots]],
+            "temps_attente": state.arrays["temps_attente"][slots],
+            "satisfaction": state.arrays["satisfaction"][slots],
+            "agent_id": np.where(aids == unset, uid, aids),
+            "agent_type": recode("agent_type")[state.agent_types()[slots]],
+            "charge": state.arrays["charge"][slots],
+        })
+        state.has_event[slots] = False
+
+    def column(self, name):
+        """View (no copy) of the recorded values of one column."""
+        return self._data[name][:self._size]
+
+    def to_frame(self, sort=False):
+        """DataFrame over the recorded arrays; categoricals become pandas Categoricals."""
+        data = {}
+        for name in COLUMNS:
+            values = self.column(name)
+            if name in CATEGORICAL:
+                values = pd.Categorical.from_codes(values, categories=self.categories[name])
+            data[name] = values
+        df = pd.DataFrame(data, copy=False)
+        if sort:
+            df = df.take(self._sort_order()).reset_index(drop=True)
+        return df
+
+    def _sort_order(self):
+        # Rows ordered by (step, agent_type, agent_id), agent_type compared by name
+        names = np.asarray(self.categories["agent_type"], dtype=object)
+        rank = np.empty(len(names), dtype=np.int64)
+        rank[np.argsort(names, kind="stable")] = np.arange(len(names))
+        type_rank = rank[self.column("agent_type")] if len(names) else self.column("agent_type")
+        return np.lexsort((self.column("agent_id"), type_rank, self.column("step")))
+
+    def to_arrow(self):
+        """pyarrow Table over the recorded arrays (numeric columns are zero-copy)."""
+        import pyarrow as pa
+        arrays = {}
+        for name in COLUMNS:
+            values = self.column(name)
+            if name in CATEGORICAL:
+                arrays[name] = pa.DictionaryArray.from_arrays(
+                    pa.array(values), pa.array(self.categories[name], type=pa.string()))
+            else:
+                arrays[name] = pa.array(values)
+        return pa.table(arrays)
+
+    def to_parquet(self, path):
+        """Write the records to Parquet (requires pyarrow)."""
+        import pyarrow.parquet as pq
+        pq.write_table(self.to_arrow(), path)
+
+    @property
+    def records(self):
+        """Records as a list of dicts; builds them on every access, prefer `to_frame`."""
+        return self.to_frame().astype(object).where(lambda d: d.notna(), 'N/A').to_dict('records')
+
+    def save(self, path):
+        try:
+            parent_dir = os.path.dirname(path)
+            if parent_dir and not os.path.exists(parent_dir):
+                os.makedirs(parent_dir, exist_ok=True)
+
+            if self._size:
+                if path.endswith(".parquet"):
+                    self.to_parquet(path)
+                else:
+                    self.to_frame(sort=True).to_csv(path, index=False, encoding='utf-8', sep=',', na_rep='N/A')
+                print(f"✓ Fichier sauvegardé: {path} ({self._size} enregistrements)")
+                return True
+            else:
+                print("✗ Aucun enregistrement à sauvegarder")
+                return False
+        except Exception as e:
+            print(f"✗ Erreur sauvegarde: {e}")
+            return False
+
+
+class ChunkWriter:
+    """Appends recorder chunks to one file; the format follows the extension.
+
+    .csv appends rows under a single header, .parquet adds one row group per
+    chunk and .arrow writes an Arrow IPC stream (both need pyarrow).
+    Categorical columns are written as plain strings.
+    """
+    def __init__(self, path):
+        parent_dir = os.path.dirname(path)
+        if parent_dir:
+            os.makedirs(parent_dir, exist_ok=True)
+        self.path = path
+        self.format = os.path.splitext(path)[1].lstrip(".").lower() or "csv"
+        if self.format not in ("csv", "parquet", "arrow"):
+            raise ValueError(f"Unsupported result format: {self.format}")
+        self.rows = 0
+        self._writer = None
+
+    def write(self, df):
+        df = df.astype({name: str for name in CATEGORICAL})
+        if self.format == "csv":
+            df.to_csv(self.path, mode="w" if self._writer is None else "a", header=self._writer is None,
+                      index=False, encoding='utf-8', sep=',', na_rep='N/A')
+            self._writer = True
+        else:
+            import pyarrow as pa
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._writer is None:
+                if self.format == "parquet":
+                    import pyarrow.parquet as pq
+                    self._writer = pq.ParquetWriter(self.path, table.schema)
+                else:
+                    self._writer = pa.ipc.new_stream(self.path, table.schema)
+            self._writer.write_table(table)
+        self.rows += len(df)
+
+    def close(self):
+        if self._writer not in (None, True):
+            self._writer.close()
+        self._writer = None
@@ -1,4 +1,3 @@
-from server import server
 from model import CliniqueModel
 import os
 import subprocess
@@ -10,14 +9,14 @@ def main():
         
         # Create and launch the model
         model = CliniqueModel(num_agents=12, width=10, height=10)
-        print(f"✓ Model created with {len(model.schedule.agent)} agent")
+        print(f"✓ Model created with {len(model.schedule.agents)} agent")
         
         # Run the simulation
         print("Execution of the simulation (50 steps)...")
         for step_num in range(1, 51):
             model.step()
             if step_num % 10 == 0:
-                events_count = len(model.custom_datacollector.records)
+                events_count = model.custom_datacollector.total
                 print(f"Step {step_num}/50 - {events_count} collected events")
         
         # Save the outcome(s)
@@ -36,9 +35,25 @@ def main():
         else:
             print("\n FAILURE - No file generated")
     
+    elif len(sys.argv) > 2 and sys.argv[1] == "--resume":
+        # python run.py --resume <checkpoint> [steps]
+        model = CliniqueModel.resume(sys.argv[2])
+        steps = int(sys.argv[3]) if len(sys.argv) > 3 else 50
+        print(f"✓ Resumed at step {model.num_steps}, running {steps} more steps...")
+        for _ in range(steps):
+            model.step()
+        model.save_results()
+
+    elif len(sys.argv) > 1 and sys.argv[1] == "--batch":
+        from batch_run import main as batch_main
+        batch_main(sys.argv[2:])
+
     else:
+        from server import server
         print("Starting the web server...")
         print("To generate a CSV: python run.py --csv")
+        print("For headless parameter sweeps: python run.py --batch --help")
+        print("To continue a checkpointed run: python run.py --resume <checkpoint> [steps]")
         server.launch()
 
 if __name__ == "__main__":
@@ -0,0 +1,173 @@
+# scenarios.py
+"""Warm-start what-if scenarios: simulate the warm-up once, then fork variants from that state.
+
+Example:
+    python scenarios.py --num-agents 1200 --warmup-steps 500 --steps 200 \\
+        --scenarios scenarios.json --processes 4 --output outputs/data/scenarios.csv
+
+where scenarios.json is a list such as
+    [{"name": "baseline"}, {"name": "+2 doctors", "doctors_available": 2},
+     {"name": "faster arrivals", "arrival_interval": 2}]
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import random
+import time
+
+import numpy as np
+import pandas as pd
+
+import checkpoint
+from agents.event_log import EventLog
+from agents.queues import queue_stats
+from agents.resources import ResourcePool, resource_stats
+from model import CliniqueModel
+
+# Model attributes a scenario may override (capacities, arrival rate, event rates)
+SCENARIO_PARAMS = ("doctors_available", "beds_available", "rooms_available", "arrival_interval",
+                   "event_prob", "state_change_prob")
+
+_WARM = None  # warm model, inherited copy-on-write by forked workers
+
+
+def warm_up(steps, seed=0, **model_kwargs):
+    """Run a fresh model for `steps` steps without output; returns it."""
+    model_kwargs.setdefault("log_mode", "off")
+    model_kwargs.setdefault("agent_report_every", 0)
+    model = CliniqueModel(seed=seed, **model_kwargs)
+    for _ in range(steps):
+        model.step()
+    return model
+
+
+def _detach(model):
+    # A branch must not write into the warm run's files
+    model.result_writer = None
+    model.checkpoint_every = None
+    model.profiler = None
+    model.event_log = EventLog("off")
+    model.medical_records.detach()
+
+
+def run_scenario(model, scenario, steps):
+    """Apply `scenario` to `model` (which it takes over) and run `steps` more steps.
+
+    `scenario` maps `SCENARIO_PARAMS` to values, plus an optional `name` and
+    `seed`. Without a seed every branch continues the warm RNG streams
+    (common random numbers); with one, all model streams are re-derived from it.
+    """
+    _detach(model)
+    unknown = set(scenario) - set(SCENARIO_PARAMS) - {"name", "seed"}
+    if unknown:
+        raise ValueError(f"Unknown scenario parameters: {sorted(unknown)}")
+    if "seed" in scenario:
+        model.reseed(scenario["seed"])
+    for name in SCENARIO_PARAMS:
+        if name in scenario:
+            current = getattr(model, name, None)
+            if isinstance(current, ResourcePool):
+                current.capacity = scenario[name]  # keeps the services in progress
+            else:
+                setattr(model, name, scenario[name])
+
+    events_before = model.custom_datacollector.total
+    warm_steps = model.num_steps
+    start = time.perf_counter()
+    for _ in range(steps):
+        model.step()
+    wall = time.perf_counter() - start
+    row = dict(scenario, warm_steps=warm_steps, steps=steps, wall_time_s=wall,
+               events=model.custom_datacollector.total - events_before,
+               agents_final=len(model.schedule.agents),
+               satisfaction_mean=model.state.mean("satisfaction"))
+    for queue, stats in queue_stats(model).items():
+        row[f"{queue}_mean_wait"] = stats["mean_wait"]
+    for pool, stats in resource_stats(model).items():
+        row[f"{pool}_utilization"] = stats["utilization"]
+        row[f"{pool}_completed"] = stats["completed"]
+    return row
+
+
+def _forked_job(job):
+    index, scenario, steps = job
+    return index, run_scenario(_WARM, scenario, steps)
+
+
+def _copied_job(job):
+    index, scenario, steps, data = job
+    return index, run_scenario(checkpoint.loads(data), scenario, steps)
+
+
+def fork_scenarios(model, scenarios, steps, processes=None):
+    """Run every scenario from the current state of `model`; one row per scenario.
+
+    Where the 'fork' start method exists, each scenario runs in a freshly
+    forked worker that shares the warm state copy-on-write; the warm-up is
+    never repeated or serialized. Elsewhere (or with processes=1) the state is
+    snapshotted once with `checkpoint.dumps` and restored per scenario.
+    `model` itself is left untouched.
+    """
+    global _WARM
+    scenarios = [dict(s) for s in scenarios]
+    if processes != 1 and "fork" in mp.get_all_start_methods():
+        _WARM = model
+        try:
+            # maxtasksperchild=1: every scenario gets its own fork of the warm state
+            with mp.get_context("fork").Pool(processes, maxtasksperchild=1) as pool:
+                results = pool.map(_forked_job, [(i, s, steps) for i, s in enumerate(scenarios)], chunksize=1)
+        finally:
+            _WARM = None
+    else:
+        data = checkpoint.dumps(model)
+        jobs = [(i, s, steps, data) for i, s in enumerate(scenarios)]
+        if processes == 1:
+            state = random.getstate(), np.random.get_state()
+            results = [_copied_job(job) for job in jobs]
+            random.setstate(state[0])
+            np.random.set_state(state[1])
+        else:
+            with mp.get_context("spawn").Pool(processes) as pool:
+                results = pool.map(_copied_job, jobs, chunksize=1)
+    rows = [row for _, row in sorted(results, key=lambda r: r[0])]
+    return pd.DataFrame(rows)
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Warm-start CliniqueModel what-if scenarios")
+    parser.add_argument("--num-agents", type=int, default=12)
+    parser.add_argument("--width", type=int, default=10)
+    parser.add_argument("--height", type=int, default=10)
+    parser.add_argument("--warmup-steps", type=int, default=100)
+    parser.add_argument("--steps", type=int, default=50, help="steps simulated after the fork")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--scenarios", help="JSON file with a list of scenarios (default: baseline only)")
+    parser.add_argument("--processes", type=int, default=None, help="worker processes (1 = in-process)")
+    parser.add_argument("--output", default=os.path.join("outputs", "data", "scenario_results.csv"))
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = _parse_args(argv)
+    scenarios = [{"name": "baseline"}]
+    if args.scenarios:
+        with open(args.scenarios, encoding="utf-8") as f:
+            scenarios = json.load(f)
+    start = time.perf_counter()
+    warm = warm_up(args.warmup_steps, seed=args.seed, num_agents=args.num_agents,
+                   width=args.width, height=args.height)
+    print(f"Warm-up: {args.warmup_steps} steps in {time.perf_counter() - start:.1f}s")
+    df = fork_scenarios(warm, scenarios, args.steps, processes=args.processes)
+
+    parent_dir = os.path.dirname(args.output)
+    if parent_dir:
+        os.makedirs(parent_dir, exist_ok=True)
+    df.to_csv(args.output, index=False, encoding="utf-8")
+    print(f"✓ {len(df)} scenarios in {time.perf_counter() - start:.1f}s, results saved in {args.output}")
+    return df
+
+
+if __name__ == "__main__":
+    main()
@@ -30,7 +30,8 @@ chart = ChartModule([{"Label": "satisfaction moyenne", "Color": "Black"}],
 model_params = {
     "num_agents": Slider("Nombre d'agent", 12, 1, 24, 1),
     "width": 10,
-    "height": 10
+    "height": 10,
+    "space": "array",  # positions kept in arrays, cells built once per render
 }
 
 server = ModularServer(
@@ -41,4 +42,6 @@ server = ModularServer(
 )
 
 server.port = 8523
-server.launch()  # ← adding this line to start the server
+
+if __name__ == "__main__":
+    server.launch()
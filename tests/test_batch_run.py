@@ -0,0 +1,15 @@
+from batch_run import parameter_grid, run_batch
+
+def test_grid_expands_with_shared_seeds():
+    runs = parameter_grid({"num_agents": [12, 24], "steps": [5]}, replications=3, base_seed=10)
+    assert len(runs) == 6
+    assert [r["seed"] for r in runs] == [10, 11, 12, 10, 11, 12]
+    assert [r["run_id"] for r in runs] == list(range(6))
+
+def test_same_seed_same_result():
+    runs = parameter_grid({"num_agents": [26], "steps": [10]}, seeds=[7, 7])
+    df = run_batch(runs, processes=1)
+    assert df.loc[0, "events"] == df.loc[1, "events"]
+    assert df.loc[0, "satisfaction_mean"] == df.loc[1, "satisfaction_mean"]
+    assert (df["steps_per_s"] > 0).all() and (df["build_time_s"] > 0).all()
+    assert (df["steps_per_s"] == df["steps"] / df["wall_time_s"]).all()
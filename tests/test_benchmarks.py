@@ -0,0 +1,26 @@
+from benchmarks.run_benchmarks import compare
+
+
+def _report(**seconds):
+    return {"results": {name: {"seconds": s} for name, s in seconds.items()}}
+
+
+def test_compare_flags_regressions_over_threshold():
+    baseline = _report(step_120=1.0, fuzzy_eval=2.0, within=1.0)
+    current = _report(step_120=1.5, fuzzy_eval=1.0, within=1.1, new_bench=3.0)
+    rows = {r[0]: r for r in compare(current, baseline, threshold=0.2)}
+
+    # slower by 50% with a 20% allowance -> regression
+    assert rows["step_120"][1:] == (1.0, 1.5, 1.5, True)
+    # twice as fast -> improvement, not flagged
+    assert rows["fuzzy_eval"][3] == 0.5 and not rows["fuzzy_eval"][4]
+    # slower, but within the threshold
+    assert not rows["within"][4]
+    # benchmarks missing from the baseline are skipped
+    assert "new_bench" not in rows
+    assert len(rows) == 3
+
+
+def test_compare_zero_baseline_is_regression():
+    rows = compare(_report(a=0.1), _report(a=0.0))
+    assert rows == [("a", 0.0, 0.1, float("inf"), True)]
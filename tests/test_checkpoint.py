@@ -0,0 +1,37 @@
+import random
+import numpy as np
+import pandas as pd
+from model import CliniqueModel
+
+def _model(tmp_path, tag):
+    random.seed(5)
+    model = CliniqueModel(num_agents=130, seed=5, log_mode='structured',
+                          log_path=str(tmp_path / f"{tag}.jsonl"))
+    model.event_log.buffer_size = 50
+    model.stream_results(str(tmp_path / f"{tag}.csv"), chunk_size=200)
+    return model
+
+def test_resume_continues_bit_identically(tmp_path):
+    straight = _model(tmp_path, "a")
+    for _ in range(25):
+        straight.step()
+    straight.save_results()
+
+    model = _model(tmp_path, "b")
+    model.enable_checkpoints(str(tmp_path / "run.ckpt"), every=10)
+    for _ in range(17):  # "crash" after writing past the checkpoint at step 10
+        model.step()
+    random.seed(999)
+    resumed = CliniqueModel.resume(str(tmp_path / "run.ckpt"))
+    assert resumed.num_steps == 10
+    for _ in range(15):
+        resumed.step()
+    resumed.save_results()
+
+    for name in ("satisfaction", "charge", "temps_attente"):
+        assert np.array_equal(straight.state.arrays[name], resumed.state.arrays[name], equal_nan=True)
+    assert [a.pos for a in straight.schedule.agents] == [a.pos for a in resumed.schedule.agents]
+    pd.testing.assert_frame_equal(straight.datacollector.get_model_vars_dataframe(),
+                                  resumed.datacollector.get_model_vars_dataframe())
+    assert (tmp_path / "a.csv").read_bytes() == (tmp_path / "b.csv").read_bytes()
+    assert (tmp_path / "a.jsonl").read_bytes() == (tmp_path / "b.jsonl").read_bytes()
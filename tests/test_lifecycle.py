@@ -0,0 +1,47 @@
+import pickle
+from agents.Patient import patient
+from agents.streams import ModelStreams
+from model import CliniqueModel
+
+def _run(discharge, steps=60, num_agents=40, seed=3):
+    model = CliniqueModel(num_agents=num_agents, seed=seed, log_mode='off', arrival_interval=1, discharge=discharge)
+    for _ in range(steps):
+        model.step()
+    return model
+
+def test_discharge_bounds_schedule_and_archives():
+    kept, discharged = _run(False), _run(True)
+    assert len(discharged.schedule.agents) < len(kept.schedule.agents)
+    frame = discharged.discharged.to_frame()
+    assert len(frame) > 0 and set(frame['etat']) <= {'Traité', 'Abandon'}
+    assert (frame['discharged_step'] >= frame['admitted_step']).all()
+    assert not any(a.etat in ('Traité', 'Abandon') for a in discharged.agent_index.of_type(patient.__name__))
+    assert len(discharged._agents) == len(discharged.schedule.agents)
+    assert discharged.state.size < kept.state.size
+
+def test_recycled_ids_are_unique_and_get_new_streams():
+    model = _run(True, steps=80, num_agents=1300)
+    uids = [a.unique_id for a in model.schedule.agents]
+    assert len(uids) == len(set(uids))
+    assert model.discharged.column('generation').max() > 0  # ids were reused
+    # Records of successive holders of an id stay apart
+    holder = next(a for a in model.agent_index.of_type(patient.__name__)
+                  if a.generation and model.medical_records.dossier(a.unique_id))
+    records = model.medical_records
+    assert records.dossier(holder.unique_id) == records.dossier(holder.unique_id, generation=holder.generation)
+    assert min(e["step"] for e in records.dossier(holder.unique_id)) >= holder.admitted_step
+    earlier = records.query(patient_id=holder.unique_id, generation=holder.generation - 1)["step"]
+    assert len(earlier) == 0 or earlier.max() < holder.admitted_step
+    streams = ModelStreams(7)
+    assert streams.agent_seed(1000, 1) != streams.agent_seed(1000)
+    assert streams.agent_seed(1000, 0) == streams.agent_seed(1000)
+
+def test_discharge_is_reproducible_and_survives_checkpoint():
+    first, second = _run(True, steps=30), _run(True, steps=30)
+    assert first.discharged.to_frame().equals(second.discharged.to_frame())
+    restored = pickle.loads(pickle.dumps(first))
+    for model in (first, restored):
+        for _ in range(20):
+            model.step()
+    assert first.discharged.to_frame().equals(restored.discharged.to_frame())
+    assert [a.unique_id for a in first.schedule.agents] == [a.unique_id for a in restored.schedule.agents]
@@ -0,0 +1,45 @@
+from collections import Counter
+from mesa import Model
+from mesa.space import MultiGrid
+from mesa.time import RandomActivation
+from model import CliniqueModel
+from agents import UserInterfaceAgent, patient
+
+def _scan_states(model):
+    return Counter(a.etat for a in model.schedule.agents if isinstance(a, patient))
+
+def test_agent_index_tracks_state_changes():
+    model = CliniqueModel(num_agents=40)
+    for _ in range(12):
+        model.step()
+    index = model.agent_index
+    indexed = Counter({s: len(v) for s, v in index.patients_by_state.items() if v})
+    assert indexed == _scan_states(model)
+    assert index.count_type('patient') == sum(_scan_states(model).values())
+
+def test_remove_agent_drops_it_from_index():
+    model = CliniqueModel(num_agents=13)
+    p = model.agent_index.of_type('patient')[0]
+    model.remove_agent(p)
+    assert p not in model.agent_index.patients_in(p.etat)
+    p.etat = 'Traité'  # no longer tracked
+    assert p not in model.agent_index.patients_in('Traité')
+
+def test_agent_reporters_are_sampled():
+    model = CliniqueModel(num_agents=26, agent_report_every=3, log_mode='off')
+    for _ in range(7):
+        model.step()
+    vars_ = model.datacollector.get_model_vars_dataframe()
+    assert len(vars_) == 7 and vars_['satisfaction_moyenne'].iloc[-1] > 0
+    steps = model.datacollector.get_agent_vars_dataframe().index.get_level_values('Step').unique()
+    assert len(steps) == 3
+
+def test_registration_works_without_an_index():
+    model = Model()
+    model.schedule, model.grid = RandomActivation(model), MultiGrid(5, 5, True)
+    uia = UserInterfaceAgent(1, model)
+    model.schedule.add(uia)
+    uia.enregistrer_patient()
+    uia.enregistrer_patient()
+    patients = [a for a in model.schedule.agents if isinstance(a, patient)]
+    assert sorted(p.unique_id for p in patients) == [1000, 1001] and all(p.pos for p in patients)
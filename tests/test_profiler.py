@@ -0,0 +1,22 @@
+import json
+from model import CliniqueModel
+
+def test_profiled_step_reports_phases_and_agent_classes(tmp_path, capsys):
+    model = CliniqueModel(num_agents=26, seed=0)
+    profiler = model.enable_profiling(trace=True)
+    for _ in range(3):
+        model.step()
+    table = profiler.table()
+    phases = set(table.loc[table['kind'] == 'phase', 'name'])
+    assert {'_simulate_random_events', 'custom_datacollector.collect',
+            'schedule.step', 'datacollector.collect'} <= phases
+    agents = table[table['kind'] == 'agent'].set_index('name')
+    assert agents.loc['UserInterfaceAgent', 'calls'] == 3 * 2
+    assert model.schedule.time == 3
+
+    trace = json.loads(open(profiler.save_chrome_trace(str(tmp_path / "trace.json"))).read())
+    assert len(trace['traceEvents']) == 3 * 4
+
+    assert model.disable_profiling() is profiler
+    model.step()
+    assert profiler.phases['schedule.step'][1] == 3
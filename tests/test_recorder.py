@@ -0,0 +1,102 @@
+import pytest
+from types import SimpleNamespace
+import numpy as np
+import pandas as pd
+from recorder import EventRecorder
+
+def _model(agents, time=0):
+    return SimpleNamespace(schedule=SimpleNamespace(time=time, agents=agents))
+
+def _agent(uid, name, **attrs):
+    cls = type(name, (), {})
+    a = cls()
+    a.unique_id = uid
+    a.has_event_this_step = True
+    for k, v in attrs.items():
+        setattr(a, k, v)
+    return a
+
+def test_collect_grows_and_exports(tmp_path):
+    rec = EventRecorder(capacity=2)
+    agents = [_agent(2, 'Zeta', charge=0.5), _agent(1, 'patient', patient_id=1001, etat='Traité'),
+              _agent(3, 'Alpha', satisfaction=0.4)]
+    rec.collect(_model(agents, time=1))
+    for a in agents:
+        a.has_event_this_step = True
+    rec.collect(_model(agents, time=0))
+    assert len(rec) == 6
+
+    df = rec.to_frame(sort=True)
+    assert list(df['step']) == [0, 0, 0, 1, 1, 1]
+    assert list(df['agent_type'][:3]) == ['Alpha', 'Zeta', 'patient']
+    assert df['patient_id'].tolist()[2] == 1001
+    assert isinstance(df['etat'].dtype, pd.CategoricalDtype)
+
+    path = tmp_path / "out.csv"
+    assert rec.save(str(path))
+    saved = pd.read_csv(path, keep_default_na=False)
+    assert saved.loc[0, 'charge'] == 'N/A' and saved.loc[1, 'etat'] == 'Actif'
+
+def test_column_is_a_view():
+    rec = EventRecorder()
+    rec.collect(_model([_agent(7, 'X', charge=0.25)]))
+    assert np.shares_memory(rec.column('charge'), rec._data['charge'])
+
+def test_flush_streams_chunks_and_keeps_summary(tmp_path):
+    from recorder import ChunkWriter
+    rec = EventRecorder(capacity=4)
+    writer = ChunkWriter(str(tmp_path / "stream.csv"))
+    agents = [_agent(1, 'A'), _agent(2, 'B')]
+    for t in range(5):
+        for a in agents:
+            a.has_event_this_step = True
+        rec.collect(_model(agents, time=t))
+        if len(rec) >= 4:
+            rec.flush(writer)
+    rec.flush(writer)
+    writer.close()
+    assert len(rec) == 0 and rec.total == writer.rows == 10
+    summary = rec.summary()
+    assert (summary['step_min'], summary['step_max']) == (0, 4)
+    assert summary['agent_types'] == {'A': 5, 'B': 5}
+    df = pd.read_csv(tmp_path / "stream.csv")
+    assert len(df) == 10 and df['step'].is_monotonic_increasing
+
+def _filled(n_steps=3):
+    rec = EventRecorder(capacity=2)
+    agents = [_agent(1, 'patient', patient_id=1001, etat='Traité', satisfaction=0.4), _agent(2, 'Zeta', charge=0.5)]
+    for t in range(n_steps):
+        for a in agents:
+            a.has_event_this_step = True
+        rec.collect(_model(agents, time=t))
+    return rec
+
+def test_parquet_export_matches_frame(tmp_path):
+    pytest.importorskip("pyarrow")
+    rec = _filled()
+    path = tmp_path / "out.parquet"
+    assert rec.save(str(path))
+    saved = pd.read_parquet(path)
+    expected = rec.to_frame()
+    assert len(saved) == len(rec) and saved['step'].tolist() == expected['step'].tolist()
+    assert saved['agent_type'].astype(str).tolist() == expected['agent_type'].astype(str).tolist()
+    assert np.shares_memory(rec.to_arrow().column('step').to_numpy(), rec.column('step'))
+
+@pytest.mark.parametrize("ext", ["parquet", "arrow"])
+def test_chunk_writer_binary_formats(tmp_path, ext):
+    pa = pytest.importorskip("pyarrow")
+    from recorder import ChunkWriter
+    rec = _filled(n_steps=4)
+    path = tmp_path / f"stream.{ext}"
+    writer = ChunkWriter(str(path))
+    frame = rec.to_frame()
+    writer.write(frame.iloc[:4])
+    writer.write(frame.iloc[4:])
+    writer.close()
+    if ext == "parquet":
+        saved = pd.read_parquet(path)
+    else:
+        with pa.OSFile(str(path), "rb") as f:
+            saved = pa.ipc.open_stream(f).read_all().to_pandas()
+    assert writer.rows == len(saved) == 8
+    assert saved['etat'].tolist() == frame['etat'].astype(str).tolist()
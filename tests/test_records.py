@@ -0,0 +1,66 @@
+import pickle
+import numpy as np
+from agents import MedicalRecordAgent
+from agents.records import RecordStore
+from model import CliniqueModel
+
+def _fill(store, steps=40, patients=7):
+    rows = []
+    for step in range(steps):
+        for pid in range(step % 3, patients, 2):
+            action = f"a{(step + pid) % 4}"
+            store.append(step, pid, action, agent_id=pid % 2)
+            rows.append((step, pid, action, pid % 2))
+    return rows
+
+def test_queries_match_a_scan_across_blocks(tmp_path):
+    for spill_dir in (None, str(tmp_path / "spill")):
+        store = RecordStore(chunk_rows=16, spill_dir=spill_dir)
+        rows = _fill(store)
+        assert len(store) == len(rows) and len(store._chunks) == len(rows) // 16
+        got = store.query(patient_id=3, start=5, stop=30)
+        expected = [r for r in rows if r[1] == 3 and 5 <= r[0] < 30]
+        assert list(got["step"]) == [r[0] for r in expected]
+        assert [store.actions[a] for a in got["action"]] == [r[2] for r in expected]
+        assert len(store.query(agent_id=1)["step"]) == sum(r[3] == 1 for r in rows)
+        restored = pickle.loads(pickle.dumps(store))
+        assert np.array_equal(restored.query(patient_id=4)["step"], store.query(patient_id=4)["step"])
+
+def test_retention_and_spill(tmp_path):
+    store = RecordStore(chunk_rows=16, retain_steps=10, spill_dir=str(tmp_path))
+    rows = _fill(store)
+    kept = [r for r in rows if r[0] >= 30]
+    assert list(store.query()["step"]) == [r[0] for r in kept]
+    assert len(store) < len(rows) and len(list(tmp_path.iterdir())) == 8 * len(store._chunks)
+    store.compact()
+    assert len(store) == len(kept)
+    assert isinstance(store._chunks[0].arrays["step"], np.memmap)
+
+def test_stores_sharing_a_spill_dir_and_checkpoints(tmp_path):
+    first, second = (RecordStore(chunk_rows=16, spill_dir=str(tmp_path)) for _ in range(2))
+    rows = _fill(first)
+    _fill(second, patients=3)
+    assert [r[1] for r in rows if r[1] == 5] == list(first.query(patient_id=5)["patient_id"])
+
+    model = CliniqueModel(num_agents=120, seed=1, log_mode='off')
+    model.configure_records(retain_steps=2, chunk_rows=4, spill_dir=str(tmp_path / "run"))
+    for _ in range(6):
+        model.step()
+    path = model.checkpoint(str(tmp_path / "run.ckpt"))
+    expected = model.medical_records.query()
+    for _ in range(6):
+        model.step()  # the blocks the checkpoint references expire
+    resumed = CliniqueModel.resume(path)
+    assert len(expected["step"]) and np.array_equal(resumed.medical_records.query()["step"], expected["step"])
+    model.checkpoint(path)  # the next checkpoint releases them
+    assert len(list((tmp_path / "run").iterdir())) == 8 * len(model.medical_records._chunks)
+
+def test_medical_record_agent_writes_the_store():
+    model = CliniqueModel(num_agents=40, seed=1, log_mode='off')
+    for _ in range(15):
+        model.step()
+    store = model.medical_records
+    mra = model.agent_index.of_type(MedicalRecordAgent.__name__)[0]
+    assert len(store) > 0 and len(mra.journal_audit) == len(store.query(agent_id=mra.unique_id)["step"])
+    entry = mra.journal_audit[0]
+    assert store.dossier(entry["patient_id"])[0]["donnee"] == entry["action"]
@@ -0,0 +1,21 @@
+import pandas as pd
+from scenarios import warm_up, fork_scenarios
+
+SCENARIOS = [{"name": "baseline"}, {"name": "busy", "arrival_interval": 1, "doctors_available": 2}]
+
+def test_forked_and_in_process_branches_agree():
+    warm = warm_up(10, seed=3, num_agents=40)
+    before = warm.num_steps, warm.custom_datacollector.total
+    forked = fork_scenarios(warm, SCENARIOS, steps=6, processes=2)
+    local = fork_scenarios(warm, SCENARIOS, steps=6, processes=1)
+    assert (warm.num_steps, warm.custom_datacollector.total) == before
+    cols = ["name", "warm_steps", "events", "agents_final", "satisfaction_mean"]
+    pd.testing.assert_frame_equal(forked[cols], local[cols])
+    assert local.loc[1, "agents_final"] > local.loc[0, "agents_final"]
+
+def test_resource_override_changes_the_run():
+    warm = warm_up(10, seed=3, num_agents=40)
+    warm.doctors_available = 1
+    warm.consultation_queue = [f"p{i}" for i in range(30)]
+    rows = fork_scenarios(warm, [{"name": "baseline"}, {"name": "+2 doctors", "doctors_available": 3}], steps=6)
+    assert rows.loc[1, "doctors_available_completed"] > rows.loc[0, "doctors_available_completed"] > 0
@@ -0,0 +1,66 @@
+from collections import Counter
+import checkpoint
+from model import CliniqueModel
+from agents import ExternalCommunicationAgent, SecurityAccessAgent
+from agents.queues import FifoQueue
+
+def _count_steps(model, steps):
+    calls = Counter()
+    for _ in range(steps):
+        model.schedule.activate(lambda agent: calls.update([type(agent).__name__]) or agent.step())
+    return calls
+
+def test_only_woken_agents_are_stepped():
+    model = CliniqueModel(num_agents=26, seed=1, log_mode='off', scheduler='event')
+    calls = _count_steps(model, 12)
+    assert "SecurityAccessAgent" not in calls and "PrescriptionConsultationAgent" not in calls
+    assert calls["ExternalCommunicationAgent"] == 2 * 2  # ticks 0 and 6
+    assert calls["UserInterfaceAgent"] == 2 * 3          # ticks 0, 5 and 10
+    assert calls["MedicalRecordAgent"] == 2 * 12         # no wake condition: every tick
+
+    model.security_queue = FifoQueue([object()])
+    model.admission_queue = FifoQueue()
+    calls = _count_steps(model, 2)
+    assert calls["SecurityAccessAgent"] == 2  # woken while the queue is non-empty
+    assert len(model.admission_queue) == 1 and not model.security_queue
+
+def test_timers_and_removed_agents():
+    model = CliniqueModel(num_agents=26, seed=2, log_mode='off', scheduler='event')
+    schedule = model.schedule
+    saa = model.agent_index.of_type(SecurityAccessAgent.__name__)[0]
+    eca = model.agent_index.of_type(ExternalCommunicationAgent.__name__)[0]
+    schedule.wake_at(saa, 3)
+    for _ in range(3):
+        assert saa not in schedule.woken()
+        schedule.time += 1
+    assert saa in schedule.woken()
+    model.remove_agent(eca)
+    schedule.time = 6
+    assert eca not in schedule.woken()
+
+def test_event_scheduler_checkpoints():
+    straight = CliniqueModel(num_agents=60, seed=3, log_mode='off', scheduler='event')
+    for _ in range(14):
+        straight.step()
+    model = CliniqueModel(num_agents=60, seed=3, log_mode='off', scheduler='event')
+    for _ in range(7):
+        model.step()
+    resumed = checkpoint.loads(checkpoint.dumps(model))
+    for _ in range(7):
+        resumed.step()
+    assert resumed.schedule.activations == straight.schedule.activations
+    assert resumed.custom_datacollector.to_frame(sort=True).equals(straight.custom_datacollector.to_frame(sort=True))
+
+def test_consultations_end_without_new_arrivals():
+    delivered = {}
+    for scheduler in ('random', 'event'):
+        model = CliniqueModel(num_agents=26, seed=3, log_mode='off', scheduler=scheduler)
+        model.doctors_available = 5
+        model.consultation_queue = FifoQueue([f"p{i}" for i in range(5)])
+        model.post_consultation_queue = FifoQueue()
+        for _ in range(10):
+            model.step()
+        doctors = model.doctors_available
+        assert doctors.completed == 5 and not doctors._done
+        delivered[scheduler] = sorted(model.post_consultation_queue)
+    assert delivered['event'] == delivered['random'] == [f"p{i}" for i in range(5)]
@@ -0,0 +1,34 @@
+import pytest
+from mesa.visualization.modules import CanvasGrid
+from model import CliniqueModel
+
+def _run(space, steps=10):
+    model = CliniqueModel(num_agents=60, seed=4, log_mode='off', space=space)
+    for _ in range(steps):
+        model.step()
+    return model
+
+def test_array_grid_matches_multigrid():
+    grid, array = _run('multigrid'), _run('array')
+    assert [a.pos for a in grid.schedule.agents] == [a.pos for a in array.schedule.agents]
+    assert grid.custom_datacollector.to_frame(sort=True).equals(array.custom_datacollector.to_frame(sort=True))
+    for x in range(10):
+        for y in range(10):
+            expected = {a.unique_id for a in grid.grid.get_cell_list_contents([(x, y)])}
+            assert {a.unique_id for a in array.grid.get_cell_list_contents([(x, y)])} == expected
+    assert array.grid.counts().sum() == len(array.schedule.agents)
+
+def test_positions_follow_removal_and_render():
+    model = _run('array', steps=2)
+    agent = model.schedule.agents[0]
+    cell = agent.pos
+    model.remove_agent(agent)
+    assert agent.pos is None and agent not in model.grid.get_cell_list_contents([cell])
+    portrayal = CanvasGrid(lambda a: {"Layer": 0}, 10, 10).render(model)
+    assert len(portrayal[0]) == len(model.schedule.agents)
+
+def test_gridless_model():
+    model = _run(None, steps=3)
+    assert model.grid is None and all(a.pos is None for a in model.schedule.agents)
+    with pytest.raises(ValueError):
+        CliniqueModel(space='hex')
@@ -0,0 +1,87 @@
+from types import SimpleNamespace
+import numpy as np
+import pandas as pd
+from model import CliniqueModel
+from recorder import EventRecorder
+
+def test_agent_attributes_live_in_state_arrays():
+    model = CliniqueModel(num_agents=26, log_mode='off')
+    agent = model.schedule.agents[3]
+    slot = agent._state_slot
+    agent.charge = 0.7
+    assert model.state.arrays['charge'][slot] == 0.7
+    model.state.arrays['temps_attente'][slot] = 2.5
+    assert agent.temps_attente == 2.5
+    model.remove_agent(agent)
+    assert agent.charge == 0.7 and agent.temps_attente == 2.5
+
+def test_vectorized_events_keep_bounds_and_unset_values():
+    model = CliniqueModel(num_agents=130, event_prob=0.9, state_change_prob=0.5, seed=3, log_mode='off')
+    for _ in range(12):
+        model.step()
+    state, n = model.state, model.state.size
+    assert state.size > 130  # patients registered by the UI agents
+    for name in ('satisfaction', 'charge'):
+        values = state.arrays[name][:n]
+        values = values[~np.isnan(values)]
+        assert values.min() >= 0 and values.max() <= 1
+    assert np.nanmin(state.arrays['temps_attente'][:n]) >= 0
+    registered = [a for a in model.schedule.agents if getattr(a, 'patient_id', 0) >= 1000]
+    assert registered and not any(hasattr(a, 'satisfaction') for a in registered)
+
+def test_recorder_state_path_matches_attribute_path():
+    model = CliniqueModel(num_agents=40, event_prob=0.6, seed=1, log_mode='off')
+    model.step()
+    model._simulate_random_events()
+    flags = model.state.has_event.copy()
+    fast = EventRecorder()
+    fast.collect(model)
+    model.state.has_event[:] = flags
+    slow = EventRecorder()
+    slow.collect(SimpleNamespace(schedule=model.schedule))
+    a, b = fast.to_frame(sort=True), slow.to_frame(sort=True)
+    pd.testing.assert_frame_equal(a.astype({'etat': str, 'agent_type': str}),
+                                  b.astype({'etat': str, 'agent_type': str}))
+
+def test_reductions_match_attribute_scans():
+    model = CliniqueModel(num_agents=60, seed=2, log_mode='off')
+    for _ in range(11):
+        model.step()
+    agents = list(model.schedule.agents)
+    sats = [a.satisfaction for a in agents if hasattr(a, 'satisfaction')]
+    assert np.isclose(model.state.mean('satisfaction'), np.mean(sats))
+    mra = [a.charge for a in agents if getattr(a, 'agent_type', None) == 'MedicalRecordAgent']
+    assert np.isclose(model.state.mean_by_type('charge')['MedicalRecordAgent'], np.mean(mra))
+    states = model.state.counts('etat', patients=True)
+    assert states == {s: len(v) for s, v in model.agent_index.patients_by_state.items() if v}
+
+def test_removed_slot_is_reused_and_values_follow_patient():
+    model = CliniqueModel(num_agents=13, log_mode='off')
+    p = model.agent_index.of_type('patient')[0]
+    p.temps_attente = 4.5
+    slot = p._state_slot
+    model.remove_agent(p)
+    assert p.temps_attente == 4.5 and np.isnan(model.state.arrays['temps_attente'][slot])
+    newcomer = type(p)(500, model)
+    model.add_agent(newcomer)
+    assert newcomer._state_slot == slot and not hasattr(newcomer, 'temps_attente')
+
+def test_running_stats_follow_every_write():
+    model = CliniqueModel(num_agents=52, event_prob=0.8, seed=4, log_mode='off')
+    for _ in range(9):
+        model.step()
+    p = model.agent_index.of_type('patient')[0]
+    p.satisfaction = 0.05
+    model.remove_agent(model.agent_index.of_type('patient')[1])
+    running = model.state.running('satisfaction', 'patient')
+    exact = [a.satisfaction for a in model.agent_index.of_type('patient') if hasattr(a, 'satisfaction')]
+    assert running['count'] == len(exact) and np.isclose(running['mean'], np.mean(exact))
+    assert running['min'] == min(exact) == 0.05 and running['max'] == max(exact)
+    top = max(model.agent_index.of_type('patient'), key=lambda a: getattr(a, 'satisfaction', -1))
+    top.satisfaction, p.satisfaction = 0.5, 0.5
+    exact = [a.satisfaction for a in model.agent_index.of_type('patient') if hasattr(a, 'satisfaction')]
+    running = model.state.running('satisfaction', 'patient')
+    assert running['min'] == min(exact) and running['max'] == max(exact)  # current, not seen-so-far
+    by_type = model.state.running_by_type('charge')
+    for name, mean in model.state.mean_by_type('charge').items():
+        assert np.isclose(by_type[name], mean)
@@ -0,0 +1,44 @@
+import random
+import numpy as np
+import pandas as pd
+from agents import PrescriptionConsultationAgent
+from agents.streams import AgentRandom, ModelStreams
+from batch_run import parameter_grid, run_batch
+from model import CliniqueModel
+
+def _run(seed, steps=8):
+    model = CliniqueModel(num_agents=60, seed=seed, log_mode='off')
+    for _ in range(steps):
+        model.step()
+    return model.custom_datacollector.to_frame(sort=True)
+
+def test_seed_alone_determines_the_run():
+    random.seed(1)
+    a = _run(11)
+    random.seed(2)
+    np.random.seed(3)
+    b = _run(11)
+    pd.testing.assert_frame_equal(a, b)
+    assert not a.equals(_run(12))
+
+def test_results_do_not_depend_on_process_count():
+    runs = parameter_grid({"num_agents": [26, 40], "steps": [6]}, seeds=[4, 5])
+    cols = ["run_id", "events", "agents_final", "satisfaction_mean"]
+    pd.testing.assert_frame_equal(run_batch(runs, processes=1)[cols], run_batch(runs, processes=2)[cols])
+
+def test_agent_streams_are_keyed_by_unique_id():
+    streams = ModelStreams(7)
+    first = [streams.for_agent(1005).random() for _ in range(2)]
+    assert first[0] == first[1] != streams.for_agent(1006).random()
+    rand = AgentRandom(42)
+    draws = [rand.random() for _ in range(20000)]
+    assert 0 <= min(draws) and max(draws) < 1 and abs(np.mean(draws) - 0.5) < 0.01
+    assert {rand.randint(1, 3) for _ in range(200)} == {1, 2, 3}
+
+def test_reseed_reaches_every_agent_stream():
+    model = CliniqueModel(num_agents=13, seed=1, log_mode='off')
+    pca = model.agent_index.of_type(PrescriptionConsultationAgent.__name__)[0]
+    before = pca.rand.getstate()
+    model.reseed(2)
+    assert pca.rand.getstate() != before
+    assert pca.rand.getstate() == ModelStreams(2).for_agent(pca.unique_id).getstate()